@@ -0,0 +1,46 @@
+"""Add archived flag to experiments
+
+Revision ID: 5c8e0b7f3a61
+Revises: 9a4d6c3e1f27
+Create Date: 2024-11-18 10:07:33.846215
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c8e0b7f3a61"
+down_revision: Union[str, None] = "9a4d6c3e1f27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "experiment",
+        sa.Column("archived", sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+    # backfill the flag from the archived tag.
+    op.execute(
+        """
+        UPDATE experiment
+        SET archived = true
+        WHERE EXISTS (
+            SELECT 1 FROM experiment_tag
+            WHERE experiment_tag.experiment_uuid = experiment.uuid
+                AND experiment_tag.tag_key = '__archived__'
+        )
+        """
+    )
+    op.create_index(
+        "ix_experiment_archived_created_at_uuid", "experiment", ["archived", "created_at", "uuid"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_experiment_archived_created_at_uuid", table_name="experiment")
+    op.drop_column("experiment", "archived")
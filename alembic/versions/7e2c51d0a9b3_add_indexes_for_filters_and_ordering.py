@@ -0,0 +1,53 @@
+"""Add indexes for filters and ordering
+
+Revision ID: 7e2c51d0a9b3
+Revises: 3b9f1e7c2d4a
+Create Date: 2024-11-12 09:41:07.302118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7e2c51d0a9b3"
+down_revision: Union[str, None] = "3b9f1e7c2d4a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # remove duplicated tag relations before adding the primary key.
+    op.execute(
+        """
+        DELETE FROM experiment_tag a
+        USING experiment_tag b
+        WHERE a.ctid < b.ctid
+            AND a.experiment_uuid = b.experiment_uuid
+            AND a.tag_key = b.tag_key
+        """
+    )
+    op.create_primary_key("experiment_tag_pkey", "experiment_tag", ["experiment_uuid", "tag_key"])
+    op.create_index("ix_experiment_tag_tag_key", "experiment_tag", ["tag_key"])
+
+    op.create_index("ix_experiment_created_at_uuid", "experiment", ["created_at", "uuid"])
+    op.create_index("ix_experiment_created_by", "experiment", ["created_by"])
+
+    op.create_index("ix_task_created_at_uuid", "task", ["created_at", "uuid"])
+    op.create_index("ix_task_created_by", "task", ["created_by"])
+    op.create_index("ix_task_experiment_id", "task", ["experiment_id"])
+    op.create_index("ix_task_extension_name_action_name", "task", ["extension_name", "action_name"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_extension_name_action_name", table_name="task")
+    op.drop_index("ix_task_experiment_id", table_name="task")
+    op.drop_index("ix_task_created_by", table_name="task")
+    op.drop_index("ix_task_created_at_uuid", table_name="task")
+
+    op.drop_index("ix_experiment_created_by", table_name="experiment")
+    op.drop_index("ix_experiment_created_at_uuid", table_name="experiment")
+
+    op.drop_index("ix_experiment_tag_tag_key", table_name="experiment_tag")
+    op.drop_constraint("experiment_tag_pkey", "experiment_tag", type_="primary")
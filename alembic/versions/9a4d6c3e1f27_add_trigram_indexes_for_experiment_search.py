@@ -0,0 +1,36 @@
+"""Add trigram indexes for experiment search
+
+Revision ID: 9a4d6c3e1f27
+Revises: 7e2c51d0a9b3
+Create Date: 2024-11-14 15:22:48.517390
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4d6c3e1f27"
+down_revision: Union[str, None] = "7e2c51d0a9b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_COLUMNS = ("title", "eid", "description")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in SEARCH_COLUMNS:
+        op.create_index(
+            f"ix_experiment_{column}_trgm",
+            "experiment",
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    for column in reversed(SEARCH_COLUMNS):
+        op.drop_index(f"ix_experiment_{column}_trgm", table_name="experiment")
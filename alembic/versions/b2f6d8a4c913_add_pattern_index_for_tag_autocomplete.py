@@ -0,0 +1,30 @@
+"""Add pattern index for tag autocomplete
+
+Revision ID: b2f6d8a4c913
+Revises: e4b17a9c2d58
+Create Date: 2024-11-21 16:30:54.271604
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b2f6d8a4c913"
+down_revision: Union[str, None] = "e4b17a9c2d58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_tag_key_pattern",
+        "tag",
+        ["key"],
+        postgresql_ops={"key": "text_pattern_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tag_key_pattern", table_name="tag")
@@ -0,0 +1,40 @@
+"""Add experiments count to tags
+
+Revision ID: e4b17a9c2d58
+Revises: 5c8e0b7f3a61
+Create Date: 2024-11-20 13:45:12.093877
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4b17a9c2d58"
+down_revision: Union[str, None] = "5c8e0b7f3a61"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tag",
+        sa.Column("experiments_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE tag
+        SET experiments_count = (
+            SELECT count(*) FROM experiment_tag WHERE experiment_tag.tag_key = tag.key
+        )
+        """
+    )
+    op.create_index("ix_tag_experiments_count", "tag", ["experiments_count"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tag_experiments_count", table_name="tag")
+    op.drop_column("tag", "experiments_count")
@@ -0,0 +1,33 @@
+"""Add experiment EID counter
+
+Revision ID: f81c3e5a7b02
+Revises: b2f6d8a4c913
+Create Date: 2024-11-25 11:18:06.640915
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f81c3e5a7b02"
+down_revision: Union[str, None] = "b2f6d8a4c913"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # counters are seeded from the existing experiments on the first allocation of each day.
+    op.create_table(
+        "experiment_eid_counter",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("last_index", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("day"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("experiment_eid_counter")
@@ -1,12 +1,13 @@
 """Server context management module."""
 
 from enum import Enum
-from typing import AsyncGenerator, Optional, Set
+from typing import AsyncGenerator, Dict, Optional, Set
 from uuid import UUID
 
 from fastapi import Depends
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
+from strawberry.dataloader import DataLoader
 from strawberry.fastapi import BaseContext
 from typing_extensions import Annotated
 
@@ -140,6 +141,8 @@ class ServerContext(BaseContext):
         super().__init__()
         self.db_session = db_session
         self.user_info = user_info
+        # request-scoped data loaders, keyed by name.
+        self.dataloaders: Dict[str, DataLoader] = {}
 
 
 async def get_current_user() -> UserInfo:
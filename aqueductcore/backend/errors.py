@@ -34,6 +34,22 @@ class AQDMaxBodySizeException(AQDError):
         self.body_len = body_len
 
 
+class AQDUploadNonExisting(AQDError):
+    """Exception raised when there is no resumable upload with the specified ID."""
+
+
+class AQDUploadIncomplete(AQDError):
+    """Exception raised when a resumable upload is completed before receiving the whole file."""
+
+
+class AQDArchiveError(AQDError):
+    """Exception raised when an uploaded archive is invalid or exceeds the limits."""
+
+
+class AQDArchiveExtractorBusy(AQDError):
+    """Exception raised when the maximum number of archives are already being extracted."""
+
+
 class AQDFilesPathError(AQDError):
     """Exception raised when there is a file system issue with the experiment's files"""
 
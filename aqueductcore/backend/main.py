@@ -2,18 +2,68 @@
 
 from __future__ import annotations
 
-from contextlib import asynccontextmanager
+from asyncio import CancelledError, create_task, gather
+from contextlib import asynccontextmanager, suppress
+from typing import Sequence
 
 from fastapi import FastAPI
 from fastapi.middleware.gzip import GZipMiddleware
 from sqlalchemy.exc import IntegrityError
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from aqueductcore.backend.models import orm
-from aqueductcore.backend.routers import files, frontend, graphql
+from aqueductcore.backend.routers import files, frontend, graphql, tasks
+from aqueductcore.backend.services.extensions_executor import ExtensionsExecutor
+from aqueductcore.backend.services.upload import remove_expired_uploads_periodically
 from aqueductcore.backend.session import async_engine
 from aqueductcore.backend.settings import settings
 
 
+UNCOMPRESSED_MEDIA_TYPES = frozenset(("text/event-stream",))
+
+
+class UncompressedMediaTypesGZipResponder(GZipResponder):
+    """GZip responder sending the responses of the uncompressed media types as they are,
+    e.g. server-sent events, which are held back by the compression until a block is full."""
+
+    async def send_with_gzip(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            media_type = Headers(raw=message["headers"]).get("content-type", "").split(";")[0]
+            if media_type.strip() in UNCOMPRESSED_MEDIA_TYPES:
+                # sent like the responses which are already encoded.
+                await super().send_with_gzip(message)
+                self.content_encoding_set = True
+                return
+
+        await super().send_with_gzip(message)
+
+
+class ExcludedPathsGZipMiddleware(GZipMiddleware):
+    """GZip middleware sending the responses of the excluded paths and of the uncompressed
+    media types uncompressed."""
+
+    def __init__(self, app: ASGIApp, excluded_path_prefixes: Sequence[str], **kwargs) -> None:
+        # pylint: disable=redefined-outer-name
+        super().__init__(app, **kwargs)
+        self.excluded_path_prefixes = tuple(excluded_path_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.excluded_path_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        if "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = UncompressedMediaTypesGZipResponder(
+                self.app, self.minimum_size, compresslevel=self.compresslevel
+            )
+            await responder(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):  # pylint: disable=redefined-outer-name,unused-argument
     """FastAPI process startup event handler."""
@@ -27,15 +77,30 @@ async def lifespan(app: FastAPI):  # pylint: disable=redefined-outer-name,unused
             raise
         # ignore if tables already exist
 
+    ExtensionsExecutor.start_venvs_provisioning()
+    cleanup_tasks = [
+        create_task(remove_expired_uploads_periodically()),
+        create_task(ExtensionsExecutor.evict_shared_venvs_periodically()),
+    ]
+
     yield
 
+    for cleanup_task in cleanup_tasks:
+        cleanup_task.cancel()
+    with suppress(CancelledError):
+        await gather(*cleanup_tasks)
+    ExtensionsExecutor.stop_venvs_provisioning()
+
 
 app = FastAPI(title="Aqueduct", docs_url="/api/docs", lifespan=lifespan)
 
 
 if settings.min_gzip_compression_size_KB != 0:
     app.add_middleware(
-        middleware_class=GZipMiddleware, minimum_size=settings.min_gzip_compression_size_KB * 1024
+        middleware_class=ExcludedPathsGZipMiddleware,
+        minimum_size=settings.min_gzip_compression_size_KB * 1024,
+        # files are sent as stored, as their ranges and ETags refer to the stored content.
+        excluded_path_prefixes=[f"{settings.api_prefix}{settings.files_route_prefix}/"],
     )
 
 
@@ -43,6 +108,9 @@ app.include_router(graphql.router, prefix=f"{settings.api_prefix}" + "/graphql",
 app.include_router(
     files.router, prefix=f"{settings.api_prefix}" + f"{settings.files_route_prefix}", tags=["files"]
 )
+app.include_router(
+    tasks.router, prefix=f"{settings.api_prefix}" + f"{settings.tasks_route_prefix}", tags=["tasks"]
+)
 
 
 app.mount(
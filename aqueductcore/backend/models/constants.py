@@ -0,0 +1,3 @@
+"""Constant values shared by the models and the services"""
+
+ARCHIVED = "__archived__"
@@ -21,6 +21,8 @@ class TagCreate(TagBase):
 class TagRead(TagBase):
     """Model for creating a tag"""
 
+    experiments_count: int = 0
+
 
 class ExperimentBase(AQDModel):
     """Base model for Experiment"""
@@ -51,6 +53,21 @@ class ExperimentUpdate(ExperimentBase):
     """Model fields to update an experiment"""
 
 
+class NewExperiment(AQDModel):
+    """Model fields of an experiment to create in a batch"""
+
+    title: str
+    description: str
+    tags: List[str]
+
+
+class ExperimentCreateResult(AQDModel):
+    """Model for the result of creating an experiment in a batch"""
+
+    experiment: Optional[ExperimentRead] = None
+    error: Optional[str] = None
+
+
 class UserBase(AQDModel):
     """Base model for User"""
 
@@ -2,12 +2,40 @@
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import List, Optional
-
-from sqlalchemy import Column, DateTime, ForeignKey, String, Table, Text, Uuid, func
+from collections import Counter
+from datetime import date, datetime
+from typing import List, Mapping, Optional
+
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    Table,
+    Text,
+    Uuid,
+    case,
+    event,
+    false,
+    func,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncAttrs
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    Session,
+    attributes,
+    mapped_column,
+    relationship,
+)
+
+from aqueductcore.backend.models.constants import ARCHIVED
 
 
 class Base(AsyncAttrs, DeclarativeBase):
@@ -17,8 +45,8 @@ class Base(AsyncAttrs, DeclarativeBase):
 experiment_tag_association = Table(
     "experiment_tag",
     Base.metadata,
-    Column("experiment_uuid", Uuid, ForeignKey("experiment.uuid"), nullable=False),
-    Column("tag_key", String, ForeignKey("tag.key"), nullable=False),
+    Column("experiment_uuid", Uuid, ForeignKey("experiment.uuid"), primary_key=True),
+    Column("tag_key", String, ForeignKey("tag.key"), primary_key=True, index=True),
 )
 
 
@@ -37,6 +65,10 @@ class Task(Base):
     """Task details"""
 
     __tablename__ = "task"
+    __table_args__ = (
+        Index("ix_task_created_at_uuid", "created_at", "uuid"),
+        Index("ix_task_extension_name_action_name", "extension_name", "action_name"),
+    )
     uuid = mapped_column(String, primary_key=True)
     extension_name: Mapped[str]
     action_name: Mapped[str]
@@ -44,21 +76,41 @@ class Task(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()  # pylint: disable=not-callable
     )
-    created_by: Mapped[Uuid] = mapped_column(ForeignKey("user.uuid"), nullable=False)
+    created_by: Mapped[Uuid] = mapped_column(ForeignKey("user.uuid"), nullable=False, index=True)
     created_by_user: Mapped[User] = relationship(back_populates="tasks")
-    experiment_id = mapped_column(Uuid, ForeignKey("experiment.uuid"))
+    experiment_id = mapped_column(Uuid, ForeignKey("experiment.uuid"), index=True)
     experiment: Mapped[Experiment] = relationship(back_populates="tasks")
+    # execution details are persisted once the task reaches a terminal state.
+    status: Mapped[Optional[str]]
+    result_code: Mapped[Optional[int]]
+    std_out: Mapped[Optional[str]] = mapped_column(Text)
+    std_err: Mapped[Optional[str]] = mapped_column(Text)
+    ended_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
 
 
 class Experiment(Base):
     """Experiment details"""
 
     __tablename__ = "experiment"
+    __table_args__ = (
+        Index("ix_experiment_created_at_uuid", "created_at", "uuid"),
+        Index("ix_experiment_archived_created_at_uuid", "archived", "created_at", "uuid"),
+        # trigram indexes serve substring and similarity search on PostgreSQL.
+        *(
+            Index(
+                f"ix_experiment_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            ).ddl_if(dialect="postgresql")
+            for column in ("title", "eid", "description")
+        ),
+    )
 
     uuid = mapped_column(Uuid, primary_key=True)
     title: Mapped[str]
     description: Mapped[Optional[str]] = mapped_column(Text)
-    created_by: Mapped[Uuid] = mapped_column(ForeignKey("user.uuid"), nullable=False)
+    created_by: Mapped[Uuid] = mapped_column(ForeignKey("user.uuid"), nullable=False, index=True)
     created_by_user: Mapped[User] = relationship(back_populates="experiments")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()  # pylint: disable=not-callable
@@ -67,6 +119,8 @@ class Experiment(Base):
         DateTime(timezone=True), server_default=func.now()  # pylint: disable=not-callable
     )
     eid: Mapped[str] = mapped_column(unique=True)
+    # mirrors the archived tag to filter out archived experiments without the relation table.
+    archived: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false())
 
     tags: Mapped[List[Tag]] = relationship(
         secondary=experiment_tag_association, back_populates="experiments"
@@ -78,14 +132,116 @@ class Experiment(Base):
         return f"<Experiment {self.title}>"
 
 
+class ExperimentEIDCounter(Base):
+    """Last index of the experiment EIDs allocated per day"""
+
+    __tablename__ = "experiment_eid_counter"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    last_index: Mapped[int]
+
+
 class Tag(Base):
     """Model for defining tags"""
 
     __tablename__ = "tag"
+    __table_args__ = (
+        # pattern index serves the tag keys autocomplete with LIKE prefixes on PostgreSQL.
+        Index(
+            "ix_tag_key_pattern",
+            "key",
+            postgresql_ops={"key": "text_pattern_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     key: Mapped[str] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column()
+    # number of experiments linked to the tag, refreshed whenever the links change.
+    experiments_count: Mapped[int] = mapped_column(default=0, server_default="0", index=True)
 
     experiments: Mapped[List[Experiment]] = relationship(
         secondary=experiment_tag_association, back_populates="tags"
     )
+
+
+event.listen(
+    Experiment.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+@event.listens_for(Experiment.tags, "append")
+def _archive_experiment(target: Experiment, value: Tag, initiator):
+    # pylint: disable=unused-argument
+    """Keep the archived flag in sync when the archived tag is added to an experiment."""
+    if value.key == ARCHIVED:
+        target.archived = True
+
+
+@event.listens_for(Experiment.tags, "remove")
+def _unarchive_experiment(target: Experiment, value: Tag, initiator):
+    # pylint: disable=unused-argument
+    """Keep the archived flag in sync when the archived tag is removed from an experiment."""
+    if value.key == ARCHIVED:
+        target.archived = False
+
+
+def update_tags_experiments_count(tag_keys_deltas: Mapping[str, int]):
+    """Statement adding the changes in the number of linked experiments to the tags. The
+    changes are applied atomically on the current counts, so that concurrent transactions
+    linking experiments to the same tags do not overwrite each other."""
+    return (
+        update(Tag)
+        .where(Tag.key.in_(list(tag_keys_deltas)))
+        .values(
+            experiments_count=Tag.experiments_count
+            + case(dict(tag_keys_deltas), value=Tag.key, else_=0)
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _count_deleted_experiments_tags(session: Session, flush_context, instances):
+    # pylint: disable=unused-argument
+    """Remove the experiments deleted by the flush from the counts of their tags. The tags
+    are read from the relation table, as they may not be loaded on the experiments."""
+    experiment_uuids = [
+        instance.uuid
+        for instance in session.deleted
+        if isinstance(instance, Experiment) and instance not in session.new
+    ]
+    if not experiment_uuids:
+        return
+
+    tag_keys = (
+        session.connection()
+        .execute(
+            select(experiment_tag_association.c.tag_key).where(
+                experiment_tag_association.c.experiment_uuid.in_(experiment_uuids)
+            )
+        )
+        .scalars()
+        .all()
+    )
+    if tag_keys:
+        deltas = {key: -count for key, count in Counter(tag_keys).items()}
+        session.connection().execute(update_tags_experiments_count(deltas))
+
+
+@event.listens_for(Session, "after_flush")
+def _count_changed_experiments_tags(session: Session, flush_context):
+    # pylint: disable=unused-argument
+    """Add the links changed by the flush on the experiments kept to the counts of their tags."""
+    deltas: Counter = Counter()
+    for instance in session.new | session.dirty:
+        if not isinstance(instance, Experiment) or instance in session.deleted:
+            continue
+        history = attributes.get_history(instance, "tags", attributes.PASSIVE_NO_INITIALIZE)
+        deltas.update(tag.key for tag in history.added)
+        deltas.subtract(tag.key for tag in history.deleted)
+
+    changed_deltas = {key: delta for key, delta in deltas.items() if delta}
+    if changed_deltas:
+        session.connection().execute(update_tags_experiments_count(changed_deltas))
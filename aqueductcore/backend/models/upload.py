@@ -0,0 +1,28 @@
+"""Upload pydantic schemas to be used in resumable upload operations"""
+
+from enum import Enum
+from typing import List, Tuple
+from uuid import UUID
+
+from pydantic import NonNegativeInt
+
+from aqueductcore.backend.models.base import AQDModel
+
+
+class UploadRead(AQDModel):
+    """Resumable upload of an experiment file."""
+
+    upload_id: UUID
+    file_name: str
+    size: NonNegativeInt
+    received_ranges: List[Tuple[int, int]] = []
+    """Received byte ranges of the file, as sorted and merged [start, end) pairs."""
+
+
+class ArchiveFormat(str, Enum):
+    """Formats of the archives uploaded to be extracted in the experiment directory."""
+
+    TAR = "tar"
+    """Tar archive, optionally compressed with gzip, bzip2 or xz, extracted as it streams."""
+    ZIP = "zip"
+    """Zip archive, extracted once fully received, as its index is at the end."""
@@ -1,14 +1,19 @@
 """Router for handling experiment files."""
 
 import os
+from asyncio import get_running_loop, wait
+from concurrent.futures import Executor
+from email.utils import parsedate_to_datetime
 from tempfile import TemporaryDirectory
-from typing import List
-from uuid import UUID
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from uuid import UUID, uuid4
 
 import pathvalidate
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from fastapi.responses import FileResponse, JSONResponse
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, NonNegativeInt
+from starlette.datastructures import Headers
+from starlette.requests import ClientDisconnect
 from streaming_form_data import StreamingFormDataParser
 from streaming_form_data.targets import FileTarget
 from streaming_form_data.validators import MaxSizeValidator, ValidationError
@@ -16,20 +21,44 @@ from typing_extensions import Annotated
 
 from aqueductcore.backend.context import ServerContext, context_dependency
 from aqueductcore.backend.errors import (
+    AQDArchiveError,
+    AQDArchiveExtractorBusy,
     AQDDBExperimentNonExisting,
     AQDMaxBodySizeException,
     AQDPermission,
+    AQDUploadIncomplete,
+    AQDUploadNonExisting,
 )
+from aqueductcore.backend.models.upload import ArchiveFormat
+from aqueductcore.backend.routers.utils import raise_http_exceptions
 from aqueductcore.backend.services.constants import MARKDOWN_EXTENSIONS
 from aqueductcore.backend.services.experiment import (
     build_experiment_dir_absolute_path,
     get_experiment_by_uuid,
 )
+from aqueductcore.backend.services.upload import (
+    ArchiveExtractor,
+    StreamReader,
+    UploadWriter,
+    complete_upload,
+    create_upload,
+    extract_archive,
+    get_upload,
+    open_upload_data,
+    record_upload_range,
+    remove_upload,
+    validate_experiment_file_name,
+)
 from aqueductcore.backend.services.utils import format_list_human_readable
 from aqueductcore.backend.settings import settings
 
 router = APIRouter()
 
+MAX_DOWNLOAD_RANGES = 16
+ARCHIVE_EXTRACTOR_BUSY_RETRY_AFTER_S = 10
+
+archive_extractor = ArchiveExtractor(max_extractions=settings.upload_archive_max_extractions)
+
 
 class DeleteFileRequestBody(BaseModel):
     """List of file names."""
@@ -37,13 +66,164 @@ class DeleteFileRequestBody(BaseModel):
     file_list: List[str]
 
 
+class CreateUploadRequestBody(BaseModel):
+    """File to be uploaded in chunks."""
+
+    file_name: str
+    size: NonNegativeInt
+
+
+def _is_not_modified(request_headers: Headers, etag: str, stat_result: os.stat_result) -> bool:
+    """Checks the conditional request headers against the current version of the file."""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        # weak comparison, as the ETag is derived from the modification time and size.
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        return bool({"*", etag, f"W/{etag}"} & tags)
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            return int(stat_result.st_mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+    return False
+
+
+def _is_range_applicable(request_headers: Headers, etag: str, last_modified: str) -> bool:
+    """Ranges are only served if the file has not changed since the version in If-Range."""
+    if_range = request_headers.get("if-range")
+    if if_range is None:
+        return True
+
+    # strong comparison, so weak ETags never match.
+    return if_range.strip() in (etag, last_modified)
+
+
+def _parse_range_header(range_header: str, file_size: int) -> Optional[List[Tuple[int, int]]]:
+    """Parses the byte ranges of the Range header as inclusive (first, last) positions.
+
+    Returns:
+        The satisfiable ranges, or None when the header is invalid or requests too many ranges,
+        in which case it is ignored and the whole file is sent.
+
+    Raises:
+        HTTPException: if none of the ranges are satisfiable.
+
+    """
+    unit, _, ranges_specifier = range_header.partition("=")
+    if unit.strip().lower() != "bytes":
+        return None
+
+    range_specs = ranges_specifier.split(",")
+    if len(range_specs) > MAX_DOWNLOAD_RANGES:
+        return None
+
+    ranges: List[Tuple[int, int]] = []
+    for range_spec in range_specs:
+        first_text, separator, last_text = range_spec.strip().partition("-")
+        if (
+            not separator
+            or not (first_text or last_text)
+            or not all(text.isdigit() for text in (first_text, last_text) if text)
+        ):
+            return None
+
+        if not first_text:
+            # suffix range of the last bytes of the file.
+            first, last = max(file_size - int(last_text), 0), file_size - 1
+            if int(last_text) == 0:
+                continue
+        else:
+            first = int(first_text)
+            last = min(int(last_text), file_size - 1) if last_text else file_size - 1
+            if last_text and int(last_text) < first:
+                return None
+
+        if first < file_size:
+            ranges.append((first, last))
+
+    if not ranges:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="The requested range is not satisfiable.",
+            headers={"content-range": f"bytes */{file_size}"},
+        )
+
+    return ranges
+
+
+def _read_file_segments(
+    file_path: str, segments: List[Union[bytes, Tuple[int, int]]], chunk_size: int
+) -> Iterator[bytes]:
+    """Yields the literal bytes segments and the content of the (first, last) file ranges."""
+    with open(file_path, mode="rb") as file:
+        for segment in segments:
+            if isinstance(segment, bytes):
+                yield segment
+                continue
+
+            first, last = segment
+            file.seek(first)
+            remaining = last - first + 1
+            while remaining > 0:
+                data = file.read(min(chunk_size, remaining))
+                if not data:
+                    return
+                remaining -= len(data)
+                yield data
+
+
+def _partial_file_response(
+    file_path: str,
+    file_size: int,
+    ranges: List[Tuple[int, int]],
+    media_type: str,
+    headers: Dict[str, str],
+) -> StreamingResponse:
+    """206 Partial Content response with the ranges of the file, as a multipart/byteranges body
+    if there is more than one range."""
+    segments: List[Union[bytes, Tuple[int, int]]] = []
+    if len(ranges) == 1:
+        first, last = ranges[0]
+        segments.append((first, last))
+        headers = {**headers, "content-range": f"bytes {first}-{last}/{file_size}"}
+    else:
+        boundary = uuid4().hex
+        for first, last in ranges:
+            segments.append(
+                f"--{boundary}\r\nContent-Type: {media_type}\r\n"
+                f"Content-Range: bytes {first}-{last}/{file_size}\r\n\r\n".encode()
+            )
+            segments.append((first, last))
+            segments.append(b"\r\n")
+        segments.append(f"--{boundary}--\r\n".encode())
+        media_type = f"multipart/byteranges; boundary={boundary}"
+
+    content_length = sum(
+        len(segment) if isinstance(segment, bytes) else segment[1] - segment[0] + 1
+        for segment in segments
+    )
+    headers = {**headers, "content-length": str(content_length)}
+
+    return StreamingResponse(
+        _read_file_segments(file_path, segments, settings.download_chunk_size_KB * 1024),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
 @router.get("/{experiment_uuid}/{file_name}")
 async def download_experiment_file(
+    request: Request,
     experiment_uuid: UUID,
     file_name: str,
     context: Annotated[ServerContext, Depends(context_dependency)],
-) -> FileResponse:
-    """Router for downloading files of experiments."""
+) -> Response:
+    """Router for downloading files of experiments. Supports byte ranges requests, and
+    conditional requests with the ETag and the last modification time of the file."""
 
     try:
         pathvalidate.validate_filename(file_name)
@@ -67,9 +247,37 @@ async def download_experiment_file(
         file_extension = file_name.split(".")[-1]
         media_type = "text/x-markdown" if file_extension in MARKDOWN_EXTENSIONS else None
 
-        response = FileResponse(file_path, stat_result=os.stat(file_path), media_type=media_type)
-
-        response.chunk_size = settings.download_chunk_size_KB * 1024
+        stat_result = os.stat(file_path)
+        file_response = FileResponse(
+            file_path,
+            stat_result=stat_result,
+            media_type=media_type,
+            headers={"accept-ranges": "bytes"},
+        )
+        file_response.chunk_size = settings.download_chunk_size_KB * 1024
+
+        etag = file_response.headers["etag"]
+        validator_headers = {
+            "etag": etag,
+            "last-modified": file_response.headers["last-modified"],
+            "accept-ranges": "bytes",
+        }
+        response: Response = file_response
+        range_header = request.headers.get("range")
+        if _is_not_modified(request.headers, etag, stat_result):
+            response = Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers)
+        elif range_header is not None and _is_range_applicable(
+            request.headers, etag, validator_headers["last-modified"]
+        ):
+            ranges = _parse_range_header(range_header, stat_result.st_size)
+            if ranges is not None:
+                response = _partial_file_response(
+                    file_path,
+                    stat_result.st_size,
+                    ranges,
+                    media_type=str(file_response.media_type),
+                    headers=validator_headers,
+                )
 
     except AQDDBExperimentNonExisting as error:
         raise HTTPException(
@@ -131,7 +339,7 @@ async def upload_experiment_file(
     max_body_size = max_file_size + 1024
 
     try:
-        pathvalidate.validate_filename(file_name)
+        validate_experiment_file_name(file_name)
         # check if experiment exists with the specified UUID, otherwise raises an exception.
         await get_experiment_by_uuid(
             user_info=context.user_info,
@@ -159,25 +367,15 @@ async def upload_experiment_file(
             parser = StreamingFormDataParser(headers=request.headers)
             parser.register("file", file_target)
 
-            max_buffer_size = settings.upload_RAM_buffer_size_KB * 1024
-            upload_buffer = bytearray(max_buffer_size)
-            buffer_counter = 0
-
-            async for chunk in request.stream():
-                body_validator(chunk=chunk)
-                chunk_len = len(chunk)
-
-                if buffer_counter + len(chunk) > max_buffer_size:
-                    parser.data_received(bytes(upload_buffer[0:buffer_counter]))
-                    buffer_counter = 0
-
-                upload_buffer[buffer_counter : buffer_counter + chunk_len] = chunk
-                buffer_counter += chunk_len
-
-            # save last chunk in the buffer
-            if buffer_counter != 0:
-                parser.data_received(bytes(upload_buffer[0:buffer_counter]))
-                buffer_counter = 0
+            # parsing and writing to the file run in a worker thread, off the event loop.
+            async with UploadWriter(
+                parser.data_received,
+                max_pending=settings.upload_max_pending_buffers,
+                buffer_size=settings.upload_RAM_buffer_size_KB * 1024,
+            ) as upload_writer:
+                async for chunk in request.stream():
+                    body_validator(chunk=chunk)
+                    await upload_writer.write(chunk)
 
             # On POSIX systems, file replacing happens very fast,
             # due to native system call, no need for threading.
@@ -214,6 +412,297 @@ async def upload_experiment_file(
     return JSONResponse({"result": f"Successfuly uploaded {file_name}"})
 
 
+async def _receive_archive(
+    request: Request, archive_format: ArchiveFormat, dest_dir: str, executor: Executor
+) -> List[str]:
+    """Receive an archive and extract its files to the directory. Tar archives are extracted
+    in a worker thread of the executor as they stream, zip archives are saved and extracted
+    afterwards."""
+
+    loop = get_running_loop()
+    body_validator = MaxBodySizeValidator(settings.upload_archive_max_size_KB * 1024)
+
+    def extract(source) -> List[str]:
+        return extract_archive(
+            source,
+            archive_format,
+            dest_dir,
+            max_files=settings.upload_archive_max_files,
+            max_file_size=settings.upload_max_file_size_KB * 1024,
+            max_size=settings.upload_archive_max_size_KB * 1024,
+        )
+
+    if archive_format == ArchiveFormat.ZIP:
+        archive_path = f"{dest_dir}.zip"
+        with open(archive_path, mode="wb") as file:
+            async with UploadWriter(
+                file.write,
+                max_pending=settings.upload_max_pending_buffers,
+                buffer_size=settings.upload_RAM_buffer_size_KB * 1024,
+            ) as upload_writer:
+                async for chunk in request.stream():
+                    body_validator(chunk=chunk)
+                    await upload_writer.write(chunk)
+
+        return await loop.run_in_executor(executor, extract, archive_path)
+
+    stream = StreamReader(max_chunks=settings.upload_max_pending_buffers)
+
+    def extract_stream() -> List[str]:
+        with stream:
+            return extract(stream)
+
+    extraction = loop.run_in_executor(executor, extract_stream)
+    try:
+        async with UploadWriter(
+            stream.feed,
+            max_pending=settings.upload_max_pending_buffers,
+            buffer_size=settings.upload_RAM_buffer_size_KB * 1024,
+        ) as upload_writer:
+            async for chunk in request.stream():
+                # the rest of the body after the end of the archive, or after an invalid
+                # member, is not read.
+                if extraction.done():
+                    break
+                body_validator(chunk=chunk)
+                await upload_writer.write(chunk)
+    except BaseException:
+        # the extraction is stopped before its directory is removed.
+        stream.abort()
+        await wait([extraction])
+        raise
+
+    stream.finish()
+    return await extraction
+
+
+async def _get_experiment_dir(context: ServerContext, experiment_uuid: UUID) -> str:
+    """Experiment directory, if the experiment is accessible by the user."""
+    with raise_http_exceptions(not_found_detail="The specified experiment was not found."):
+        await get_experiment_by_uuid(
+            user_info=context.user_info,
+            db_session=context.db_session,
+            experiment_uuid=experiment_uuid,
+        )
+
+    return build_experiment_dir_absolute_path(str(settings.experiments_dir_path), experiment_uuid)
+
+
+@router.post("/{experiment_uuid}/uploads", status_code=status.HTTP_201_CREATED)
+async def create_experiment_file_upload(
+    experiment_uuid: UUID,
+    context: Annotated[ServerContext, Depends(context_dependency)],
+    body: CreateUploadRequestBody,
+) -> JSONResponse:
+    """Router for starting a resumable upload of a file to an experiment. The chunks of the
+    file can then be sent at any offset, in parallel and retried after interruptions."""
+
+    try:
+        validate_experiment_file_name(body.file_name)
+    except pathvalidate.ValidationError as error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid file name.",
+        ) from error
+
+    max_file_size = settings.upload_max_file_size_KB * 1024
+    if body.size > max_file_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Maximum file size limit ({max_file_size} bytes) exceeded.",
+        )
+
+    experiment_dir = await _get_experiment_dir(context, experiment_uuid)
+    try:
+        upload = create_upload(experiment_dir, file_name=body.file_name, size=body.size)
+    except OSError as error:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=f"Could not create the upload: {error}"
+        ) from error
+
+    return JSONResponse(upload.model_dump(mode="json"), status_code=status.HTTP_201_CREATED)
+
+
+@router.get("/{experiment_uuid}/uploads/{upload_id}")
+async def get_experiment_file_upload(
+    experiment_uuid: UUID,
+    upload_id: UUID,
+    context: Annotated[ServerContext, Depends(context_dependency)],
+) -> JSONResponse:
+    """Router for querying the received ranges of a resumable upload."""
+
+    experiment_dir = await _get_experiment_dir(context, experiment_uuid)
+    try:
+        upload = get_upload(experiment_dir, upload_id)
+    except AQDUploadNonExisting as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error)) from error
+
+    return JSONResponse(upload.model_dump(mode="json"))
+
+
+@router.put("/{experiment_uuid}/uploads/{upload_id}")
+async def upload_experiment_file_chunk(
+    request: Request,
+    experiment_uuid: UUID,
+    upload_id: UUID,
+    offset: Annotated[NonNegativeInt, Query(description="Position of the chunk in the file.")],
+    context: Annotated[ServerContext, Depends(context_dependency)],
+) -> JSONResponse:
+    """Router for sending a chunk of a resumable upload, as the raw request body written at
+    the offset. When the request is interrupted, the part of the chunk received before the
+    interruption is kept."""
+
+    experiment_dir = await _get_experiment_dir(context, experiment_uuid)
+    try:
+        upload = get_upload(experiment_dir, upload_id)
+        if offset > upload.size:
+            raise HTTPException(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                detail=f"The offset is beyond the file size ({upload.size} bytes).",
+            )
+
+        body_validator = MaxBodySizeValidator(upload.size - offset)
+        received_size = 0
+        with open_upload_data(experiment_dir, upload_id) as file:
+            file.seek(offset)
+
+            def write_data(data: bytes):
+                # only the data in the file is counted, so that the recorded range never
+                # covers data which failed to be written.
+                nonlocal received_size
+                view = memoryview(data)
+                while view:
+                    written_size = file.write(view)
+                    received_size += written_size
+                    view = view[written_size:]
+
+            try:
+                async with UploadWriter(
+                    write_data,
+                    max_pending=settings.upload_max_pending_buffers,
+                    buffer_size=settings.upload_RAM_buffer_size_KB * 1024,
+                ) as upload_writer:
+                    try:
+                        async for chunk in request.stream():
+                            body_validator(chunk=chunk)
+                            await upload_writer.write(chunk)
+                    except ClientDisconnect:
+                        # the data received is kept, the client resumes from the received ranges.
+                        pass
+            finally:
+                record_upload_range(experiment_dir, upload_id, offset, offset + received_size)
+
+    except AQDUploadNonExisting as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error)) from error
+    except AQDMaxBodySizeException as error:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"The chunk exceeds the file size ({upload.size} bytes).",
+        ) from error
+
+    return JSONResponse({"start": offset, "end": offset + received_size})
+
+
+@router.post("/{experiment_uuid}/uploads/{upload_id}/complete")
+async def complete_experiment_file_upload(
+    experiment_uuid: UUID,
+    upload_id: UUID,
+    context: Annotated[ServerContext, Depends(context_dependency)],
+) -> JSONResponse:
+    """Router for completing a resumable upload, atomically moving the received file into the
+    experiment directory."""
+
+    experiment_dir = await _get_experiment_dir(context, experiment_uuid)
+    try:
+        upload = complete_upload(experiment_dir, upload_id)
+    except AQDUploadNonExisting as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error)) from error
+    except AQDUploadIncomplete as error:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(error)) from error
+    except OSError as error:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=f"Could not complete the upload: {error}"
+        ) from error
+
+    return JSONResponse({"result": f"Successfuly uploaded {upload.file_name}"})
+
+
+@router.delete("/{experiment_uuid}/uploads/{upload_id}")
+async def remove_experiment_file_upload(
+    experiment_uuid: UUID,
+    upload_id: UUID,
+    context: Annotated[ServerContext, Depends(context_dependency)],
+) -> JSONResponse:
+    """Router for aborting a resumable upload."""
+
+    experiment_dir = await _get_experiment_dir(context, experiment_uuid)
+    try:
+        remove_upload(experiment_dir, upload_id)
+    except AQDUploadNonExisting as error:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(error)) from error
+
+    return JSONResponse({"result": "Successfully removed the upload"})
+
+
+@router.post("/{experiment_uuid}/archive")
+async def upload_experiment_archive(
+    request: Request,
+    experiment_uuid: UUID,
+    context: Annotated[ServerContext, Depends(context_dependency)],
+    archive_format: Annotated[
+        ArchiveFormat, Query(description="Format of the archive sent as the request body.")
+    ] = ArchiveFormat.TAR,
+) -> JSONResponse:
+    """Router for uploading many files to an experiment at once, as an archive sent as the raw
+    request body. The files at the top level of the archive are added to the experiment,
+    replacing the files with the same names, once the whole archive is extracted."""
+
+    experiment_dir = await _get_experiment_dir(context, experiment_uuid)
+
+    # create experiment directory if it is its first file
+    if not os.path.exists(experiment_dir):
+        os.makedirs(experiment_dir)
+
+    try:
+        with archive_extractor.reserve() as executor:
+            with TemporaryDirectory(dir=experiment_dir) as tmpdirname:
+                extracted_dir = os.path.join(tmpdirname, "files")
+                os.makedirs(extracted_dir)
+                file_names = await _receive_archive(
+                    request, archive_format, extracted_dir, executor
+                )
+
+                for file_name in file_names:
+                    os.replace(
+                        os.path.join(extracted_dir, file_name),
+                        os.path.join(experiment_dir, file_name),
+                    )
+
+    except AQDMaxBodySizeException as error:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=(
+                f"Maximum archive size limit ({settings.upload_archive_max_size_KB * 1024} bytes) "
+                f"exceeded ({error.body_len} bytes read)."
+            ),
+        ) from error
+    except AQDArchiveError as error:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error)) from error
+    except AQDArchiveExtractorBusy as error:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(error),
+            headers={"Retry-After": str(ARCHIVE_EXTRACTOR_BUSY_RETRY_AFTER_S)},
+        ) from error
+
+    return JSONResponse(
+        {
+            "result": f"Successfully uploaded {len(file_names)} file(s)",
+            "file_names": sorted(file_names),
+        }
+    )
+
+
 # pylint: disable=too-many-return-statements,too-many-branches, unused-argument
 @router.post("/{experiment_uuid}/delete_files")
 async def remove_experiment_files(
@@ -231,58 +720,49 @@ async def remove_experiment_files(
         )
 
     try:
-        for file_name in file_list:
-            pathvalidate.validate_filename(file_name)
-
-        # TODO: this is a non-exhaustive check.
-        # It just checks it has no delete permissions at all
-        if not context.user_info.can_delete_experiment_owned_by(context.user_info.uuid):
-            raise AQDPermission(
-                "The user doesn't have permission to delete files from experiment"
+        with raise_http_exceptions(not_found_detail="The specified experiment was not found."):
+            for file_name in file_list:
+                pathvalidate.validate_filename(file_name)
+
+            # TODO: this is a non-exhaustive check.
+            # It just checks it has no delete permissions at all
+            if not context.user_info.can_delete_experiment_owned_by(context.user_info.uuid):
+                raise AQDPermission(
+                    "The user doesn't have permission to delete files from experiment"
+                )
+            # To check if the experiment is accessible by this user
+            await get_experiment_by_uuid(
+                user_info=context.user_info,
+                db_session=context.db_session,
+                experiment_uuid=experiment_uuid,
             )
-        # To check if the experiment is accessible by this user
-        await get_experiment_by_uuid(
-            user_info=context.user_info,
-            db_session=context.db_session,
-            experiment_uuid=experiment_uuid,
-        )
 
-        experiment_dir = build_experiment_dir_absolute_path(
-            str(settings.experiments_dir_path), experiment_uuid
-        )
-
-        if not os.path.exists(experiment_dir):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No files were found for this experiment",
+            experiment_dir = build_experiment_dir_absolute_path(
+                str(settings.experiments_dir_path), experiment_uuid
             )
 
-        invalid_files = []
-        for file_name in file_list:
-            abs_file_path = os.path.join(experiment_dir, file_name)
-            if not os.path.exists(abs_file_path) or not os.path.isfile(abs_file_path):
-                invalid_files.append(file_name)
+            if not os.path.exists(experiment_dir):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="No files were found for this experiment",
+                )
 
-        if invalid_files:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"File(s) not found - {format_list_human_readable(invalid_files)}",
-            )
+            invalid_files = []
+            for file_name in file_list:
+                abs_file_path = os.path.join(experiment_dir, file_name)
+                if not os.path.exists(abs_file_path) or not os.path.isfile(abs_file_path):
+                    invalid_files.append(file_name)
 
-        for file_name in file_list:
-            dest_file_path = os.path.join(experiment_dir, file_name)
-            os.remove(dest_file_path)
+            if invalid_files:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"File(s) not found - {format_list_human_readable(invalid_files)}",
+                )
+
+            for file_name in file_list:
+                dest_file_path = os.path.join(experiment_dir, file_name)
+                os.remove(dest_file_path)
 
-    except AQDPermission as error:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=str(error),
-        ) from error
-    except AQDDBExperimentNonExisting as error:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="The specified experiment was not found.",
-        ) from error
     except pathvalidate.ValidationError as error:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
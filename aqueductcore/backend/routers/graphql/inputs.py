@@ -48,6 +48,19 @@ class ExperimentTagsInput:
     tags: List[str]
 
 
+@strawberry.input
+class ExperimentsTagsUpdateInput:
+    """Input type to add and remove tags of many experiments"""
+
+    uuids: List[UUID] = strawberry.field(description="UUIDs of the experiments to update.")
+    add_tags: List[str] = strawberry.field(
+        default_factory=list, description="Tags to add to the experiments."
+    )
+    remove_tags: List[str] = strawberry.field(
+        default_factory=list, description="Tags to remove from the experiments."
+    )
+
+
 @strawberry.input
 class ExperimentCreateInput:
     """Input type to create experiemnt"""
@@ -69,7 +82,7 @@ class ExperimentFiltersInput:
     """Filters to be applied for experiments"""
 
     title: Optional[str] = strawberry.field(
-        default=None, description="Search string for experiment title and EID."
+        default=None, description="Search string for experiment title, EID and description."
     )
     tags: Optional[List[str]] = strawberry.field(
         default=None, description="List of tags to filter."
@@ -92,6 +105,10 @@ class TagsFilters:
     include_dangling: Optional[bool] = strawberry.field(
         default=None, description="Include tags with no experiments linked."
     )
+    prefix: Optional[str] = strawberry.field(
+        default=None,
+        description="Prefix of the tags to autocomplete, ordered by the number of experiments.",
+    )
 
 
 @strawberry.input
@@ -0,0 +1,92 @@
+"""Request-scoped data loaders, batching the resolution of node fields
+into a single query per request."""
+
+from collections import defaultdict
+from datetime import datetime
+from functools import partial
+from typing import Awaitable, Callable, Dict, List, Tuple, Union
+from uuid import UUID
+
+from strawberry.dataloader import DataLoader
+
+from aqueductcore.backend.context import ServerContext
+from aqueductcore.backend.errors import AQDDBExperimentNonExisting
+from aqueductcore.backend.models.experiment import ExperimentRead
+from aqueductcore.backend.models.task import TaskRead
+from aqueductcore.backend.services.experiment import (
+    get_experiments_by_uuids,
+    get_experiments_files,
+)
+from aqueductcore.backend.services.task_executor import get_experiments_tasks
+from aqueductcore.backend.settings import settings
+
+
+def _get_loader(
+    context: ServerContext, name: str, load_fn: Callable[[ServerContext, List], Awaitable]
+) -> DataLoader:
+    """Returns the data loader of the request, creating it on first use."""
+    loader = context.dataloaders.get(name)
+    if loader is None:
+        loader = DataLoader(load_fn=partial(load_fn, context))
+        context.dataloaders[name] = loader
+    return loader
+
+
+def _non_existing_experiment() -> AQDDBExperimentNonExisting:
+    return AQDDBExperimentNonExisting(
+        "DB query failed due to non-existing experiment with the specified UUID."
+    )
+
+
+async def _load_experiments(
+    context: ServerContext, experiment_uuids: List[UUID]
+) -> List[Union[ExperimentRead, AQDDBExperimentNonExisting]]:
+    experiments = await get_experiments_by_uuids(
+        user_info=context.user_info,
+        db_session=context.db_session,
+        experiment_uuids=experiment_uuids,
+    )
+    return [experiments.get(key, _non_existing_experiment()) for key in experiment_uuids]
+
+
+async def _load_experiments_files(
+    context: ServerContext, experiment_uuids: List[UUID]
+) -> List[Union[List[Tuple[str, datetime]], AQDDBExperimentNonExisting]]:
+    files = await get_experiments_files(
+        user_info=context.user_info,
+        db_session=context.db_session,
+        experiments_root_dir=str(settings.experiments_dir_path),
+        experiment_uuids=experiment_uuids,
+    )
+    return [files.get(key, _non_existing_experiment()) for key in experiment_uuids]
+
+
+async def _load_experiments_tasks(
+    context: ServerContext, experiment_uuids: List[UUID]
+) -> List[List[TaskRead]]:
+    tasks = await get_experiments_tasks(
+        user_info=context.user_info,
+        db_session=context.db_session,
+        experiment_uuids=experiment_uuids,
+    )
+    experiments_tasks: Dict[UUID, List[TaskRead]] = defaultdict(list)
+    for task in tasks:
+        experiments_tasks[task.experiment_uuid].append(task)
+    return [experiments_tasks[key] for key in experiment_uuids]
+
+
+def experiment_loader(context: ServerContext) -> DataLoader[UUID, ExperimentRead]:
+    """Loader of experiments by their UUID."""
+    return _get_loader(context, "experiment", _load_experiments)
+
+
+def experiment_files_loader(
+    context: ServerContext,
+) -> DataLoader[UUID, List[Tuple[str, datetime]]]:
+    """Loader of experiment files by the experiment UUID."""
+    return _get_loader(context, "experiment_files", _load_experiments_files)
+
+
+def experiment_tasks_loader(context: ServerContext) -> DataLoader[UUID, List[TaskRead]]:
+    """Loader of experiment tasks by the experiment UUID."""
+    return _get_loader(context, "experiment_tasks", _load_experiments_tasks)
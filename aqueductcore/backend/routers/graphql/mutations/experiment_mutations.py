@@ -1,20 +1,25 @@
 """GraphQL mutation controller"""
 
+from typing import List
 from uuid import UUID
 
 from aqueductcore.backend.context import ServerContext
+from aqueductcore.backend.models.experiment import NewExperiment
 from aqueductcore.backend.routers.graphql.inputs import (
     ExperimentCreateInput,
     ExperimentRemoveInput,
+    ExperimentsTagsUpdateInput,
     ExperimentTagInput,
     ExperimentTagsInput,
     ExperimentUpdateInput,
 )
 from aqueductcore.backend.routers.graphql.types import (
+    ExperimentCreateResult,
     ExperimentData,
     experiment_model_to_node,
 )
 from aqueductcore.backend.services import experiment as experiment_service
+from aqueductcore.backend.services import experiment_batch as experiment_batch_service
 
 
 async def create_experiment(
@@ -32,6 +37,28 @@ async def create_experiment(
     return experiment_model_to_node(experiment)
 
 
+async def create_experiments(
+    context: ServerContext, create_experiments_input: List[ExperimentCreateInput]
+) -> List[ExperimentCreateResult]:
+    """Create experiments in a batch mutation"""
+
+    results = await experiment_batch_service.create_experiments(
+        user_info=context.user_info,
+        db_session=context.db_session,
+        experiments=[
+            NewExperiment(title=item.title, description=item.description, tags=item.tags)
+            for item in create_experiments_input
+        ],
+    )
+    return [
+        ExperimentCreateResult(
+            experiment=experiment_model_to_node(result.experiment) if result.experiment else None,
+            error=result.error,
+        )
+        for result in results
+    ]
+
+
 async def update_experiment(
     context: ServerContext, experiment_uuid: UUID, experiment_update_input: ExperimentUpdateInput
 ) -> ExperimentData:
@@ -75,6 +102,20 @@ async def add_tags_to_experiment(
     return experiment_model_to_node(experiment)
 
 
+async def update_experiments_tags(
+    context: ServerContext, experiments_tags_update_input: ExperimentsTagsUpdateInput
+) -> List[UUID]:
+    """Add and remove tags of many experiments mutation"""
+
+    return await experiment_batch_service.update_experiments_tags(
+        user_info=context.user_info,
+        db_session=context.db_session,
+        experiment_uuids=experiments_tags_update_input.uuids,
+        add_tags=experiments_tags_update_input.add_tags,
+        remove_tags=experiments_tags_update_input.remove_tags,
+    )
+
+
 async def remove_tag_from_experiment(
     context: ServerContext, experiment_tag_input: ExperimentTagInput
 ) -> ExperimentData:
@@ -1,6 +1,6 @@
 """GraohQL Mutations Controller."""
 
-from typing import cast
+from typing import List, cast
 from uuid import UUID
 
 import strawberry
@@ -12,6 +12,7 @@ from aqueductcore.backend.routers.graphql.inputs import (
     ExecuteExtensionInput,
     ExperimentCreateInput,
     ExperimentRemoveInput,
+    ExperimentsTagsUpdateInput,
     ExperimentTagInput,
     ExperimentTagsInput,
     ExperimentUpdateInput,
@@ -20,15 +21,21 @@ from aqueductcore.backend.routers.graphql.mutations.experiment_mutations import
     add_tag_to_experiment,
     add_tags_to_experiment,
     create_experiment,
+    create_experiments,
     remove_experiment,
     remove_tag_from_experiment,
     update_experiment,
+    update_experiments_tags,
 )
 from aqueductcore.backend.routers.graphql.mutations.task_mutations import (
     cancel_task,
     execute_extension,
 )
-from aqueductcore.backend.routers.graphql.types import ExperimentData, TaskData
+from aqueductcore.backend.routers.graphql.types import (
+    ExperimentCreateResult,
+    ExperimentData,
+    TaskData,
+)
 
 
 @strawberry.type
@@ -47,6 +54,18 @@ class Mutation:
         )
         return experiment
 
+    @strawberry.mutation
+    async def create_experiments(
+        self, info: Info, create_experiments_input: List[ExperimentCreateInput]
+    ) -> List[ExperimentCreateResult]:
+        """Mutation to create experiments in a batch, with a result for each of them"""
+
+        context = cast(ServerContext, info.context)
+        results = await create_experiments(
+            context=context, create_experiments_input=create_experiments_input
+        )
+        return results
+
     @strawberry.mutation
     async def update_experiment(
         self, info: Info, uuid: UUID, experiment_update_input: ExperimentUpdateInput
@@ -85,6 +104,18 @@ class Mutation:
         )
         return experiment
 
+    @strawberry.mutation
+    async def update_experiments_tags(
+        self, info: Info, experiments_tags_update_input: ExperimentsTagsUpdateInput
+    ) -> List[UUID]:
+        """Mutation to add and remove tags of many experiments at once. Returns the UUIDs of
+        the updated experiments."""
+
+        context = cast(ServerContext, info.context)
+        return await update_experiments_tags(
+            context=context, experiments_tags_update_input=experiments_tags_update_input
+        )
+
     @strawberry.mutation
     async def remove_tag_from_experiment(
         self, info: Info, experiment_tag_input: ExperimentTagInput
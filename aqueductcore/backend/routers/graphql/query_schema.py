@@ -49,13 +49,26 @@ class Query:
         return get_current_user_info(context=context)
 
     @strawberry.field
-    async def experiments(
-        self, info: Info, offset: int, limit: int, filters: Optional[ExperimentFiltersInput] = None
+    async def experiments(  # pylint: disable=too-many-arguments
+        self,
+        info: Info,
+        limit: int,
+        offset: int = 0,
+        filters: Optional[ExperimentFiltersInput] = None,
+        cursor: Optional[str] = None,
+        order_by_relevance: bool = False,
     ) -> Experiments:
-        """Resolver for the experiments."""
+        """Resolver for the experiments. Pages may be requested either by offset or by
+        the cursor returned with the previous page. Search results of the title filter
+        may be ordered by relevance, paged by offset."""
         context = cast(ServerContext, info.context)
         experiments = await get_expriments(
-            context=context, offset=offset, limit=limit, filters=filters
+            context=context,
+            offset=offset,
+            limit=limit,
+            filters=filters,
+            cursor=cursor,
+            order_by_relevance=order_by_relevance,
         )
         return experiments
 
@@ -86,7 +99,12 @@ class Query:
     @strawberry.field
     async def extensions(self) -> List[ExtensionInfo]:
         """List of extensions available now"""
-        return list(map(ExtensionInfo.from_extension, ExtensionsExecutor.list_extensions()))
+        return [
+            ExtensionInfo.from_extension(
+                extension, venv_status=ExtensionsExecutor.venv_status(extension.name)
+            )
+            for extension in ExtensionsExecutor.list_extensions()
+        ]
 
     @strawberry.field
     async def task(
@@ -100,10 +118,20 @@ class Query:
         return await get_task(context=cast(ServerContext, info.context), task_id=task_id)
 
     @strawberry.field
-    async def tasks(
-        self, info: Info, offset: int, limit: int, filters: Optional[TasksFilterInput] = None
+    async def tasks(  # pylint: disable=too-many-arguments
+        self,
+        info: Info,
+        limit: int,
+        offset: int = 0,
+        filters: Optional[TasksFilterInput] = None,
+        cursor: Optional[str] = None,
     ) -> Tasks:
-        """Returns information about all tasks."""
+        """Returns information about all tasks. Pages may be requested either by offset or by
+        the cursor returned with the previous page."""
         return await get_tasks(
-            context=cast(ServerContext, info.context), filters=filters, offset=offset, limit=limit
+            context=cast(ServerContext, info.context),
+            filters=filters,
+            offset=offset,
+            limit=limit,
+            cursor=cursor,
         )
@@ -24,6 +24,7 @@ from aqueductcore.backend.services.experiment import (
     get_experiment_by_eid,
     get_experiment_by_uuid,
 )
+from aqueductcore.backend.services.utils import encode_page_cursor
 from aqueductcore.backend.services.validators import MAX_EXPERIMENTS_PER_REQUEST
 
 
@@ -43,6 +44,8 @@ async def get_expriments(
     offset: int,
     limit: int,
     filters: Optional[ExperimentFiltersInput] = None,
+    cursor: Optional[str] = None,
+    order_by_relevance: bool = False,
 ) -> Experiments:
     """Resolve all experiments."""
 
@@ -51,7 +54,7 @@ async def get_expriments(
             f"Maximum allowed limit for experiments is {MAX_EXPERIMENTS_PER_REQUEST}"
         )
 
-    experiments = await get_all_experiments(
+    experiments, total_experiments_count = await get_all_experiments(
         user_info=context.user_info,
         db_session=context.db_session,
         title_filter=filters.title if filters else None,
@@ -60,11 +63,19 @@ async def get_expriments(
         start_date=filters.start_date if filters else None,
         end_date=filters.end_date if filters else None,
         order_by_creation_date=True,
+        order_by_relevance=order_by_relevance,
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
     )
-    experiment_nodes = [experiment_model_to_node(item) for item in experiments][
-        offset : offset + limit
-    ]
-    return experiments_node(experiment_nodes, len(experiments))
+    experiment_nodes = [experiment_model_to_node(item) for item in experiments]
+
+    next_cursor = None
+    # cursors follow the creation date order, so relevance ordered pages are paged by offset.
+    if experiments and len(experiments) == limit and not order_by_relevance:
+        next_cursor = encode_page_cursor(experiments[-1].created_at, experiments[-1].uuid)
+
+    return experiments_node(experiment_nodes, total_experiments_count, next_cursor)
 
 
 async def get_experiment(
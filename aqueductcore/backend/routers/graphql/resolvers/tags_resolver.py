@@ -7,9 +7,13 @@ from typing import Optional
 from aqueductcore.backend.context import ServerContext
 from aqueductcore.backend.errors import AQDValidationError
 from aqueductcore.backend.routers.graphql.inputs import TagsFilters
-from aqueductcore.backend.routers.graphql.types import Tags
-from aqueductcore.backend.services.experiment import get_all_tags
-from aqueductcore.backend.services.validators import MAX_TAGS_PER_REQUEST
+from aqueductcore.backend.routers.graphql.types import Tags, TagStatistics
+from aqueductcore.backend.services.experiment import get_tags_page
+from aqueductcore.backend.services.validators import (
+    MAX_EXPERIMENT_TAG_LENGTH,
+    MAX_TAGS_PER_REQUEST,
+    validate_tag,
+)
 
 
 async def get_tags(
@@ -24,25 +28,28 @@ async def get_tags(
         raise AQDValidationError(f"Maximum allowed limit for tags is {MAX_TAGS_PER_REQUEST}")
 
     include_dangling = False
+    prefix = None
     if filters:
         if filters.include_dangling:
             include_dangling = filters.include_dangling
-
-    tags = [
-        item.name
-        for item in await get_all_tags(
-            user_info=context.user_info,
-            db_session=context.db_session,
-            include_dangling=include_dangling,
-        )
-    ]
-    tags_count = len(tags)
-
-    if offset and limit:
-        tags = tags[offset : offset + limit]
-    elif offset and not limit:
-        tags = tags[offset:]
-    elif not offset and limit:
-        tags = tags[:limit]
-
-    return Tags(tags_data=tags, total_tags_count=tags_count)
+        if filters.prefix is not None:
+            prefix = validate_tag(filters.prefix, max_len=MAX_EXPERIMENT_TAG_LENGTH)
+
+    tags, tags_count = await get_tags_page(
+        user_info=context.user_info,
+        db_session=context.db_session,
+        include_dangling=include_dangling,
+        prefix=prefix,
+        order_by_usage=prefix is not None,
+        # zero values keep meaning no offset and no limit.
+        offset=offset or None,
+        limit=limit or None,
+    )
+
+    return Tags(
+        tags_data=[item.name for item in tags],
+        tags_statistics=[
+            TagStatistics(name=item.name, experiments_count=item.experiments_count) for item in tags
+        ],
+        total_tags_count=tags_count,
+    )
@@ -14,6 +14,7 @@ from aqueductcore.backend.routers.graphql.types import (
     task_model_to_node,
 )
 from aqueductcore.backend.services.task_executor import get_all_tasks, get_task_by_uuid
+from aqueductcore.backend.services.utils import encode_page_cursor
 from aqueductcore.backend.services.validators import MAX_EXPERIMENTS_PER_REQUEST
 
 
@@ -22,6 +23,7 @@ async def get_tasks(
     offset: int,
     limit: int,
     filters: Optional[TasksFilterInput] = None,
+    cursor: Optional[str] = None,
 ) -> Tasks:
     """Resolve all tasks."""
 
@@ -38,7 +40,7 @@ async def get_tasks(
                 "Only UUID is supported as experiment identifier in Task filter"
             )
 
-    tasks = await get_all_tasks(
+    tasks, total_tasks_count = await get_all_tasks(
         user_info=context.user_info,
         db_session=context.db_session,
         start_date=filters.start_date if filters else None,
@@ -48,9 +50,19 @@ async def get_tasks(
         username=filters.username if filters else None,
         experiment_uuid=experiment.value if experiment else None,  # type: ignore
         order_by_creation_date=True,
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
+    )
+    task_nodes = [task_model_to_node(value=item) for item in tasks]
+
+    next_cursor = None
+    if tasks and len(tasks) == limit:
+        next_cursor = encode_page_cursor(tasks[-1].received_at, tasks[-1].uuid)
+
+    return Tasks(
+        tasks_data=task_nodes, total_tasks_count=total_tasks_count, next_cursor=next_cursor
     )
-    task_nodes = [task_model_to_node(value=item) for item in tasks][offset : offset + limit]
-    return Tasks(tasks_data=task_nodes, total_tasks_count=len(tasks))
 
 
 async def get_task(context: ServerContext, task_id: UUID) -> Optional[TaskData]:
@@ -13,12 +13,13 @@ from strawberry.types import Info
 from aqueductcore.backend.context import ServerContext
 from aqueductcore.backend.models.experiment import ExperimentRead
 from aqueductcore.backend.models.task import TaskRead
-from aqueductcore.backend.services.experiment import (
-    get_experiment_by_uuid,
-    get_experiment_files,
+from aqueductcore.backend.routers.graphql.loaders import (
+    experiment_files_loader,
+    experiment_loader,
+    experiment_tasks_loader,
 )
 from aqueductcore.backend.services.extensions import Extension
-from aqueductcore.backend.services.task_executor import get_all_tasks
+from aqueductcore.backend.services.extensions_executor import VenvStatus
 from aqueductcore.backend.settings import settings
 
 
@@ -27,12 +28,7 @@ async def resolve_files(info: Info, root: ExperimentData) -> List[ExperimentFile
     experiment_uuid = root.uuid
     result: List[ExperimentFile] = []
     context = cast(ServerContext, info.context)
-    files = await get_experiment_files(
-        user_info=context.user_info,
-        db_session=context.db_session,
-        experiments_root_dir=str(settings.experiments_dir_path),
-        experiment_uuid=experiment_uuid,
-    )
+    files = await experiment_files_loader(context).load(experiment_uuid)
     for name, modified_time in files:
         result.append(
             ExperimentFile(
@@ -48,9 +44,7 @@ async def resolve_files(info: Info, root: ExperimentData) -> List[ExperimentFile
 async def resovle_tasks(info: Info, root: ExperimentData) -> List[TaskData]:
     """Resolve experiment's tasks."""
     context = cast(ServerContext, info.context)
-    tasks = await get_all_tasks(
-        user_info=context.user_info, db_session=context.db_session, experiment_uuid=root.uuid
-    )
+    tasks = await experiment_tasks_loader(context).load(root.uuid)
     task_nodes = [task_model_to_node(value=item) for item in tasks]
 
     return task_nodes
@@ -59,11 +53,7 @@ async def resovle_tasks(info: Info, root: ExperimentData) -> List[TaskData]:
 async def resolve_experiment(info: Info, root: TaskData) -> ExperimentData:
     """Resolve experiment's tasks."""
     context = cast(ServerContext, info.context)
-    experiment = await get_experiment_by_uuid(
-        user_info=context.user_info,
-        db_session=context.db_session,
-        experiment_uuid=root.experiment_uuid,
-    )
+    experiment = await experiment_loader(context).load(root.experiment_uuid)
 
     return experiment_model_to_node(experiment)
 
@@ -99,6 +89,18 @@ class ExperimentData:
     )
 
 
+@strawberry.type(description="Result of creating a single experiment in a batch.")
+class ExperimentCreateResult:
+    """GraphQL node."""
+
+    experiment: Optional[ExperimentData] = strawberry.field(
+        default=None, description="Created experiment, if it was valid."
+    )
+    error: Optional[str] = strawberry.field(
+        default=None, description="Reason the experiment was not created."
+    )
+
+
 @strawberry.type(description="Paginated list of experiments")
 class Experiments:
     """GraphQL node"""
@@ -109,6 +111,9 @@ class Experiments:
     total_experiments_count: int = strawberry.field(
         description="Total number of experiments in the filtered dataset"
     )
+    next_cursor: Optional[str] = strawberry.field(
+        default=None, description="Cursor to request the page following this one."
+    )
 
 
 @strawberry.type(description="Current user information")
@@ -119,11 +124,24 @@ class UserInfo:
     scopes: List[str] = strawberry.field(description="List of scopes available to the user.")
 
 
+@strawberry.type(description="Tag with the number of experiments linked to it.")
+class TagStatistics:
+    """GraphQL node"""
+
+    name: str = strawberry.field(description="Name of the tag.")
+    experiments_count: int = strawberry.field(
+        description="Number of experiments linked to the tag."
+    )
+
+
 @strawberry.type(description="Paginated list of experiments")
 class Tags:
     """GraphQL node"""
 
     tags_data: List[str] = strawberry.field(description="The list of tags.")
+    tags_statistics: List[TagStatistics] = strawberry.field(
+        description="The list of tags with the number of experiments linked to them."
+    )
     total_tags_count: int = strawberry.field(description="Total number of tags.")
 
 
@@ -150,6 +168,13 @@ class ExtensionActionInfo:
     experiment_variable_name: Optional[str]
 
 
+ExtensionVenvStatus = strawberry.enum(
+    VenvStatus,
+    name="ExtensionVenvStatus",
+    description="Provisioning states of extension virtual environments",
+)
+
+
 @strawberry.type
 class ExtensionInfo:
     """Extension information passed to the frontend"""
@@ -158,9 +183,12 @@ class ExtensionInfo:
     description: Optional[str]
     authors: str = strawberry.field(description="Extension authors' emails")
     actions: List[ExtensionActionInfo]
+    venv_status: VenvStatus = strawberry.field(
+        description="Provisioning state of the extension virtual environment."
+    )
 
     @staticmethod
-    def from_extension(extension: Extension):
+    def from_extension(extension: Extension, venv_status: VenvStatus):
         """Generates a extension information object for a extension model."""
 
         actions = []
@@ -194,6 +222,7 @@ class ExtensionInfo:
             description=extension.description,
             authors=extension.authors,
             actions=actions,
+            venv_status=venv_status,
         )
 
 
@@ -249,6 +278,9 @@ class Tasks:
     total_tasks_count: int = strawberry.field(
         description="Total number of tasks in the filtered dataset"
     )
+    next_cursor: Optional[str] = strawberry.field(
+        default=None, description="Cursor to request the page following this one."
+    )
 
 
 def task_model_to_node(value: TaskRead) -> TaskData:
@@ -306,11 +338,15 @@ def experiment_model_to_node(value: ExperimentRead) -> ExperimentData:
 
 
 def experiments_node(
-    experiments_data: List[ExperimentData], total_experiments_count: int
+    experiments_data: List[ExperimentData],
+    total_experiments_count: int,
+    next_cursor: Optional[str] = None,
 ) -> Experiments:
     """Convert ORM Experiment to Pydantic Experiment."""
     experiment = Experiments(
-        experiments_data=experiments_data, total_experiments_count=total_experiments_count
+        experiments_data=experiments_data,
+        total_experiments_count=total_experiments_count,
+        next_cursor=next_cursor,
     )
 
     return experiment
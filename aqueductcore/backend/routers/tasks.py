@@ -0,0 +1,161 @@
+"""Router for handling task logs."""
+
+import os
+from asyncio import get_running_loop, sleep
+from typing import AsyncGenerator, Literal, Optional
+from uuid import UUID
+
+from celery import states
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import NonNegativeInt
+from typing_extensions import Annotated
+
+from aqueductcore.backend.context import ServerContext, context_dependency
+from aqueductcore.backend.models.task import TaskRead
+from aqueductcore.backend.routers.utils import raise_http_exceptions
+from aqueductcore.backend.services.constants import TASK_LOG_FILE_NAMES
+from aqueductcore.backend.services.task_executor import (
+    build_task_logs_dir_absolute_path,
+    get_task_by_uuid,
+    is_task_finished,
+)
+from aqueductcore.backend.settings import settings
+
+router = APIRouter()
+
+
+async def _get_visible_task(context: ServerContext, task_id: UUID) -> TaskRead:
+    """Returns the task if it is visible to the user, otherwise raises an HTTP exception."""
+    with raise_http_exceptions(not_found_detail="The specified task was not found."):
+        return await get_task_by_uuid(
+            user_info=context.user_info, db_session=context.db_session, task_id=task_id
+        )
+
+
+def _build_task_log_path(task: TaskRead, stream_name: str) -> str:
+    """Returns the absolute path of the log file of a task."""
+    logs_dir = build_task_logs_dir_absolute_path(
+        str(settings.experiments_dir_path), task.experiment_uuid, task.uuid
+    )
+    return os.path.join(logs_dir, TASK_LOG_FILE_NAMES[stream_name])
+
+
+def _read_file_chunk(file_path: str, position: int, size: int) -> bytes:
+    """Reads a chunk of a file from the position, or nothing if the file does not exist."""
+    try:
+        with open(file_path, mode="rb") as file:
+            file.seek(position)
+            return file.read(size)
+    except FileNotFoundError:
+        return b""
+
+
+def _format_log_event(data: bytes, position: int) -> str:
+    """Formats the lines of the log as a server-sent event, identified by the byte position
+    in the log file after them."""
+    text = data.decode("utf-8", errors="replace")
+    if text.endswith("\n"):
+        text = text[:-1]
+    lines = [line.rstrip("\r") for line in text.split("\n")]
+    event_data = "".join(f"data: {line}\n" for line in lines)
+    return f"id: {position}\n{event_data}\n"
+
+
+async def _follow_log_file(
+    file_path: str, task_id: str, position: int, finished: bool
+) -> AsyncGenerator[str, None]:
+    """Streams the content of the log file from the position as server-sent events,
+    line by line, until the task is finished. The stream ends with a timeout event
+    if the log receives no output for the idle timeout, e.g. when the task result
+    has expired from the result backend."""
+    chunk_size = settings.download_chunk_size_KB * 1024
+    idle_timeout = settings.task_logs_follow_idle_timeout_s
+    buffer = b""
+    loop = get_running_loop()
+    last_output_time = loop.time()
+
+    while True:
+        # the task state is checked before reading, so that the output written
+        # before the task has finished is always read.
+        finished = finished or await is_task_finished(task_id)
+        data = await loop.run_in_executor(
+            None, _read_file_chunk, file_path, position + len(buffer), chunk_size
+        )
+        buffer += data
+        at_end = finished and len(data) < chunk_size
+
+        # only complete lines are sent, unless there is no more output to wait for,
+        # or the incomplete line fills a whole chunk.
+        lines_size = buffer.rfind(b"\n") + 1
+        if at_end or len(buffer) - lines_size >= chunk_size:
+            lines_size = len(buffer)
+        if lines_size > 0:
+            position += lines_size
+            yield _format_log_event(buffer[:lines_size], position)
+            buffer = buffer[lines_size:]
+
+        if at_end:
+            yield f"id: {position}\nevent: end\ndata: \n\n"
+            return
+
+        if data:
+            last_output_time = loop.time()
+        elif loop.time() - last_output_time >= idle_timeout:
+            yield f"id: {position}\nevent: timeout\ndata: \n\n"
+            return
+
+        if len(data) < chunk_size:
+            await sleep(settings.task_logs_follow_interval_ms / 1000)
+
+
+@router.get("/{task_id}/logs/{stream_name}")
+async def download_task_log(
+    task_id: UUID,
+    stream_name: Literal["stdout", "stderr"],
+    context: Annotated[ServerContext, Depends(context_dependency)],
+) -> FileResponse:
+    """Router for downloading the full standard output or error of a task."""
+
+    # check if the task is visible to the user, otherwise raises an exception.
+    task = await _get_visible_task(context=context, task_id=task_id)
+    file_path = _build_task_log_path(task=task, stream_name=stream_name)
+
+    if not os.path.exists(file_path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="The requested log is not found."
+        )
+
+    response = FileResponse(
+        file_path, stat_result=os.stat(file_path), media_type="text/plain; charset=utf-8"
+    )
+    response.chunk_size = settings.download_chunk_size_KB * 1024
+
+    return response
+
+
+@router.get("/{task_id}/logs/{stream_name}/follow")
+async def follow_task_log(
+    task_id: UUID,
+    stream_name: Literal["stdout", "stderr"],
+    context: Annotated[ServerContext, Depends(context_dependency)],
+    last_event_id: Annotated[Optional[NonNegativeInt], Header()] = None,
+) -> StreamingResponse:
+    """Router for following the standard output or error of a task while it is running.
+    The new lines are pushed as server-sent events until the task is finished. Clients
+    may resume the stream with the Last-Event-ID header."""
+
+    # check if the task is visible to the user, otherwise raises an exception.
+    task = await _get_visible_task(context=context, task_id=task_id)
+    file_path = _build_task_log_path(task=task, stream_name=stream_name)
+
+    return StreamingResponse(
+        _follow_log_file(
+            file_path=file_path,
+            task_id=task.uuid,
+            position=last_event_id or 0,
+            finished=task.status in states.READY_STATES,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
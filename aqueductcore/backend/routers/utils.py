@@ -0,0 +1,33 @@
+"""Shared utilities of the routers."""
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from fastapi import HTTPException, status
+
+from aqueductcore.backend.errors import (
+    AQDDBExperimentNonExisting,
+    AQDDBTaskNonExisting,
+    AQDPermission,
+)
+
+
+@contextmanager
+def raise_http_exceptions(not_found_detail: str) -> Iterator[None]:
+    """Raises the HTTP exceptions matching the errors of looking experiments or tasks up.
+
+    Args:
+        not_found_detail: Detail of the exception raised when the entity does not exist.
+
+    """
+    try:
+        yield
+    except (AQDDBExperimentNonExisting, AQDDBTaskNonExisting) as error:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=not_found_detail
+        ) from error
+    except AQDPermission as error:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(error),
+        ) from error
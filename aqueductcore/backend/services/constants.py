@@ -1,3 +1,9 @@
 """Constant values"""
 
 MARKDOWN_EXTENSIONS = ["markdn", "markdown", "md", "mdown"]
+
+EXPERIMENT_EID_PATTERN = r"^(19[0-9]{2}|2[0-9]{3})(0[1-9]|1[012])([123]0|[012][1-9]|31)-(\d+)$"
+
+TASK_LOGS_DIR_NAME = ".tasks"
+UPLOADS_DIR_NAME = ".uploads"
+TASK_LOG_FILE_NAMES = {"stdout": "stdout.log", "stderr": "stderr.log"}
@@ -2,16 +2,17 @@
 
 import errno
 import os
-import re
-from datetime import date, datetime, time, timezone
+from collections import Counter
+from datetime import datetime, timezone
 from shutil import rmtree
-from typing import Callable, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from pydantic import ConfigDict, Field, validate_call
-from sqlalchemy import delete, func, or_, select
+from pydantic import ConfigDict, Field, NonNegativeInt, validate_call
+from sqlalchemy import and_, case, delete, exists, false, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.sql.elements import ColumnElement
 
 from aqueductcore.backend.context import UserInfo
 from aqueductcore.backend.errors import (
@@ -22,10 +23,22 @@ from aqueductcore.backend.errors import (
     AQDValidationError,
 )
 from aqueductcore.backend.models import orm
-from aqueductcore.backend.models.experiment import ExperimentRead, TagCreate, TagRead
+from aqueductcore.backend.models.constants import ARCHIVED
+from aqueductcore.backend.models.experiment import (
+    ExperimentRead,
+    NewExperiment,
+    TagCreate,
+    TagRead,
+)
+from aqueductcore.backend.services.experiment_batch import (
+    allocate_experiment_eids,
+    build_db_experiment,
+    get_or_create_tags,
+    get_or_create_user,
+)
 from aqueductcore.backend.services.utils import (
+    decode_page_cursor,
     experiment_orm_to_model,
-    generate_experiment_uuid_and_eid,
     tag_model_to_orm,
     tag_orm_to_model,
 )
@@ -40,14 +53,73 @@ from aqueductcore.backend.services.validators import (
 )
 from aqueductcore.backend.settings import settings
 
-ARCHIVED = "__archived__"
-
 # pylint: disable=redefined-outer-name
 func: Callable
 
 
+def _title_search_clauses(
+    dialect_name: str, search: str, fuzzy: bool
+) -> Tuple[ColumnElement[bool], ColumnElement[float]]:
+    """Build the filter and the relevance of the experiments search over title, EID and
+    description. PostgreSQL ranks by trigram similarity and, for fuzzy searches, matches
+    titles with similar words as well, both served by the trigram indexes of the columns.
+
+    Args:
+        dialect_name: Name of the database dialect.
+        search: Search string.
+        fuzzy: Match the titles with words similar to the search string as well.
+
+    Returns:
+        Tuple of the filter clause and the relevance expression, higher is more relevant.
+
+    """
+    description = func.coalesce(orm.Experiment.description, "")
+    filter_clause = or_(
+        orm.Experiment.title.ilike(f"%{search}%"),
+        orm.Experiment.eid.ilike(f"%{search}%"),
+        orm.Experiment.description.ilike(f"%{search}%"),
+    )
+
+    if dialect_name == "postgresql":
+        if fuzzy:
+            filter_clause = or_(filter_clause, orm.Experiment.title.op("%>")(search))
+        relevance = func.greatest(
+            func.word_similarity(search, orm.Experiment.title),
+            func.word_similarity(search, orm.Experiment.eid),
+            func.word_similarity(search, description),
+        )
+        return filter_clause, relevance
+
+    relevance = case(
+        (func.lower(orm.Experiment.eid) == search.lower(), 4),
+        (func.lower(orm.Experiment.title) == search.lower(), 4),
+        (orm.Experiment.title.ilike(f"{search}%"), 3),
+        (orm.Experiment.title.ilike(f"%{search}%"), 2),
+        (orm.Experiment.eid.ilike(f"%{search}%"), 2),
+        else_=1,
+    )
+    return filter_clause, relevance
+
+
+def _tagged_with(tag_keys: List[str]) -> ColumnElement[bool]:
+    """Build a semi-join matching the experiments linked to any of the tags. It reads the
+    relation table only, using its primary key, so it does not multiply the experiment rows.
+
+    Args:
+        tag_keys: Keys of the tags.
+
+    Returns:
+        EXISTS clause correlated with the experiments.
+
+    """
+    return exists().where(
+        orm.experiment_tag_association.c.experiment_uuid == orm.Experiment.uuid,
+        orm.experiment_tag_association.c.tag_key.in_(tag_keys),
+    )
+
+
 @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
-async def get_all_experiments(  # pylint: disable=too-many-arguments
+async def get_all_experiments(  # pylint: disable=too-many-arguments,too-many-locals
     user_info: UserInfo,
     db_session: AsyncSession,
     title_filter: Optional[ExperimentTitleFilter] = None,
@@ -60,35 +132,46 @@ async def get_all_experiments(  # pylint: disable=too-many-arguments
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     order_by_creation_date: bool = False,
-) -> List[ExperimentRead]:
-    """Get list of all experiments
+    order_by_relevance: bool = False,
+    offset: Optional[NonNegativeInt] = None,
+    limit: Optional[NonNegativeInt] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[ExperimentRead], int]:
+    """Get a page of experiments and the total number of experiments matching the filters.
 
     Args:
         db_session: Database async session.
         filters: Filter information.
+        order_by_relevance: Order the experiments by relevance to the title filter first.
+            Not supported together with a cursor.
+        offset: Number of experiments to skip before the page starts.
+        limit: Maximum number of experiments in the page.
+        cursor: Opaque cursor of the last experiment of the previous page. When provided,
+            experiments are ordered by creation date and the page starts right after it.
 
     Returns:
-        List of experiments data models.
+        Tuple of the experiments data models in the page and the total count of
+        experiments matching the filters.
 
     """
+    # pylint: disable=too-many-branches
 
-    statement = (
-        select(orm.Experiment)
-        .options(joinedload(orm.Experiment.tags))
-        .options(joinedload(orm.Experiment.created_by_user))
-    )
+    if order_by_relevance and cursor is not None:
+        raise AQDValidationError("Ordering by relevance is not supported with a page cursor.")
+
+    statement = select(orm.Experiment)
 
     if not user_info.can_view_any_experiment():
         statement = statement.filter(orm.Experiment.created_by == user_info.uuid)
     # TODO: no check for no scopes at all
 
+    relevance = None
     if title_filter is not None:
-        statement = statement.filter(
-            or_(
-                orm.Experiment.title.ilike(f"%{title_filter}%"),
-                orm.Experiment.eid.ilike(f"%{title_filter}%"),
-            )
+        # similar titles are only matched when the most relevant experiments come first.
+        title_clause, relevance = _title_search_clauses(
+            db_session.bind.dialect.name, title_filter, fuzzy=order_by_relevance
         )
+        statement = statement.filter(title_clause)
 
     utc_start_date = start_date.astimezone(timezone.utc) if start_date else None
     utc_end_date = end_date.astimezone(timezone.utc) if end_date else None
@@ -103,32 +186,51 @@ async def get_all_experiments(  # pylint: disable=too-many-arguments
 
     if tags is not None:
         tags = [tag.lower() for tag in tags]
-        statement = statement.join(orm.Experiment.tags).where(orm.Tag.key.in_(tags))
-
-    if order_by_creation_date:
-        statement = statement.order_by(orm.Experiment.created_at.desc())
+        statement = statement.filter(_tagged_with(tags))
 
     if should_include_tags is not None:
-        should_include_tags = [tag.lower() for tag in should_include_tags]
-        filtered_experiments = (
-            select(orm.Experiment.uuid)
-            .options(joinedload(orm.Experiment.tags))
-            .join(
-                orm.experiment_tag_association,
-                orm.Experiment.uuid == orm.experiment_tag_association.c.experiment_uuid,
+        should_include_tags = sorted({tag.lower() for tag in should_include_tags})
+        statement = statement.filter(*(_tagged_with([tag]) for tag in should_include_tags))
+
+    if not (should_include_tags and (ARCHIVED in should_include_tags)):
+        statement = statement.filter(orm.Experiment.archived == false())
+
+    count_statement = select(func.count()).select_from(statement.subquery())
+    total_experiments_count = (await db_session.execute(count_statement)).scalar_one()
+
+    # tags are loaded in a separate query to keep one row per experiment in the page.
+    statement = statement.options(selectinload(orm.Experiment.tags)).options(
+        joinedload(orm.Experiment.created_by_user)
+    )
+
+    if cursor is not None:
+        cursor_created_at, cursor_uuid = decode_page_cursor(cursor)
+        statement = statement.filter(
+            or_(
+                orm.Experiment.created_at < cursor_created_at,
+                and_(
+                    orm.Experiment.created_at == cursor_created_at,
+                    orm.Experiment.uuid < cursor_uuid,
+                ),
             )
-            .join(orm.Tag, orm.experiment_tag_association.c.tag_key == orm.Tag.key)
-            .filter(orm.Tag.key.in_(should_include_tags))
-            .group_by(orm.Experiment.uuid)
-            .having(func.count(orm.Tag.key) == len(should_include_tags))
         )
-        statement = statement.filter(orm.Experiment.uuid.in_(filtered_experiments))
 
-    if not (should_include_tags and (ARCHIVED in should_include_tags)):
-        statement = statement.filter(~orm.Experiment.tags.any(orm.Tag.key.like(ARCHIVED)))
+    if order_by_relevance and relevance is not None:
+        statement = statement.order_by(relevance.desc())
+
+    if order_by_creation_date or cursor is not None:
+        # UUID breaks ties between experiments created at the same time to keep pages stable.
+        statement = statement.order_by(orm.Experiment.created_at.desc(), orm.Experiment.uuid.desc())
+
+    if offset is not None:
+        statement = statement.offset(offset)
+
+    if limit is not None:
+        statement = statement.limit(limit)
 
     result = await db_session.execute(statement)
-    return [(await experiment_orm_to_model(item)) for item in result.unique().scalars().all()]
+    experiments = [(await experiment_orm_to_model(item)) for item in result.scalars().all()]
+    return experiments, total_experiments_count
 
 
 @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
@@ -166,6 +268,37 @@ async def get_experiment_by_uuid(
     return await experiment_orm_to_model(experiment)
 
 
+@validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+async def get_experiments_by_uuids(
+    user_info: UserInfo, db_session: AsyncSession, experiment_uuids: List[UUID]
+) -> Dict[UUID, ExperimentRead]:
+    """Get a set of experiments by their UUIDs with a single query.
+
+    Args:
+        db_session: Database async session.
+        experiment_uuids: UUIDs of the experiments.
+
+    Returns:
+        Experiment data models keyed by the UUID of the experiments visible to the user.
+    """
+    statement = (
+        select(orm.Experiment)
+        .options(selectinload(orm.Experiment.tags))
+        .options(joinedload(orm.Experiment.created_by_user))
+        .where(orm.Experiment.uuid.in_(experiment_uuids))
+    )
+
+    if not user_info.can_view_any_experiment():
+        statement = statement.filter(orm.Experiment.created_by == user_info.uuid)
+
+    result = await db_session.execute(statement)
+
+    return {
+        experiment.uuid: await experiment_orm_to_model(experiment)
+        for experiment in result.scalars().all()
+    }
+
+
 @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
 async def get_experiment_by_eid(
     user_info: UserInfo, db_session: AsyncSession, eid: str
@@ -221,8 +354,6 @@ async def get_experiment_files(
         List of file names associated with the experiment.
 
     """
-    file_names: List[Tuple[str, datetime]] = []
-
     # check access to the experiment by retrieving it.
     await get_experiment_by_uuid(
         user_info=user_info, db_session=db_session, experiment_uuid=experiment_uuid
@@ -230,6 +361,45 @@ async def get_experiment_files(
 
     folder_path = build_experiment_dir_absolute_path(experiments_root_dir, experiment_uuid)
 
+    return _scan_experiment_files(folder_path)
+
+
+@validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+async def get_experiments_files(
+    user_info: UserInfo,
+    db_session: AsyncSession,
+    experiments_root_dir: str,
+    experiment_uuids: List[UUID],
+) -> Dict[UUID, List[Tuple[str, datetime]]]:
+    """Returns the lists of the file names associated with a set of experiments, with a single
+    access check for all of them.
+
+    Args:
+        experiments_root_dir: Directory to search for experiments' directories based on their UUID.
+        experiment_uuids: UUIDs of the experiments.
+
+    Returns:
+        Lists of file names keyed by the UUID of the experiments visible to the user.
+
+    """
+    statement = select(orm.Experiment.uuid).where(orm.Experiment.uuid.in_(experiment_uuids))
+    if not user_info.can_view_any_experiment():
+        statement = statement.filter(orm.Experiment.created_by == user_info.uuid)
+
+    result = await db_session.execute(statement)
+
+    return {
+        experiment_uuid: _scan_experiment_files(
+            build_experiment_dir_absolute_path(experiments_root_dir, experiment_uuid)
+        )
+        for experiment_uuid in result.scalars().all()
+    }
+
+
+def _scan_experiment_files(folder_path: str) -> List[Tuple[str, datetime]]:
+    """Returns names and modification times of the files in the experiment directory."""
+    file_names: List[Tuple[str, datetime]] = []
+
     try:
         with os.scandir(folder_path) as file_iterator:
             for entry in file_iterator:
@@ -248,11 +418,7 @@ async def get_experiment_files(
     return file_names
 
 
-EXPERIMENT_EID_PATTERN = r"^(19[0-9]{2}|2[0-9]{3})(0[1-9]|1[012])([123]0|[012][1-9]|31)-(\d+)$"
-
-
 @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
-# pylint: disable=too-many-locals
 async def create_experiment(
     user_info: UserInfo,
     db_session: AsyncSession,
@@ -272,56 +438,14 @@ async def create_experiment(
             "The user doesn't have the required permission(s) to create experiments."
         )
 
-    input_tag_keys = [tag.lower() for tag in tags]
-    tags_in_db_statement = select(orm.Tag).filter(orm.Tag.key.in_(input_tag_keys))
-    tags_in_db = (await db_session.execute(tags_in_db_statement)).scalars().all()
-
-    tags_orm: List[orm.Tag] = []
-    tags_orm.extend(tags_in_db)
-    db_key_list = [item.key for item in tags_in_db]
-    for tag in set(tags):
-        if tag.lower() not in db_key_list:
-            tags_orm.append(orm.Tag(name=tag, key=tag.lower()))
-
-    # get last created experiment of the day
-    today = datetime.combine(date.today(), time.min)
-    today_experiments_statement = (
-        select(orm.Experiment.eid)
-        .filter(orm.Experiment.created_at >= today)
-        .where(orm.Experiment.eid.regexp_match(EXPERIMENT_EID_PATTERN))
-    )
-    today_experiments = (await db_session.execute(today_experiments_statement)).scalars().all()
-
-    if not today_experiments:
-        experiment_uuid, eid = generate_experiment_uuid_and_eid(experiment_index=1)
-    else:
-        last_experiment_eid = sorted(today_experiments, key=lambda x: int(x.split("-")[-1]))[-1]
-        if re.match(EXPERIMENT_EID_PATTERN, last_experiment_eid):
-            index = int(last_experiment_eid.split("-")[-1])
-            experiment_uuid, eid = generate_experiment_uuid_and_eid(experiment_index=index + 1)
-        else:
-            experiment_uuid, eid = generate_experiment_uuid_and_eid(experiment_index=1)
-
-    db_user_statement = select(orm.User).where(orm.User.uuid == user_info.uuid)
-    db_user = (await db_session.execute(db_user_statement)).scalars().first()
-
-    if not db_user:
-        db_user = orm.User(
-            uuid=user_info.uuid,
-            username=user_info.username,
-        )
-        db_session.add(db_user)
-
-    db_experiment = orm.Experiment(
-        uuid=experiment_uuid,
-        title=title,
-        description=description,
-        tags=tags_orm,
-        eid=eid,
-        created_by_user=db_user,
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
-    )
+    db_tags = await get_or_create_tags(db_session=db_session, tags=tags)
+
+    ((experiment_uuid, eid),) = await allocate_experiment_eids(db_session=db_session)
+
+    db_user = await get_or_create_user(db_session=db_session, user_info=user_info)
+
+    new_experiment = NewExperiment(title=title, description=description, tags=tags)
+    db_experiment = build_db_experiment(new_experiment, experiment_uuid, eid, db_tags, db_user)
 
     db_session.add(db_experiment)
 
@@ -461,13 +585,61 @@ async def get_all_tags(
 ) -> List[TagRead]:
     # pylint: disable=unused-argument
     """Get list of all tags"""
+    tags, _ = await get_tags_page(
+        user_info=user_info, db_session=db_session, include_dangling=include_dangling
+    )
+
+    return tags
+
+
+@validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+async def get_tags_page(
+    user_info: UserInfo,
+    db_session: AsyncSession,
+    include_dangling: bool = False,
+    prefix: Optional[ExperimentTag] = None,
+    order_by_usage: bool = False,
+    offset: Optional[NonNegativeInt] = None,
+    limit: Optional[NonNegativeInt] = None,
+) -> Tuple[List[TagRead], int]:
+    # pylint: disable=unused-argument,too-many-arguments
+    """Get a page of tags ordered by key and the total number of tags.
+
+    Args:
+        db_session: Database async session.
+        include_dangling: Include the tags with no experiments linked.
+        prefix: Only include the tags with keys starting with the prefix.
+        order_by_usage: Order the tags by the number of experiments linked to them first.
+        offset: Number of tags to skip before the page starts.
+        limit: Maximum number of tags in the page.
+
+    Returns:
+        Tuple of the tags data models in the page, with the number of experiments linked to
+        each of them, and the total count of tags.
+
+    """
     statement = select(orm.Tag)
     if not include_dangling:
-        statement = statement.join_from(orm.Tag, orm.experiment_tag_association).distinct()
+        statement = statement.filter(orm.Tag.experiments_count > 0)
+
+    if prefix is not None:
+        statement = statement.filter(orm.Tag.key.startswith(prefix.lower(), autoescape=True))
+
+    count_statement = select(func.count()).select_from(statement.subquery())
+    total_tags_count = (await db_session.execute(count_statement)).scalar_one()
+
+    # counts are updated with SQL statements, so the loaded tags are refreshed.
+    if order_by_usage:
+        statement = statement.order_by(orm.Tag.experiments_count.desc())
+    statement = statement.order_by(orm.Tag.key).execution_options(populate_existing=True)
+    if offset is not None:
+        statement = statement.offset(offset)
+    if limit is not None:
+        statement = statement.limit(limit)
 
     result = await db_session.execute(statement)
 
-    return [tag_orm_to_model(item) for item in result.scalars().all()]
+    return [tag_orm_to_model(item) for item in result.scalars().all()], total_tags_count
 
 
 @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
@@ -527,10 +699,15 @@ async def remove_experiment(
     )
     await db_session.execute(remove_all_experiment_tasks_statement)
 
-    remove_experiment_tag_links_statement = delete(orm.experiment_tag_association).where(
-        orm.experiment_tag_association.c.experiment_uuid == experiment_uuid
+    remove_experiment_tag_links_statement = (
+        delete(orm.experiment_tag_association)
+        .where(orm.experiment_tag_association.c.experiment_uuid == experiment_uuid)
+        .returning(orm.experiment_tag_association.c.tag_key)
     )
-    await db_session.execute(remove_experiment_tag_links_statement)
+    tag_keys = (await db_session.execute(remove_experiment_tag_links_statement)).scalars().all()
+    if tag_keys:
+        tag_keys_deltas = {key: -count for key, count in Counter(tag_keys).items()}
+        await db_session.execute(orm.update_tags_experiments_count(tag_keys_deltas))
 
     remove_experiment_statement = delete(orm.Experiment).where(
         orm.Experiment.uuid == experiment_uuid
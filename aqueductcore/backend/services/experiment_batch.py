@@ -0,0 +1,368 @@
+"""Functions for creating and tagging many experiments at once, with the helpers they share
+with the operations on single experiments."""
+
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import Callable, Dict, List, Set, Tuple
+from uuid import UUID
+
+from pydantic import ConfigDict, Field, PositiveInt, validate_call
+from sqlalchemy import Integer, cast, delete, func, select, true, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from aqueductcore.backend.context import UserInfo
+from aqueductcore.backend.errors import AQDPermission, AQDValidationError
+from aqueductcore.backend.models import orm
+from aqueductcore.backend.models.constants import ARCHIVED
+from aqueductcore.backend.models.experiment import ExperimentCreateResult, NewExperiment
+from aqueductcore.backend.services.utils import (
+    experiment_orm_to_model,
+    generate_experiment_uuid_and_eid,
+)
+from aqueductcore.backend.services.validators import (
+    MAX_EXPERIMENT_DESCRIPTION_LENGTH,
+    MAX_EXPERIMENT_TAG_LENGTH,
+    MAX_EXPERIMENT_TAGS_NUM,
+    MAX_EXPERIMENT_TITLE_LENGTH,
+    MAX_EXPERIMENTS_PER_CREATE_REQUEST,
+    MAX_EXPERIMENTS_PER_TAGS_UPDATE,
+    ExperimentTag,
+    validate_description,
+    validate_tag,
+    validate_title,
+)
+
+# pylint: disable=redefined-outer-name
+
+
+def _dialect_insert(db_session: AsyncSession) -> Callable:
+    """INSERT construct of the session database, supporting ON CONFLICT clauses."""
+    return postgresql.insert if db_session.bind.dialect.name == "postgresql" else sqlite.insert
+
+
+@validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+async def allocate_experiment_eids(
+    db_session: AsyncSession, count: PositiveInt = 1
+) -> List[Tuple[UUID, str]]:
+    """Allocate UUIDs and consecutive EIDs of the day for new experiments. The counter of the
+    day stays locked until the transaction ends, so concurrent allocations never overlap.
+
+    Args:
+        db_session: Database async session.
+        count: Number of experiments to allocate EIDs for.
+
+    Returns:
+        List of the UUIDs and EIDs in the order of the EID indexes.
+
+    """
+    today = date.today()
+    counter_statement = (
+        update(orm.ExperimentEIDCounter)
+        .where(orm.ExperimentEIDCounter.day == today)
+        .values(last_index=orm.ExperimentEIDCounter.last_index + count)
+        .returning(orm.ExperimentEIDCounter.last_index)
+        .execution_options(synchronize_session=False)
+    )
+    last_index = (await db_session.execute(counter_statement)).scalar_one_or_none()
+
+    if last_index is None:
+        # first allocation of the day continues after the experiments created without the counter.
+        eid_prefix = today.strftime("%Y%m%d")
+        existing_last_index = (
+            select(
+                func.coalesce(
+                    func.max(cast(func.substr(orm.Experiment.eid, len(eid_prefix) + 2), Integer)),
+                    0,
+                )
+            )
+            .where(orm.Experiment.eid.regexp_match(f"^{eid_prefix}-[0-9]+$"))
+            .scalar_subquery()
+        )
+        counter_statement = (
+            _dialect_insert(db_session)(orm.ExperimentEIDCounter)
+            .values(day=today, last_index=existing_last_index + count)
+            .on_conflict_do_update(
+                index_elements=[orm.ExperimentEIDCounter.day],
+                set_={"last_index": orm.ExperimentEIDCounter.last_index + count},
+            )
+            .returning(orm.ExperimentEIDCounter.last_index)
+        )
+        last_index = (await db_session.execute(counter_statement)).scalar_one()
+
+    return [
+        generate_experiment_uuid_and_eid(experiment_index=index, day=today)
+        for index in range(last_index - count + 1, last_index + 1)
+    ]
+
+
+async def get_or_create_tags(db_session: AsyncSession, tags: List[str]) -> Dict[str, orm.Tag]:
+    """Get the tags by key with a single query, adding the missing ones to the session.
+
+    Args:
+        db_session: Database async session.
+        tags: Names of the tags. New tags are named after the first name with their key.
+
+    Returns:
+        Dictionary of the tags by key.
+
+    """
+    tag_names: Dict[str, str] = {}
+    for tag in tags:
+        tag_names.setdefault(tag.lower(), tag)
+
+    tags_in_db_statement = select(orm.Tag).filter(orm.Tag.key.in_(tag_names))
+    tags_in_db = (await db_session.execute(tags_in_db_statement)).scalars().all()
+
+    db_tags = {item.key: item for item in tags_in_db}
+    for key, name in tag_names.items():
+        if key not in db_tags:
+            db_tags[key] = orm.Tag(name=name, key=key)
+
+    return db_tags
+
+
+async def get_or_create_user(db_session: AsyncSession, user_info: UserInfo) -> orm.User:
+    """Get the user, adding it to the session if it does not exist yet."""
+    db_user_statement = select(orm.User).where(orm.User.uuid == user_info.uuid)
+    db_user = (await db_session.execute(db_user_statement)).scalars().first()
+
+    if not db_user:
+        db_user = orm.User(
+            uuid=user_info.uuid,
+            username=user_info.username,
+        )
+        db_session.add(db_user)
+
+    return db_user
+
+
+def build_db_experiment(
+    experiment: NewExperiment,
+    experiment_uuid: UUID,
+    eid: str,
+    db_tags: Dict[str, orm.Tag],
+    db_user: orm.User,
+) -> orm.Experiment:
+    """Build a new experiment with its allocated UUID and EID, linked to its tags by key and
+    to the user creating it."""
+    tag_keys = dict.fromkeys(tag.lower() for tag in experiment.tags)
+    return orm.Experiment(
+        uuid=experiment_uuid,
+        title=experiment.title,
+        description=experiment.description,
+        tags=[db_tags[key] for key in tag_keys],
+        eid=eid,
+        created_by_user=db_user,
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc),
+    )
+
+
+def _validate_new_experiment(experiment: NewExperiment) -> None:
+    """Validate the details of an experiment to create, raising AQDValidationError."""
+    validate_title(experiment.title, max_len=MAX_EXPERIMENT_TITLE_LENGTH)
+    validate_description(experiment.description, max_len=MAX_EXPERIMENT_DESCRIPTION_LENGTH)
+    if len(experiment.tags) > MAX_EXPERIMENT_TAGS_NUM:
+        raise AQDValidationError(
+            f"You can have a maximum of {MAX_EXPERIMENT_TAGS_NUM} tags in an experiment."
+        )
+    for tag in experiment.tags:
+        validate_tag(tag, max_len=MAX_EXPERIMENT_TAG_LENGTH)
+
+
+@validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+async def create_experiments(
+    user_info: UserInfo,
+    db_session: AsyncSession,
+    experiments: List[NewExperiment],
+) -> List[ExperimentCreateResult]:
+    """Create experiments in a single transaction. Tags and the user are looked up once and
+    the EIDs are allocated together. Invalid experiments are reported in their results and
+    do not stop the others from being created.
+
+    Args:
+        db_session: Database async session.
+        experiments: Details of the experiments to create.
+
+    Returns:
+        Results of the experiments in the order of the request, each with either the created
+        experiment or the validation error.
+
+    """
+    if len(experiments) > MAX_EXPERIMENTS_PER_CREATE_REQUEST:
+        raise AQDValidationError(
+            f"Maximum allowed number of experiments to create is "
+            f"{MAX_EXPERIMENTS_PER_CREATE_REQUEST}"
+        )
+
+    if not user_info.can_create_experiment():
+        raise AQDPermission(
+            "The user doesn't have the required permission(s) to create experiments."
+        )
+
+    results: List[ExperimentCreateResult] = []
+    valid_experiments: List[Tuple[int, NewExperiment]] = []
+    for idx, experiment in enumerate(experiments):
+        try:
+            _validate_new_experiment(experiment)
+        except AQDValidationError as error:
+            results.append(ExperimentCreateResult(error=str(error)))
+            continue
+        results.append(ExperimentCreateResult())
+        valid_experiments.append((idx, experiment))
+
+    if not valid_experiments:
+        return results
+
+    db_tags = await get_or_create_tags(
+        db_session=db_session,
+        tags=[tag for _, experiment in valid_experiments for tag in experiment.tags],
+    )
+    allocated_eids = await allocate_experiment_eids(
+        db_session=db_session, count=len(valid_experiments)
+    )
+    db_user = await get_or_create_user(db_session=db_session, user_info=user_info)
+
+    db_experiments: List[Tuple[int, orm.Experiment]] = []
+    for (idx, experiment), (experiment_uuid, eid) in zip(valid_experiments, allocated_eids):
+        db_experiment = build_db_experiment(
+            experiment=experiment,
+            experiment_uuid=experiment_uuid,
+            eid=eid,
+            db_tags=db_tags,
+            db_user=db_user,
+        )
+        db_session.add(db_experiment)
+        db_experiments.append((idx, db_experiment))
+
+    await db_session.commit()
+
+    for idx, db_experiment in db_experiments:
+        results[idx].experiment = await experiment_orm_to_model(db_experiment)
+
+    return results
+
+
+async def _update_experiments_tag_links(
+    db_session: AsyncSession,
+    experiment_uuids: List[UUID],
+    add_tag_names: Dict[str, str],
+    remove_tag_keys: Set[str],
+):
+    """Add and remove the links of the experiments to the tags, and change the experiments
+    counts of the tags by the links actually added or removed."""
+    tag_keys_deltas: Counter = Counter()
+    dialect_insert = _dialect_insert(db_session)
+    if add_tag_names:
+        await db_session.execute(
+            dialect_insert(orm.Tag)
+            .values([{"key": key, "name": name} for key, name in add_tag_names.items()])
+            .on_conflict_do_nothing(index_elements=[orm.Tag.key])
+        )
+        added_links_statement = (
+            dialect_insert(orm.experiment_tag_association)
+            .from_select(
+                ["experiment_uuid", "tag_key"],
+                select(orm.Experiment.uuid, orm.Tag.key)
+                .join(orm.Tag, true())
+                .where(orm.Experiment.uuid.in_(experiment_uuids), orm.Tag.key.in_(add_tag_names)),
+            )
+            .on_conflict_do_nothing()
+            .returning(orm.experiment_tag_association.c.tag_key)
+        )
+        tag_keys_deltas.update((await db_session.execute(added_links_statement)).scalars())
+
+    if remove_tag_keys:
+        removed_links_statement = (
+            delete(orm.experiment_tag_association)
+            .where(
+                orm.experiment_tag_association.c.experiment_uuid.in_(experiment_uuids),
+                orm.experiment_tag_association.c.tag_key.in_(remove_tag_keys),
+            )
+            .returning(orm.experiment_tag_association.c.tag_key)
+        )
+        tag_keys_deltas.subtract((await db_session.execute(removed_links_statement)).scalars())
+
+    if tag_keys_deltas:
+        await db_session.execute(orm.update_tags_experiments_count(tag_keys_deltas))
+
+
+@validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+async def update_experiments_tags(
+    user_info: UserInfo,
+    db_session: AsyncSession,
+    experiment_uuids: List[UUID],
+    add_tags: List[ExperimentTag] = Field(default_factory=list, max_length=MAX_EXPERIMENT_TAGS_NUM),
+    remove_tags: List[ExperimentTag] = Field(
+        default_factory=list, max_length=MAX_EXPERIMENT_TAGS_NUM
+    ),
+) -> List[UUID]:
+    """Add and remove tags of many experiments with set-based statements on the relation
+    table, in a single transaction.
+
+    Args:
+        db_session: Database async session.
+        experiment_uuids: UUIDs of the experiments to update.
+        add_tags: Tags to add to the experiments, created if they do not exist.
+        remove_tags: Tags to remove from the experiments.
+
+    Returns:
+        UUIDs of the experiments updated, skipping the non-existing ones and the ones the
+        user is not allowed to edit.
+
+    """
+    if len(experiment_uuids) > MAX_EXPERIMENTS_PER_TAGS_UPDATE:
+        raise AQDValidationError(
+            f"Maximum allowed number of experiments to update is {MAX_EXPERIMENTS_PER_TAGS_UPDATE}"
+        )
+
+    if not (user_info.can_edit_any_experiment() or user_info.can_edit_own_experiment()):
+        raise AQDPermission("The user doesn't have the permission to edit experiments.")
+
+    add_tag_names: Dict[str, str] = {}
+    for tag in add_tags:
+        add_tag_names.setdefault(tag.lower(), tag)
+    remove_tag_keys = {tag.lower() for tag in remove_tags}
+
+    if remove_tag_keys & add_tag_names.keys():
+        raise AQDValidationError("The same tag cannot be added and removed in the request.")
+
+    experiments_statement = select(orm.Experiment.uuid).filter(
+        orm.Experiment.uuid.in_(experiment_uuids)
+    )
+    if not user_info.can_edit_any_experiment():
+        experiments_statement = experiments_statement.filter(
+            orm.Experiment.created_by == user_info.uuid
+        )
+    updated_uuids = list((await db_session.execute(experiments_statement)).scalars().all())
+    if not updated_uuids or not (add_tag_names or remove_tag_keys):
+        return updated_uuids
+
+    await _update_experiments_tag_links(
+        db_session=db_session,
+        experiment_uuids=updated_uuids,
+        add_tag_names=add_tag_names,
+        remove_tag_keys=remove_tag_keys,
+    )
+
+    # the statements bypass the relationship events keeping the derived columns in sync.
+    changed_tag_keys = remove_tag_keys | add_tag_names.keys()
+    if ARCHIVED in changed_tag_keys:
+        await db_session.execute(
+            update(orm.Experiment)
+            .where(orm.Experiment.uuid.in_(updated_uuids))
+            .values(archived=ARCHIVED in add_tag_names)
+            .execution_options(synchronize_session=False)
+        )
+    await db_session.commit()
+
+    # loaded experiments and tags are reloaded on their next query.
+    updated_uuids_set = set(updated_uuids)
+    for instance in list(db_session.identity_map.values()):
+        if isinstance(instance, orm.Experiment) and instance.uuid in updated_uuids_set:
+            db_session.expire(instance, ["tags", "archived"])
+        elif isinstance(instance, orm.Tag) and instance.key in changed_tag_keys:
+            db_session.expire(instance, ["experiments", "experiments_count"])
+
+    return updated_uuids
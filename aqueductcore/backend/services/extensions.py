@@ -174,6 +174,7 @@ class ExtensionAction(BaseModel):
             extension_directory_name=cwd.name,
             shell_script=rich_script,
             execute_blocking=False,
+            logs_experiment_uuid=experiment_uuid,
             **my_env,
         )
 
@@ -4,11 +4,23 @@ Depending on execution context, extensions may be implement in any language if t
 can read environment variables and print to stdout.
 """
 
+import fcntl
+import hashlib
 import logging
+import os
+import platform
+import shutil
 import subprocess
+import time
 import venv
+from asyncio import get_running_loop, sleep, wrap_future
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from enum import Enum
 from pathlib import Path
-from typing import Dict, List
+from threading import Lock
+from typing import IO, Dict, Iterator, List, Optional, Tuple
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -25,33 +37,113 @@ from aqueductcore.backend.settings import settings
 VENV_FOLDER = ".aqueduct-extension-venv"
 PYTHON_BINARY = "bin/python"
 EXEC_TIMEOUT = 600
+PROVISIONING_WORKERS = 2
+SHARED_VENV_MARKER = ".aqueduct-shared-venv"
+VENV_READY_MARKER = ".aqueduct-venv-ready"
+SHARED_VENVS_EVICTION_INTERVAL_S = 60 * 60
+
+
+class VenvStatus(str, Enum):
+    """Provisioning states of the virtual environment of an extension."""
+
+    MISSING = "MISSING"
+    PENDING = "PENDING"
+    PROVISIONING = "PROVISIONING"
+    READY = "READY"
+    FAILED = "FAILED"
+
+
+def _manifest_version(manifest: Path) -> Optional[Tuple[int, int]]:
+    """Returns modification time and size of the manifest file, or None if it is missing."""
+    try:
+        stat_result = manifest.stat()
+    except OSError:
+        return None
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+
+@contextmanager
+def _locked_venv(venv_dir: Path, blocking: bool = True) -> Iterator[Optional[IO]]:
+    """Locks an environment across processes, yielding the lock file, or None if the
+    lock is not available without blocking. The lock file may be removed with the environment,
+    so the lock is only held once the locked file is still the one at the lock path."""
+    lock_path = venv_dir.with_suffix(".lock")
+    while True:
+        with open(lock_path, mode="a", encoding="utf-8") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield None
+                return
+            try:
+                locked = os.stat(lock_path).st_ino == os.fstat(lock_file.fileno()).st_ino
+            except FileNotFoundError:
+                locked = False
+            if locked:
+                yield lock_file
+                return
 
 
 class ExtensionsExecutor:
     """Class to access extensions."""
 
+    # parsed extensions with the version of their manifests, keyed by manifest path.
+    _manifests: Dict[Path, Tuple[Tuple[int, int], Extension]] = {}
+    # manifest paths of the extensions, keyed by extension name.
+    _index: Dict[str, Path] = {}
+    # virtual environments are provisioned in background threads, out of the event loop.
+    _venv_pool: Optional[ThreadPoolExecutor] = None
+    _venv_futures: Dict[Path, Future] = {}
+    _venv_lock = Lock()
+
     @classmethod
     def list_extensions(cls) -> List[Extension]:
-        """List all valid extensions which are present in the folder"""
-        result = []
+        """List all valid extensions which are present in the folder.
+        Manifests are only parsed again if they have changed since they were last read."""
         if settings.extensions_dir_path is None:
             logging.warning(
                 "Extensions directory is not set is EXTENSIONS_DIR_PATH environment variable."
             )
             return []
+
+        manifests: Dict[Path, Tuple[Tuple[int, int], Extension]] = {}
+        appeared: List[str] = []
         for directory in Path(settings.extensions_dir_path).iterdir():
             if directory.exists() and not directory.is_file():
-                if not (directory / MANIFEST_FILE).exists():
+                manifest = directory / MANIFEST_FILE
+                version = _manifest_version(manifest)
+                if version is None:
+                    continue
+                cached = cls._manifests.get(manifest)
+                if cached is not None and cached[0] == version:
+                    manifests[manifest] = cached
                     continue
                 try:
-                    extension = Extension.from_folder(directory)
-                    result.append(extension)
+                    manifests[manifest] = (version, Extension.from_folder(directory))
+                    if cached is None:
+                        appeared.append(manifests[manifest][1].name)
                 except AQDError as err:
                     logging.warning(
                         "Skipping %s extension parsing %s",
                         directory,
                         err,
                     )
+
+        names = Counter(extension.name for _, extension in manifests.values())
+        cls._manifests = manifests
+        cls._index = {
+            extension.name: manifest
+            for manifest, (_, extension) in manifests.items()
+            if names[extension.name] == 1
+        }
+
+        if cls._venv_pool is not None:
+            # provisioning looks the extensions up, so it is scheduled once they are indexed.
+            for name in appeared:
+                if name in cls._index:
+                    cls.provision_venv(extension=name)
+
+        result = [extension.model_copy() for _, extension in manifests.values()]
         return sorted(result, key=lambda extension: extension.name)
 
     @classmethod
@@ -64,6 +156,17 @@ class ExtensionsExecutor:
         Returns:
             Extension instance.
         """
+        manifest = cls._index.get(extension)
+        if manifest is not None and settings.extensions_dir_path is not None:
+            cached = cls._manifests.get(manifest)
+            if (
+                cached is not None
+                and manifest.parent.parent == Path(settings.extensions_dir_path)
+                and cached[0] == _manifest_version(manifest)
+            ):
+                # copy, as the instance is modified before execution.
+                return cached[1].model_copy()
+
         extensions = [p for p in cls.list_extensions() if p.name == extension]
         if len(extensions) != 1:
             raise AQDValidationError(f"There should be exactly 1 extension with name {extension}")
@@ -71,7 +174,7 @@ class ExtensionsExecutor:
 
     @classmethod
     def is_venv_present(cls, extension: str) -> bool:
-        """Checks if inside extension folder there is a venv folder
+        """Checks if inside extension folder there is a completely provisioned venv folder
 
         Args:
             extension: extension name
@@ -85,7 +188,8 @@ class ExtensionsExecutor:
         venv_folder = where / VENV_FOLDER
         if venv_folder.exists() and venv_folder.is_file():
             raise AQDValidationError(f"Venv `{venv_folder}` is not a folder.")
-        return venv_folder.exists()
+        marker = SHARED_VENV_MARKER if venv_folder.is_symlink() else VENV_READY_MARKER
+        return (venv_folder / marker).exists()
 
     @classmethod
     def create_venv_python_if_not_present(cls, extension: str) -> Path:
@@ -101,15 +205,257 @@ class ExtensionsExecutor:
             This path will be substituted in the `script` section
             of manifest file, if `$python` variable is used.
         """
+        venv_dir = cls.get_extension(extension).folder / VENV_FOLDER
+        python_bin = (venv_dir / PYTHON_BINARY).absolute()
+        # every server process provisions the environments, one at a time.
+        with _locked_venv(venv_dir):
+            if venv_dir.is_symlink() and cls._uses_shared_venv(extension=extension):
+                if venv_dir.resolve() != cls._shared_venv_dir(extension=extension):
+                    # requirements have changed since the environment was linked.
+                    venv_dir.unlink()
+            if cls.is_venv_present(extension=extension):
+                return python_bin
+            if venv_dir.is_symlink():
+                # shared environment of the extension has been removed.
+                venv_dir.unlink()
+            if cls._uses_shared_venv(extension=extension):
+                venv_dir.symlink_to(cls._create_shared_venv(extension=extension))
+            else:
+                cls._create_extension_venv(extension=extension)
+        return python_bin
+
+    @classmethod
+    def _create_extension_venv(cls, extension: str) -> None:
+        """Creates the own environment of an extension, with the extension installed.
+        A partially created environment is removed, so that it can be created again."""
         extension_dir = cls.get_extension(extension).folder
         venv_dir = extension_dir / VENV_FOLDER
         python_bin = (venv_dir / PYTHON_BINARY).absolute()
-        if cls.is_venv_present(extension=extension):
-            return python_bin
-        venv.create(venv_dir, system_site_packages=False, with_pip=True)
-        cls.try_install_requirements_txt(extension=extension, python=python_bin)
-        cls.try_install_pyproject_toml(extension=extension, python=python_bin)
-        return python_bin
+        try:
+            # remove leftovers of an interrupted creation.
+            shutil.rmtree(venv_dir, ignore_errors=True)
+            venv.create(venv_dir, system_site_packages=False, with_pip=True)
+            installed = cls.try_install_requirements_txt(extension=extension, python=python_bin)
+            if not installed and (extension_dir / "requirements.txt").exists():
+                raise AQDValidationError(
+                    f"Requirements of extension {extension} failed to install."
+                )
+            installed = cls.try_install_pyproject_toml(extension=extension, python=python_bin)
+            if not installed and (extension_dir / "pyproject.toml").exists():
+                raise AQDValidationError(f"Extension {extension} failed to install.")
+            (venv_dir / VENV_READY_MARKER).touch()
+        except Exception:
+            shutil.rmtree(venv_dir, ignore_errors=True)
+            raise
+
+    @classmethod
+    def start_venvs_provisioning(cls) -> None:
+        """Starts provisioning of virtual environments in the background, for all extensions
+        and for the extensions appearing later."""
+        if cls._venv_pool is None:
+            cls._venv_pool = ThreadPoolExecutor(
+                max_workers=PROVISIONING_WORKERS, thread_name_prefix="extension-venv"
+            )
+        for extension in cls.list_extensions():
+            cls.provision_venv(extension=extension.name)
+
+    @classmethod
+    def stop_venvs_provisioning(cls) -> None:
+        """Stops the background provisioning without waiting for running installations."""
+        if cls._venv_pool is not None:
+            cls._venv_pool.shutdown(wait=False)
+            cls._venv_pool = None
+
+    @classmethod
+    def provision_venv(cls, extension: str) -> Future:
+        """Schedules provisioning of the virtual environment of an extension, unless it is
+        already scheduled. Failed provisioning is scheduled again, as well as provisioning
+        of an environment which has been removed or whose requirements have changed since.
+
+        Args:
+            extension: extension name.
+
+        Returns:
+            Future resolving into the python executable inside the virtual environment.
+        """
+        folder = cls.get_extension(extension).folder
+        with cls._venv_lock:
+            future = cls._venv_futures.get(folder)
+            if future is not None and not future.done():
+                return future
+            if (
+                future is not None
+                and future.exception() is None
+                and cls._is_venv_current(extension=extension)
+            ):
+                return future
+
+            if cls._venv_pool is None:
+                cls._venv_pool = ThreadPoolExecutor(
+                    max_workers=PROVISIONING_WORKERS, thread_name_prefix="extension-venv"
+                )
+            future = cls._venv_pool.submit(cls._provision_venv, extension)
+            cls._venv_futures[folder] = future
+            return future
+
+    @classmethod
+    def _provision_venv(cls, extension: str) -> Path:
+        """Creates the virtual environment of an extension, logging failures."""
+        try:
+            return cls.create_venv_python_if_not_present(extension=extension)
+        except Exception:
+            logging.exception("Provisioning of %s extension environment failed.", extension)
+            raise
+
+    @classmethod
+    def _is_venv_current(cls, extension: str) -> bool:
+        """Checks if the environment of an extension is present and, if it is shared,
+        that it is the environment for the current requirements of the extension."""
+        if not cls.is_venv_present(extension=extension):
+            return False
+        if not cls._uses_shared_venv(extension=extension):
+            return True
+        venv_dir = cls.get_extension(extension).folder / VENV_FOLDER
+        return venv_dir.resolve() == cls._shared_venv_dir(extension=extension)
+
+    @classmethod
+    def _uses_shared_venv(cls, extension: str) -> bool:
+        """Extensions share environments if enabled, unless they are installable packages."""
+        return (
+            settings.extensions_shared_venvs_dir_path is not None
+            and not (cls.get_extension(extension).folder / "pyproject.toml").exists()
+        )
+
+    @classmethod
+    def _shared_venv_dir(cls, extension: str) -> Path:
+        """Returns the shared environment directory for the requirements of an extension,
+        addressed by the hash of the requirements and the Python version."""
+        requirements = cls.get_extension(extension).folder / "requirements.txt"
+        digest = hashlib.sha256(platform.python_version().encode("utf-8") + b"\n")
+        if requirements.exists():
+            digest.update(requirements.read_bytes())
+        return Path(str(settings.extensions_shared_venvs_dir_path)).resolve() / digest.hexdigest()
+
+    @classmethod
+    def _create_shared_venv(cls, extension: str) -> Path:
+        """Creates the shared environment for the requirements of an extension, unless
+        it exists. Creation is locked, as the environment may be shared by processes."""
+        requirements = cls.get_extension(extension).folder / "requirements.txt"
+        venv_dir = cls._shared_venv_dir(extension=extension)
+        venv_dir.parent.mkdir(parents=True, exist_ok=True)
+        marker = venv_dir / SHARED_VENV_MARKER
+        with _locked_venv(venv_dir):
+            if not marker.exists():
+                # remove leftovers of an interrupted creation.
+                shutil.rmtree(venv_dir, ignore_errors=True)
+                venv.create(venv_dir, system_site_packages=False, with_pip=True)
+                python_bin = venv_dir / PYTHON_BINARY
+                installed = cls.try_install_requirements_txt(extension=extension, python=python_bin)
+                if not installed and requirements.exists():
+                    raise AQDValidationError(
+                        f"Requirements of extension {extension} failed to install."
+                    )
+            # the marker modification time tracks the last use for eviction.
+            marker.touch()
+        return venv_dir
+
+    @classmethod
+    def evict_shared_venvs(cls) -> List[Path]:
+        """Removes the shared environments which no extension links to,
+        and which have not been used longer than the configured time.
+
+        Returns:
+            List of the removed environments.
+        """
+        if settings.extensions_shared_venvs_dir_path is None:
+            return []
+        shared_dir = Path(settings.extensions_shared_venvs_dir_path).resolve()
+        if not shared_dir.exists():
+            return []
+
+        linked = set()
+        for extension in cls.list_extensions():
+            venv_dir = extension.folder / VENV_FOLDER
+            if venv_dir.is_symlink():
+                linked.add(venv_dir.resolve())
+
+        expiry = time.time() - settings.extensions_shared_venvs_ttl_hours * 3600
+        evicted = []
+        for venv_dir in shared_dir.iterdir():
+            if not venv_dir.is_dir() or venv_dir in linked:
+                continue
+            with _locked_venv(venv_dir, blocking=False) as lock_file:
+                if lock_file is None:
+                    # the environment is being created.
+                    continue
+                marker = venv_dir / SHARED_VENV_MARKER
+                if marker.exists() and marker.stat().st_mtime > expiry:
+                    continue
+                shutil.rmtree(venv_dir, ignore_errors=True)
+                venv_dir.with_suffix(".lock").unlink()
+                evicted.append(venv_dir)
+        return evicted
+
+    @classmethod
+    async def evict_shared_venvs_periodically(cls) -> None:
+        """Evicts the unused shared environments at regular intervals, until cancelled."""
+        while True:
+            try:
+                await get_running_loop().run_in_executor(None, cls.evict_shared_venvs)
+            except OSError:
+                logging.exception("Eviction of shared extension environments failed.")
+            await sleep(SHARED_VENVS_EVICTION_INTERVAL_S)
+
+    @classmethod
+    def _touch_shared_venv(cls, extension: str) -> None:
+        """Records the use of the shared environment of an extension, delaying its eviction."""
+        venv_dir = cls.get_extension(extension).folder / VENV_FOLDER
+        if venv_dir.is_symlink():
+            try:
+                os.utime(venv_dir.resolve() / SHARED_VENV_MARKER)
+            except FileNotFoundError:
+                # the environment has been evicted, provisioning finds it missing and
+                # provisions it again on the next run.
+                pass
+
+    @classmethod
+    async def wait_for_venv(cls, extension: str) -> Path:
+        """Waits without blocking the event loop until the virtual environment of
+        an extension is provisioned.
+
+        Args:
+            extension: extension name.
+
+        Returns:
+            Path to a python executable inside a virtual environment.
+        """
+        try:
+            return await wrap_future(cls.provision_venv(extension=extension))
+        except AQDError:
+            raise
+        except Exception as error:
+            raise AQDValidationError(
+                f"Virtual environment of extension {extension} could not be provisioned."
+            ) from error
+
+    @classmethod
+    def venv_status(cls, extension: str) -> VenvStatus:
+        """Returns provisioning state of the virtual environment of an extension.
+
+        Args:
+            extension: extension name.
+
+        Returns:
+            Provisioning state.
+        """
+        future = cls._venv_futures.get(cls.get_extension(extension).folder)
+        if future is None:
+            return VenvStatus.READY if cls.is_venv_present(extension) else VenvStatus.MISSING
+        if future.running():
+            return VenvStatus.PROVISIONING
+        if not future.done():
+            return VenvStatus.PENDING
+        return VenvStatus.FAILED if future.exception() is not None else VenvStatus.READY
 
     @classmethod
     def try_install_requirements_txt(cls, extension: str, python: Path) -> bool:
@@ -194,7 +540,8 @@ class ExtensionsExecutor:
             raise AQDPermission("User has no permission to run a job in this experiment.")
 
         action_object = extension_object.get_action(action)
-        python = cls.create_venv_python_if_not_present(extension=extension)
+        python = await cls.wait_for_venv(extension=extension)
+        cls._touch_shared_venv(extension=extension)
         return await action_object.execute(
             user_info=user_info,
             db_session=db_session,
@@ -1,20 +1,25 @@
 """Celery task execution."""
 
+import logging
 import os
 import signal
 import subprocess
-from asyncio import sleep
+from asyncio import Future, Task, get_running_loop, sleep
+from contextlib import ExitStack
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional, Tuple
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
 import psutil
-from celery import Celery
+from celery import Celery, states
 from celery.backends.base import TaskRevokedError
+from celery.backends.database import DatabaseBackend, session_cleanup
 from celery.result import AsyncResult
-from pydantic import ConfigDict, validate_call
-from sqlalchemy import select
+from pydantic import ConfigDict, NonNegativeInt, validate_call
+from sqlalchemy import Select, and_, false, func, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
 
@@ -22,10 +27,11 @@ from aqueductcore.backend.context import UserInfo
 from aqueductcore.backend.errors import AQDDBTaskNonExisting, AQDPermission
 from aqueductcore.backend.models import orm
 from aqueductcore.backend.models.task import TaskProcessExecutionResult, TaskRead
-from aqueductcore.backend.services.utils import task_orm_to_model
+from aqueductcore.backend.services.constants import TASK_LOG_FILE_NAMES, TASK_LOGS_DIR_NAME
+from aqueductcore.backend.services.utils import decode_page_cursor, task_orm_to_model
 from aqueductcore.backend.settings import settings
 
-WAITING_TIME = 2
+MIN_WAITING_TIME = 0.01
 
 celery_app = Celery(
     "tasks",
@@ -52,11 +58,29 @@ def worker_signal_handler(signo, _):
         extension_process.send_signal(signo)
 
 
+def build_task_logs_dir_absolute_path(
+    experiments_root_dir: str, experiment_uuid: UUID, task_id: str
+) -> str:
+    """Function to build the absolute path of the directory holding the logs of a task."""
+    return os.path.normpath(
+        os.path.join(experiments_root_dir, str(experiment_uuid), TASK_LOGS_DIR_NAME, task_id)
+    )
+
+
+def _read_file_tail(file_path: str, size: int) -> str:
+    """Reads at most the last `size` bytes of a text file."""
+    with open(file_path, mode="rb") as file:
+        file_size = file.seek(0, os.SEEK_END)
+        file.seek(max(0, file_size - size))
+        return file.read().decode("utf-8", errors="replace")
+
+
 @celery_app.task(bind=True)
 def run_executable(  # pylint: disable=unused-argument
     self,
     extension_directory_name: str,
     shell_script: str,
+    logs_experiment_uuid: Optional[str] = None,
     **kwargs,
 ) -> Tuple[int, str, str]:
     """This code executes in a celery worker.
@@ -68,9 +92,12 @@ def run_executable(  # pylint: disable=unused-argument
             relative name of the folder where the extension lives.
         shell_script (str):
             code to execute. Use relative file names here.
+        logs_experiment_uuid (Optional[str]):
+            UUID of the experiment to keep the full std out and std error of the task in.
+            If not set, the logs are discarded after the task is finished.
 
     Returns:
-        Tuple[int, str, str]: result code, std out, std error.
+        Tuple[int, str, str]: result code, tail of std out, tail of std error.
     """
     global extension_process  # pylint: disable=global-statement
     signal.signal(signal.SIGINT, worker_signal_handler)
@@ -82,42 +109,51 @@ def run_executable(  # pylint: disable=unused-argument
     myenv = os.environ.copy()
     myenv.update(kwargs)
 
-    # TODO: add mechanism to update statuses
-    # from inside the process. E.g. with a file
-    # extension/.status
-    with subprocess.Popen(
-        shell_script,
-        shell=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        env=myenv,
-        cwd=workdir,
-    ) as proc:
-        extension_process = proc
-        out, err = proc.communicate(timeout=None)
-        code = proc.returncode
-        args = (code, out.decode("utf-8"), err.decode("utf-8"))
-        if abs(code) == signal.SIGINT:
-            raise KeyboardInterrupt()
-        if code != 0:
-            raise ChildProcessError(args)
+    with ExitStack() as stack:
+        if logs_experiment_uuid is None:
+            logs_dir = stack.enter_context(TemporaryDirectory())
+        else:
+            logs_dir = build_task_logs_dir_absolute_path(
+                str(settings.experiments_dir_path), UUID(logs_experiment_uuid), self.request.id
+            )
+            os.makedirs(logs_dir, exist_ok=True)
+        out_path = os.path.join(logs_dir, TASK_LOG_FILE_NAMES["stdout"])
+        err_path = os.path.join(logs_dir, TASK_LOG_FILE_NAMES["stderr"])
+
+        # TODO: add mechanism to update statuses
+        # from inside the process. E.g. with a file
+        # extension/.status
+        # the output is written by the child process directly to the log files,
+        # so it is never held in the worker memory.
+        with open(out_path, mode="wb") as out_file, open(err_path, mode="wb") as err_file:
+            with subprocess.Popen(
+                shell_script,
+                shell=True,
+                stdout=out_file,
+                stderr=err_file,
+                env=myenv,
+                cwd=workdir,
+            ) as proc:
+                extension_process = proc
+                code = proc.wait(timeout=None)
+
+        tail_size = settings.task_logs_tail_size_KB * 1024
+        args = (code, _read_file_tail(out_path, tail_size), _read_file_tail(err_path, tail_size))
+
+    if abs(code) == signal.SIGINT:
+        raise KeyboardInterrupt()
+    if code != 0:
+        raise ChildProcessError(args)
     return args
 
 
-async def _update_task_info(task_id: str, wait=False) -> TaskProcessExecutionResult:
-    """Updates information about a task. Waits until ready if asked."""
-    task = AsyncResult(task_id)
-    if wait:
-        while not task.ready():
-            await sleep(WAITING_TIME)
-
+def _task_info_from_meta(task_id: str, meta: Dict[str, Any]) -> TaskProcessExecutionResult:
+    """Builds task information from the task meta-data stored in the result backend."""
     task_info = TaskProcessExecutionResult(
-        task_id=UUID(task.id),
-        status=task.status,
+        task_id=UUID(task_id),
+        status=meta["status"],
     )
-    # property should be accessed once to have conistent results
-    # as it might change during the process.
-    task_result = task.result
+    task_result = meta.get("result")
 
     if task_result is not None:
         known_exceptions = (FileNotFoundError, KeyboardInterrupt, TaskRevokedError, Exception)
@@ -130,7 +166,7 @@ async def _update_task_info(task_id: str, wait=False) -> TaskProcessExecutionRes
                     task_info.std_err = err
         elif isinstance(task_result, known_exceptions):
             task_info.std_err = str(task_result)
-        elif task.ready():
+        elif meta["status"] in states.READY_STATES:
             # in case the result format is incorrect
             if len(task_result) == 3:
                 code, out, err = task_result
@@ -139,17 +175,172 @@ async def _update_task_info(task_id: str, wait=False) -> TaskProcessExecutionRes
                 task_info.std_err = err
             else:
                 task_info.std_err = str(task_result)
-        task_info.ended_at = task.date_done
-        task_info.kwargs = task.kwargs
+        task_info.ended_at = meta.get("date_done")
+        task_info.kwargs = meta.get("kwargs")
 
     return task_info
 
 
+def _get_tasks_meta(task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Reads meta-data of the tasks from the result backend. The database backend is
+    queried once for the whole set of tasks. This call is blocking."""
+    backend = celery_app.backend
+    if not isinstance(backend, DatabaseBackend):
+        return {task_id: backend.get_task_meta(task_id) for task_id in task_ids}
+
+    tasks_meta: Dict[str, Dict[str, Any]] = {}
+    session = backend.ResultSession()
+    with session_cleanup(session):
+        statement = session.query(backend.task_cls).filter(backend.task_cls.task_id.in_(task_ids))
+        for task in statement:
+            data = task.to_dict()
+            if data.get("args", None) is not None:
+                data["args"] = backend.decode(data["args"])
+            if data.get("kwargs", None) is not None:
+                data["kwargs"] = backend.decode(data["kwargs"])
+            tasks_meta[task.task_id] = backend.meta_from_decoded(data)
+
+    for task_id in task_ids:
+        # tasks are not stored in the backend until a worker receives them.
+        tasks_meta.setdefault(task_id, {"status": states.PENDING, "result": None})
+
+    return tasks_meta
+
+
+async def _get_tasks_info(task_ids: List[str]) -> Dict[str, TaskProcessExecutionResult]:
+    """Returns information about a set of tasks, keyed by task ID, with a single
+    result backend lookup executed outside of the event loop."""
+    if not task_ids:
+        return {}
+
+    tasks_meta = await get_running_loop().run_in_executor(None, _get_tasks_meta, task_ids)
+
+    return {task_id: _task_info_from_meta(task_id, meta) for task_id, meta in tasks_meta.items()}
+
+
+async def is_task_finished(task_id: str) -> bool:
+    """Checks if the task has reached a terminal state in the result backend."""
+    tasks_info = await _get_tasks_info([task_id])
+    return tasks_info[task_id].status in states.READY_STATES
+
+
+async def _resolve_tasks_info(
+    db_session: AsyncSession, db_tasks: Sequence[orm.Task]
+) -> Dict[str, TaskProcessExecutionResult]:
+    """Returns information about the unfinished tasks from the result backend, keyed by
+    task ID. Tasks observed in a terminal state for the first time get their execution
+    details persisted, so that finished tasks never have to be looked up again. They are
+    persisted in a session of their own, leaving the session of the caller untouched."""
+    unfinished_tasks = [item for item in db_tasks if item.status not in states.READY_STATES]
+    tasks_info = await _get_tasks_info([item.uuid for item in unfinished_tasks])
+
+    finished_tasks = []
+    for item in unfinished_tasks:
+        task_info = tasks_info[item.uuid]
+        if task_info.status in states.READY_STATES:
+            finished_tasks.append(
+                {
+                    "uuid": item.uuid,
+                    "status": task_info.status,
+                    "result_code": task_info.result_code,
+                    "std_out": task_info.std_out,
+                    "std_err": task_info.std_err,
+                    "ended_at": (
+                        task_info.ended_at.replace(tzinfo=timezone.utc)
+                        if task_info.ended_at
+                        else None
+                    ),
+                }
+            )
+
+    if finished_tasks:
+        try:
+            async with AsyncSession(bind=db_session.bind) as write_session:
+                await write_session.execute(update(orm.Task), finished_tasks)
+                await write_session.commit()
+        except SQLAlchemyError:
+            # the states are persisted again on the next lookup.
+            logging.exception("Persisting the states of finished tasks failed.")
+
+    return tasks_info
+
+
+class _TaskResultPoller:
+    """Waits for tasks to finish. A single poller is shared by all of the waiters, looking up
+    the state of all awaited tasks with one result backend query per round. The rounds
+    start at a short interval to return short tasks quickly, and slow down while the
+    awaited tasks are running."""
+
+    def __init__(self):
+        self._waiters: Dict[str, List[Future]] = {}
+        self._poller: Optional[Task] = None
+        self._waiting_time = MIN_WAITING_TIME
+
+    async def wait(self, task_id: str) -> TaskProcessExecutionResult:
+        """Waits until the task reaches a terminal state and returns its information."""
+        loop = get_running_loop()
+        if self._poller is not None and self._poller.get_loop() is not loop:
+            # waiters of another event loop can never be resolved from this one.
+            self._waiters.clear()
+            self._poller = None
+
+        future = loop.create_future()
+        self._waiters.setdefault(task_id, []).append(future)
+        self._waiting_time = MIN_WAITING_TIME
+        if self._poller is None or self._poller.done():
+            self._poller = loop.create_task(self._poll())
+
+        try:
+            return await future
+        finally:
+            if future.cancelled() and future in self._waiters.get(task_id, []):
+                self._waiters[task_id].remove(future)
+                if not self._waiters[task_id]:
+                    del self._waiters[task_id]
+
+    async def _poll(self):
+        """Resolves the waiters as soon as their tasks are finished."""
+        while self._waiters:
+            try:
+                tasks_info = await _get_tasks_info(list(self._waiters))
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                for futures in self._waiters.values():
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(error)
+                self._waiters.clear()
+                return
+
+            for task_id, task_info in tasks_info.items():
+                if task_info.status in states.READY_STATES and task_id in self._waiters:
+                    for future in self._waiters.pop(task_id):
+                        if not future.done():
+                            future.set_result(task_info)
+
+            if self._waiters:
+                await sleep(self._waiting_time)
+                self._waiting_time = min(
+                    self._waiting_time * 2, settings.task_result_poll_interval_ms / 1000
+                )
+
+
+_task_result_poller = _TaskResultPoller()
+
+
+async def _update_task_info(task_id: str, wait=False) -> TaskProcessExecutionResult:
+    """Updates information about a task. Waits until ready if asked."""
+    if wait:
+        return await _task_result_poller.wait(task_id)
+
+    return (await _get_tasks_info([task_id]))[task_id]
+
+
 @validate_call(config=ConfigDict(arbitrary_types_allowed=True))
 async def _execute_task(
     extension_directory_name: str,
     shell_script: str,
     execute_blocking: bool = False,
+    logs_experiment_uuid: Optional[UUID] = None,
     **kwargs,
 ) -> TaskProcessExecutionResult:
     """Execute a task and wait until finished"""
@@ -157,7 +348,11 @@ async def _execute_task(
     # retry and expiration control policies may be added here according to:
     # https://docs.celeryq.dev/en/stable/userguide/calling.html#message-sending-retry
     task = run_executable.apply_async(
-        (extension_directory_name, shell_script),
+        (
+            extension_directory_name,
+            shell_script,
+            str(logs_experiment_uuid) if logs_experiment_uuid else None,
+        ),
         kwargs=kwargs,
     )
 
@@ -198,13 +393,14 @@ async def revoke_task(
     if not user_info.can_cancel_task_owned_by(task_user):
         raise AQDPermission("User has no permission to cancel tasks of this user.")
 
-    AsyncResult(db_task.uuid).revoke(terminate=terminate, signal="SIGINT")
-    task_info = await _update_task_info(task_id=db_task.uuid, wait=False)
+    if db_task.status not in states.READY_STATES:
+        AsyncResult(db_task.uuid).revoke(terminate=terminate, signal="SIGINT")
+    tasks_info = await _resolve_tasks_info(db_session=db_session, db_tasks=[db_task])
 
     username = db_task.created_by_user.username
     return await task_orm_to_model(
         value=db_task,
-        task_info=task_info,
+        task_info=tasks_info.get(db_task.uuid),
         experiment_uuid=db_task.experiment_id,
         username=username,
     )
@@ -240,33 +436,27 @@ async def get_task_by_uuid(
         if db_task.experiment.created_by != user_info.uuid:
             raise AQDPermission("User has no permission to see this task.")
 
-    task_info = await _update_task_info(task_id=db_task.uuid, wait=False)
+    tasks_info = await _resolve_tasks_info(db_session=db_session, db_tasks=[db_task])
 
     return await task_orm_to_model(
-        value=db_task, task_info=task_info, experiment_uuid=db_task.experiment.uuid
+        value=db_task,
+        task_info=tasks_info.get(db_task.uuid),
+        experiment_uuid=db_task.experiment.uuid,
     )
 
 
-@validate_call(config=ConfigDict(arbitrary_types_allowed=True))
-async def get_all_tasks(  # pylint: disable=too-many-arguments
+def _build_tasks_statement(  # pylint: disable=too-many-arguments,too-many-branches
     user_info: UserInfo,
-    db_session: AsyncSession,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     extension_name: Optional[str] = None,
     action_name: Optional[str] = None,
     username: Optional[str] = None,
     experiment_uuid: Optional[UUID] = None,
-    order_by_creation_date: bool = True,
-) -> List[TaskRead]:
-    """Get list of all tasks."""
-    statement = (
-        select(orm.Task)
-        .join(orm.Task.created_by_user)
-        .join(orm.Task.experiment)
-        .options(selectinload(orm.Task.created_by_user))
-        .options(selectinload(orm.Task.experiment))
-    )
+    experiment_uuids: Optional[List[UUID]] = None,
+) -> Select:
+    """Build the statement selecting the tasks visible to the user and matching the filters."""
+    statement = select(orm.Task).join(orm.Task.created_by_user).join(orm.Task.experiment)
 
     if not user_info.can_view_any_task():
         statement = statement.filter(orm.Task.created_by == user_info.uuid)
@@ -275,15 +465,28 @@ async def get_all_tasks(  # pylint: disable=too-many-arguments
     if not user_info.can_view_task_owned_by(user_info.uuid):
         raise AQDPermission("User has no permission to view any tasks.")
 
+    # tasks are only visible together with their experiments
+    if not user_info.can_view_any_experiment():
+        if user_info.can_view_own_experiment():
+            statement = statement.filter(orm.Experiment.created_by == user_info.uuid)
+        else:
+            statement = statement.filter(false())
+
     if experiment_uuid is not None:
         statement = statement.filter(orm.Experiment.uuid == experiment_uuid)
 
+    if experiment_uuids is not None:
+        statement = statement.filter(orm.Experiment.uuid.in_(experiment_uuids))
+
     if action_name is not None:
         statement = statement.filter(orm.Task.action_name == action_name)
 
     if extension_name is not None:
         statement = statement.filter(orm.Task.extension_name == extension_name)
 
+    if username is not None:
+        statement = statement.filter(orm.User.username == username)
+
     utc_start_date = start_date.astimezone(timezone.utc) if start_date else None
     utc_end_date = end_date.astimezone(timezone.utc) if end_date else None
     if utc_start_date is not None and utc_end_date is not None:
@@ -293,27 +496,107 @@ async def get_all_tasks(  # pylint: disable=too-many-arguments
     elif end_date is not None:
         statement = statement.filter(orm.Task.created_at <= utc_end_date)
 
-    if order_by_creation_date:
-        statement = statement.order_by(orm.Task.created_at.desc())
+    return statement
 
-    result = await db_session.execute(statement)
 
-    tasks_list = []
+async def _read_tasks(db_session: AsyncSession, statement: Select) -> List[TaskRead]:
+    """Read the tasks selected by the statement, with their users, experiments and states."""
+    statement = statement.options(selectinload(orm.Task.created_by_user)).options(
+        selectinload(orm.Task.experiment)
+    )
+    result = await db_session.execute(statement)
 
-    for item in result.unique().scalars().all():
-        # sql filters fails to apply to a join-loaded collections,
-        # so we post process the result set:
-        if not user_info.can_view_experiment_owned_by(UUID(str(item.experiment.created_by))):
-            continue
-        if username is not None and item.created_by_user.username != username:
-            continue
+    db_tasks = result.scalars().all()
+    tasks_info = await _resolve_tasks_info(db_session=db_session, db_tasks=db_tasks)
 
-        task_info = await _update_task_info(task_id=item.uuid, wait=False)
+    tasks_list = []
+    for item in db_tasks:
         tasks_list.append(
             await task_orm_to_model(
                 value=item,
-                task_info=task_info,
+                task_info=tasks_info.get(item.uuid),
                 experiment_uuid=item.experiment.uuid,
             )
         )
     return tasks_list
+
+
+@validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+async def get_all_tasks(  # pylint: disable=too-many-arguments
+    user_info: UserInfo,
+    db_session: AsyncSession,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    extension_name: Optional[str] = None,
+    action_name: Optional[str] = None,
+    username: Optional[str] = None,
+    experiment_uuid: Optional[UUID] = None,
+    order_by_creation_date: bool = True,
+    offset: Optional[NonNegativeInt] = None,
+    limit: Optional[NonNegativeInt] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[TaskRead], int]:
+    """Get a page of tasks and the total number of tasks matching the filters.
+
+    Args:
+        offset: Number of tasks to skip before the page starts.
+        limit: Maximum number of tasks in the page.
+        cursor: Opaque cursor of the last task of the previous page. When provided,
+            tasks are ordered by creation date and the page starts right after it.
+
+    Returns:
+        Tuple of the tasks in the page and the total count of tasks matching the filters.
+    """
+    statement = _build_tasks_statement(
+        user_info=user_info,
+        start_date=start_date,
+        end_date=end_date,
+        extension_name=extension_name,
+        action_name=action_name,
+        username=username,
+        experiment_uuid=experiment_uuid,
+    )
+
+    count_statement = select(func.count()).select_from(  # pylint: disable=not-callable
+        statement.subquery()
+    )
+    total_tasks_count = (await db_session.execute(count_statement)).scalar_one()
+
+    if cursor is not None:
+        cursor_created_at, cursor_uuid = decode_page_cursor(cursor)
+        statement = statement.filter(
+            or_(
+                orm.Task.created_at < cursor_created_at,
+                and_(orm.Task.created_at == cursor_created_at, orm.Task.uuid < str(cursor_uuid)),
+            )
+        )
+
+    if order_by_creation_date or cursor is not None:
+        # UUID breaks ties between tasks created at the same time to keep pages stable.
+        statement = statement.order_by(orm.Task.created_at.desc(), orm.Task.uuid.desc())
+
+    if offset is not None:
+        statement = statement.offset(offset)
+
+    if limit is not None:
+        statement = statement.limit(limit)
+
+    return await _read_tasks(db_session=db_session, statement=statement), total_tasks_count
+
+
+@validate_call(config=ConfigDict(arbitrary_types_allowed=True))
+async def get_experiments_tasks(
+    user_info: UserInfo, db_session: AsyncSession, experiment_uuids: List[UUID]
+) -> List[TaskRead]:
+    """Get the tasks of several experiments in a single query, without counting them.
+
+    Args:
+        experiment_uuids: UUIDs of the experiments to get the tasks of.
+
+    Returns:
+        Tasks of the experiments visible to the user, the last created first.
+    """
+    statement = _build_tasks_statement(user_info=user_info, experiment_uuids=experiment_uuids)
+    statement = statement.order_by(orm.Task.created_at.desc(), orm.Task.uuid.desc())
+
+    return await _read_tasks(db_session=db_session, statement=statement)
@@ -0,0 +1,607 @@
+"""Helpers for receiving uploaded files."""
+
+import glob
+import gzip
+import io
+import json
+import os
+import queue
+import shutil
+import tarfile
+import threading
+import time
+import zipfile
+import zlib
+from asyncio import Future, get_running_loop, sleep, wait
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import contextmanager
+from types import TracebackType
+from typing import IO, Callable, Deque, Iterator, List, Optional, Tuple, Type, Union
+from uuid import UUID, uuid4
+
+import pathvalidate
+from pathvalidate.error import ErrorReason
+
+from aqueductcore.backend.errors import (
+    AQDArchiveError,
+    AQDArchiveExtractorBusy,
+    AQDUploadIncomplete,
+    AQDUploadNonExisting,
+)
+from aqueductcore.backend.models.upload import ArchiveFormat, UploadRead
+from aqueductcore.backend.services.constants import TASK_LOGS_DIR_NAME, UPLOADS_DIR_NAME
+from aqueductcore.backend.settings import settings
+
+UPLOAD_INFO_FILE_NAME = "upload.json"
+UPLOAD_DATA_FILE_NAME = "data"
+UPLOAD_RANGES_DIR_NAME = "ranges"
+ARCHIVE_COPY_CHUNK_SIZE = 1024 * 1024
+GZIP_MAGIC = b"\x1f\x8b"
+UPLOADS_CLEANUP_INTERVAL_S = 60 * 60
+RESERVED_FILE_NAMES = frozenset((TASK_LOGS_DIR_NAME, UPLOADS_DIR_NAME))
+
+# worker threads consuming the data of all of the uploads of the process.
+UPLOAD_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.upload_max_workers, thread_name_prefix="upload-writer"
+)
+
+
+def validate_experiment_file_name(file_name: str) -> None:
+    """Validate the name of a file added to an experiment, which must not be a path, a name made
+    of dots only, or one of the names reserved for the directories of the experiment.
+
+    Args:
+        file_name: Name of the file in the experiment directory.
+
+    Raises:
+        pathvalidate.ValidationError: If the file name is invalid.
+
+    """
+    pathvalidate.validate_filename(file_name)
+    if not file_name.strip(".") or file_name in RESERVED_FILE_NAMES:
+        raise pathvalidate.ValidationError(
+            f"{file_name} is reserved in the experiment directory.",
+            reason=ErrorReason.RESERVED_NAME,
+        )
+
+
+class UploadWriter:  # pylint: disable=too-many-instance-attributes
+    """Passes the received data to a consumer running in a worker thread, so that parsing and
+    writing the data to the disk do not block the event loop.
+
+    The workers are shared by all of the uploads of the process, and the data of each upload
+    is consumed by one worker at a time, in the order it is written. Written chunks are
+    buffered until they reach `buffer_size` bytes and are joined in the worker, without copying
+    them on the event loop. At most `max_pending` buffers are queued for the workers, after
+    which writing waits for the workers to catch up.
+
+    Args:
+        consumer: Blocking function receiving the data, e.g. the parser of a multipart body.
+        max_pending: Maximum number of buffers queued for the workers.
+        buffer_size: Minimum number of bytes passed to the consumer at once, except for the
+            last buffer.
+
+    """
+
+    def __init__(self, consumer: Callable[[bytes], None], max_pending: int, buffer_size: int = 0):
+        self._consumer = consumer
+        self._max_pending = max_pending
+        self._buffer_size = buffer_size
+        self._buffer: List[bytes] = []
+        self._buffered_size = 0
+        # buffers waiting for the previous buffer to be consumed, with their pending results.
+        self._queued: Deque[Tuple[List[bytes], Future]] = deque()
+        self._pending: Deque[Future] = deque()
+        self._running: Optional[Future] = None
+        # first error of the consumer, after which no more data is consumed.
+        self._error: Optional[BaseException] = None
+
+    async def write(self, data: bytes) -> None:
+        """Buffer the data and queue the buffer for the workers when it is full. Raises the
+        errors of the consumer for the buffers queued before.
+
+        Args:
+            data: Data to be consumed, which is not modified until it is consumed.
+
+        """
+        self._raise_error()
+        self._buffer.append(data)
+        self._buffered_size += len(data)
+        if self._buffered_size >= self._buffer_size:
+            await self._queue_buffer()
+
+    async def flush(self) -> None:
+        """Wait for all of the written data to be consumed."""
+        self._raise_error()
+        if self._buffer:
+            await self._queue_buffer()
+
+        while self._pending:
+            await self._pending.popleft()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    async def _queue_buffer(self) -> None:
+        while len(self._pending) >= self._max_pending:
+            await self._pending.popleft()
+        self._raise_error()
+
+        chunks = self._buffer
+        self._buffer = []
+        self._buffered_size = 0
+        result = get_running_loop().create_future()
+        self._queued.append((chunks, result))
+        self._pending.append(result)
+        self._consume_next()
+
+    def _consume_next(self) -> None:
+        """Pass the next queued buffer to the workers, unless a buffer is being consumed or
+        the consumer has failed."""
+        if self._running is not None or not self._queued or self._error is not None:
+            return
+
+        chunks, result = self._queued.popleft()
+        self._running = get_running_loop().run_in_executor(UPLOAD_EXECUTOR, self._consume, chunks)
+        self._running.add_done_callback(lambda running: self._consumed(running, result))
+
+    def _consumed(self, running: Future, result: Future) -> None:
+        self._running = None
+        error = None if running.cancelled() else running.exception()
+        if not result.done():
+            if error is None:
+                result.set_result(None)
+            else:
+                result.set_exception(error)
+
+        if error is not None:
+            # the data after an error is not consumed, and writing more data raises the error.
+            self._error = self._error or error
+            for _, queued_result in self._queued:
+                queued_result.cancel()
+            self._queued.clear()
+
+        self._consume_next()
+
+    def _consume(self, chunks: List[bytes]) -> None:
+        # a single chunk is passed as is, several chunks are copied once into a new buffer.
+        self._consumer(chunks[0] if len(chunks) == 1 else b"".join(chunks))
+
+    async def close(self) -> None:
+        """Drop the queued data and wait for the worker to finish the data being consumed."""
+        self._buffer = []
+        self._buffered_size = 0
+        self._queued.clear()
+        for pending in self._pending:
+            if pending.done() and not pending.cancelled():
+                # the errors of the dropped data are not raised.
+                pending.exception()
+            pending.cancel()
+        self._pending.clear()
+
+        if self._running is not None:
+            await wait([self._running])
+
+    async def __aenter__(self) -> "UploadWriter":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        try:
+            if exc_type is None:
+                await self.flush()
+        finally:
+            await self.close()
+
+
+def build_upload_dir_absolute_path(experiment_dir: str, upload_id: UUID) -> str:
+    """Build the absolute path of the directory keeping the state of a resumable upload."""
+    return os.path.join(experiment_dir, UPLOADS_DIR_NAME, str(upload_id))
+
+
+def _merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Sort and merge the overlapping and adjacent [start, end) ranges."""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+
+    return merged
+
+
+def create_upload(experiment_dir: str, file_name: str, size: int) -> UploadRead:
+    """Start a resumable upload of a file to the experiment directory. The file is received
+    in a sparse file of its full size inside the uploads directory of the experiment, so that
+    ranges of it can be written in any order and in parallel.
+
+    Args:
+        experiment_dir: Directory of the experiment receiving the file.
+        file_name: Name of the file in the experiment directory.
+        size: Size of the file in bytes.
+
+    Returns:
+        The created upload.
+
+    Raises:
+        OSError: If the upload could not be created in the experiment directory.
+
+    """
+    upload = UploadRead(upload_id=uuid4(), file_name=file_name, size=size)
+    upload_dir = build_upload_dir_absolute_path(experiment_dir, upload.upload_id)
+    try:
+        os.makedirs(os.path.join(upload_dir, UPLOAD_RANGES_DIR_NAME))
+        with open(os.path.join(upload_dir, UPLOAD_DATA_FILE_NAME), mode="wb") as file:
+            file.truncate(size)
+        with open(
+            os.path.join(upload_dir, UPLOAD_INFO_FILE_NAME), mode="w", encoding="utf-8"
+        ) as file:
+            json.dump({"file_name": file_name, "size": size}, file)
+    except OSError:
+        shutil.rmtree(upload_dir, ignore_errors=True)
+        raise
+
+    return upload
+
+
+def get_upload(experiment_dir: str, upload_id: UUID) -> UploadRead:
+    """Get a resumable upload of the experiment with its received ranges."""
+    upload_dir = build_upload_dir_absolute_path(experiment_dir, upload_id)
+    try:
+        with open(
+            os.path.join(upload_dir, UPLOAD_INFO_FILE_NAME), mode="r", encoding="utf-8"
+        ) as file:
+            info = json.load(file)
+        range_names = os.listdir(os.path.join(upload_dir, UPLOAD_RANGES_DIR_NAME))
+    except FileNotFoundError as error:
+        raise AQDUploadNonExisting("The specified upload was not found.") from error
+
+    ranges = []
+    for range_name in range_names:
+        start, end = range_name.split("-")
+        ranges.append((int(start), int(end)))
+
+    return UploadRead(upload_id=upload_id, received_ranges=_merge_ranges(ranges), **info)
+
+
+def open_upload_data(experiment_dir: str, upload_id: UUID):
+    """Open the file receiving the data of a resumable upload for writing at any position.
+    The file is unbuffered, so the data is in the file once a write returns."""
+    upload_dir = build_upload_dir_absolute_path(experiment_dir, upload_id)
+    try:
+        return open(  # pylint: disable=consider-using-with
+            os.path.join(upload_dir, UPLOAD_DATA_FILE_NAME), mode="r+b", buffering=0
+        )
+    except FileNotFoundError as error:
+        raise AQDUploadNonExisting("The specified upload was not found.") from error
+
+
+def record_upload_range(experiment_dir: str, upload_id: UUID, start: int, end: int) -> None:
+    """Record a range of a resumable upload as received, after its data is written. Each range
+    is recorded in its own file, so parallel writers do not need to share any state."""
+    if end <= start:
+        return
+
+    upload_dir = build_upload_dir_absolute_path(experiment_dir, upload_id)
+    range_path = os.path.join(upload_dir, UPLOAD_RANGES_DIR_NAME, f"{start}-{end}")
+    try:
+        with open(range_path, mode="wb"):
+            pass
+    except FileNotFoundError as error:
+        raise AQDUploadNonExisting("The specified upload was not found.") from error
+
+
+def _last_activity_time(upload_dir: str) -> Optional[float]:
+    """Last modification time of the state of a resumable upload, or None if it is removed."""
+    modification_times = []
+    for path in (
+        upload_dir,
+        os.path.join(upload_dir, UPLOAD_RANGES_DIR_NAME),
+        os.path.join(upload_dir, UPLOAD_DATA_FILE_NAME),
+    ):
+        try:
+            modification_times.append(os.stat(path).st_mtime)
+        except FileNotFoundError:
+            continue
+
+    return max(modification_times, default=None)
+
+
+def remove_expired_uploads(experiments_root_dir: str, max_age: float) -> List[str]:
+    """Remove the resumable uploads of all of the experiments which have not received any data
+    for longer than the maximum age, e.g. abandoned by their clients.
+
+    Args:
+        experiments_root_dir: Directory of the experiments.
+        max_age: Maximum time without activity of an upload, in seconds.
+
+    Returns:
+        Directories of the removed uploads.
+
+    """
+    expiry_time = time.time() - max_age
+    removed = []
+    for upload_dir in glob.glob(
+        os.path.join(glob.escape(experiments_root_dir), "*", UPLOADS_DIR_NAME, "*")
+    ):
+        last_activity_time = _last_activity_time(upload_dir)
+        if last_activity_time is not None and last_activity_time < expiry_time:
+            shutil.rmtree(upload_dir, ignore_errors=True)
+            removed.append(upload_dir)
+
+    return removed
+
+
+async def remove_expired_uploads_periodically() -> None:
+    """Remove the expired resumable uploads at regular intervals, until cancelled."""
+    while True:
+        await get_running_loop().run_in_executor(
+            None,
+            remove_expired_uploads,
+            str(settings.experiments_dir_path),
+            settings.upload_resumable_expiry_h * 3600,
+        )
+        await sleep(UPLOADS_CLEANUP_INTERVAL_S)
+
+
+def complete_upload(experiment_dir: str, upload_id: UUID) -> UploadRead:
+    """Move the file of a fully received resumable upload into the experiment directory,
+    replacing any file with the same name, and remove the upload.
+
+    Raises:
+        AQDUploadIncomplete: if any range of the file is not received yet.
+        OSError: if the file could not be moved into the experiment directory.
+
+    """
+    upload = get_upload(experiment_dir, upload_id)
+    if upload.size > 0 and upload.received_ranges != [(0, upload.size)]:
+        raise AQDUploadIncomplete(
+            f"The upload is incomplete, received ranges: {upload.received_ranges}."
+        )
+
+    upload_dir = build_upload_dir_absolute_path(experiment_dir, upload_id)
+    try:
+        os.replace(
+            os.path.join(upload_dir, UPLOAD_DATA_FILE_NAME),
+            os.path.join(experiment_dir, upload.file_name),
+        )
+    except FileNotFoundError as error:
+        raise AQDUploadNonExisting("The specified upload was not found.") from error
+    shutil.rmtree(upload_dir, ignore_errors=True)
+
+    return upload
+
+
+def remove_upload(experiment_dir: str, upload_id: UUID) -> None:
+    """Abort a resumable upload, removing the data received so far."""
+    upload_dir = build_upload_dir_absolute_path(experiment_dir, upload_id)
+    if not os.path.exists(upload_dir):
+        raise AQDUploadNonExisting("The specified upload was not found.")
+
+    shutil.rmtree(upload_dir, ignore_errors=True)
+
+
+class StreamReader(io.RawIOBase):
+    """Blocking file-like reader of the data fed by another thread, to read a stream with
+    libraries expecting a file, e.g. to extract a tar archive as it is uploaded.
+
+    Args:
+        max_chunks: Maximum number of chunks fed and not read yet, after which feeding waits
+            for the reader.
+
+    """
+
+    def __init__(self, max_chunks: int):
+        super().__init__()
+        self._chunks: "queue.Queue[bytes]" = queue.Queue(max_chunks)
+        self._chunk = memoryview(b"")
+        self._finished = threading.Event()
+        self._aborted = threading.Event()
+
+    def feed(self, data: bytes) -> None:
+        """Feed the data to the reader. Data fed after the reader is closed is dropped."""
+        while not (self.closed or self._aborted.is_set()):
+            try:
+                self._chunks.put(data, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def finish(self) -> None:
+        """Mark the end of the stream, after all of the data is fed."""
+        self._finished.set()
+
+    def abort(self) -> None:
+        """Interrupt the reader, which raises an error instead of waiting for more data."""
+        self._aborted.set()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._chunk:
+            try:
+                self._chunk = memoryview(self._chunks.get(timeout=0.1))
+            except queue.Empty as error:
+                if self._aborted.is_set():
+                    raise OSError("The stream is aborted.") from error
+                if self._finished.is_set() and self._chunks.empty():
+                    return 0
+
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+
+        return size
+
+
+class ArchiveExtractor:
+    """Runs the extraction of archives in a bounded pool of worker threads, apart from the
+    default executor of the event loop. Extractions are rejected rather than queued when all
+    of the workers are reserved, as each extraction holds a request streaming its archive.
+
+    Args:
+        max_extractions: Maximum number of archives extracted at once.
+
+    """
+
+    def __init__(self, max_extractions: int):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_extractions, thread_name_prefix="archive-extractor"
+        )
+        self._slots = threading.BoundedSemaphore(max_extractions)
+
+    @contextmanager
+    def reserve(self) -> Iterator[Executor]:
+        """Reserve a worker for extracting an archive in the context.
+
+        Returns:
+            Executor running the extraction.
+
+        Raises:
+            AQDArchiveExtractorBusy: If all of the workers are reserved.
+
+        """
+        if not self._slots.acquire(blocking=False):
+            raise AQDArchiveExtractorBusy("Too many archives are being extracted.")
+        try:
+            yield self._executor
+        finally:
+            self._slots.release()
+
+
+def _iter_tar_members(source: IO[bytes]) -> Iterator[Tuple[str, IO[bytes]]]:
+    """Gzip compressed archives are decompressed by gzip rather than by tarfile, whose stream
+    mode does not verify the checksum at the end of the gzip stream."""
+    reader = io.BufferedReader(source)  # type: ignore
+    stream: IO[bytes] = reader
+    mode = "r|*"
+    if reader.peek(len(GZIP_MAGIC)).startswith(GZIP_MAGIC):
+        stream = gzip.GzipFile(fileobj=reader, mode="rb")  # type: ignore
+        mode = "r|"
+
+    with tarfile.open(fileobj=stream, mode=mode) as archive:  # type: ignore
+        for member in archive:
+            if member.isdir():
+                continue
+            member_file = archive.extractfile(member) if member.isfile() else None
+            if member_file is None:
+                raise AQDArchiveError(f"Archive member {member.name} is not a regular file.")
+            yield member.name, member_file
+
+    # the checksum is verified on reading the end of the stream, past the end of the archive.
+    while stream.read(ARCHIVE_COPY_CHUNK_SIZE):
+        pass
+
+
+def _iter_zip_members(source: Union[str, IO[bytes]]) -> Iterator[Tuple[str, IO[bytes]]]:
+    with zipfile.ZipFile(source) as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            try:
+                member_file = archive.open(info)
+            except NotImplementedError as error:
+                raise AQDArchiveError(
+                    f"Archive member {info.filename} uses an unsupported compression method."
+                ) from error
+            except RuntimeError as error:
+                # encrypted members need a password.
+                raise AQDArchiveError(f"Archive member {info.filename} is encrypted.") from error
+            with member_file:
+                yield info.filename, member_file
+
+
+def _validate_member_name(name: str) -> str:
+    """Archive members are extracted in the experiment directory, so only files at the top
+    level of the archive are accepted."""
+    while name.startswith("./"):
+        name = name[2:]
+
+    try:
+        validate_experiment_file_name(name)
+    except pathvalidate.ValidationError as error:
+        raise AQDArchiveError(
+            f"Archive member {name} is not a valid file name at the top level of the archive."
+        ) from error
+
+    return name
+
+
+def _copy_member(source: IO[bytes], file_path: str, max_size: int) -> int:
+    """Copy the member to a new file, and return its size."""
+    size = 0
+    with open(file_path, mode="xb") as file:
+        while True:
+            data = source.read(ARCHIVE_COPY_CHUNK_SIZE)
+            if not data:
+                return size
+            size += len(data)
+            if size > max_size:
+                raise AQDArchiveError("The archive exceeds the size limits.")
+            file.write(data)
+
+
+def extract_archive(  # pylint: disable=too-many-arguments
+    source: Union[str, IO[bytes]],
+    archive_format: ArchiveFormat,
+    dest_dir: str,
+    max_files: int,
+    max_file_size: int,
+    max_size: int,
+) -> List[str]:
+    """Extract the files of an archive to a directory, validating the files and enforcing the
+    limits as they are extracted. Tar archives are read sequentially from a stream, while zip
+    archives need a seekable file.
+
+    Args:
+        source: The archive, as a file path or a file-like object.
+        archive_format: Format of the archive.
+        dest_dir: Directory receiving the extracted files.
+        max_files: Maximum number of files in the archive.
+        max_file_size: Maximum size of each file extracted, in bytes.
+        max_size: Maximum size of all of the files extracted, in bytes.
+
+    Returns:
+        Names of the extracted files.
+
+    """
+    if archive_format == ArchiveFormat.TAR:
+        members = _iter_tar_members(source)  # type: ignore
+    else:
+        members = _iter_zip_members(source)
+
+    file_names: List[str] = []
+    extracted_size = 0
+    try:
+        for member_name, member_file in members:
+            file_name = _validate_member_name(member_name)
+            if len(file_names) >= max_files:
+                raise AQDArchiveError(f"The archive exceeds the limit of {max_files} files.")
+
+            extracted_size += _copy_member(
+                member_file,
+                os.path.join(dest_dir, file_name),
+                min(max_file_size, max_size - extracted_size),
+            )
+            file_names.append(file_name)
+
+    except FileExistsError as error:
+        raise AQDArchiveError("The archive contains duplicate file names.") from error
+    except (
+        tarfile.TarError,
+        zipfile.BadZipFile,
+        gzip.BadGzipFile,
+        zlib.error,
+        EOFError,
+    ) as error:
+        raise AQDArchiveError("The archive is invalid.") from error
+
+    return file_names
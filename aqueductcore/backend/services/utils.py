@@ -1,10 +1,13 @@
 """Utility functions for mapping ORMs to Pydantic models and vice versa."""
 
-from datetime import datetime, timezone
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import date, datetime, timezone
 from re import compile as recompile
 from typing import List, Optional, Tuple, Union
 from uuid import UUID, uuid4
 
+from aqueductcore.backend.errors import AQDValidationError
 from aqueductcore.backend.models import orm
 from aqueductcore.backend.models.experiment import (
     ExperimentCreate,
@@ -22,14 +25,25 @@ from aqueductcore.backend.models.task import (
 
 async def task_orm_to_model(
     value: orm.Task,
-    task_info: TaskProcessExecutionResult,
     experiment_uuid: UUID,
+    task_info: Optional[TaskProcessExecutionResult] = None,
     username: Optional[str] = None,
 ) -> TaskRead:
-    """Convert ORM Experiment to Pydantic Model"""
+    """Convert ORM Task to Pydantic Model. Execution details are taken from the task
+    information if provided, otherwise from the state persisted for finished tasks."""
     if username is None:
         username = value.created_by_user.username
 
+    if task_info is None:
+        task_info = TaskProcessExecutionResult(
+            task_id=UUID(value.uuid),
+            status=value.status,
+            result_code=value.result_code,
+            std_out=value.std_out,
+            std_err=value.std_err,
+            ended_at=value.ended_at,
+        )
+
     task = TaskRead(
         uuid=value.uuid,
         experiment_uuid=experiment_uuid,
@@ -84,7 +98,7 @@ async def experiment_orm_to_model(value: orm.Experiment) -> ExperimentRead:
 
 def tag_orm_to_model(value: orm.Tag) -> TagRead:
     """Convert ORM Tag to Pydantic Tag."""
-    tag = TagRead(name=value.name, key=value.key)
+    tag = TagRead(name=value.name, key=value.key, experiments_count=value.experiments_count)
 
     return tag
 
@@ -109,15 +123,33 @@ def tag_model_to_orm(value: TagCreate) -> orm.Tag:
     return tag
 
 
-def generate_experiment_uuid_and_eid(experiment_index: int) -> Tuple[UUID, str]:
+def generate_experiment_uuid_and_eid(
+    experiment_index: int, day: Optional[date] = None
+) -> Tuple[UUID, str]:
     """Generate uuid and eid for experiment"""
-    current_date = datetime.today().strftime("%Y%m%d")
+    current_date = (day or datetime.today()).strftime("%Y%m%d")
     uuid = uuid4()
     eid = f"{current_date}-{experiment_index}"
 
     return uuid, eid
 
 
+def encode_page_cursor(created_at: datetime, uuid: Union[UUID, str]) -> str:
+    """Encode the position of an item in a list ordered by creation date as an opaque cursor."""
+    position = f"{created_at.astimezone(timezone.utc).isoformat()}|{uuid}"
+
+    return urlsafe_b64encode(position.encode("utf-8")).decode("ascii")
+
+
+def decode_page_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode an opaque cursor into the creation date and the UUID of the item it points to."""
+    try:
+        created_at, uuid = urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        return datetime.fromisoformat(created_at).astimezone(timezone.utc), UUID(uuid)
+    except (BinasciiError, UnicodeError, ValueError) as error:
+        raise AQDValidationError("Invalid pagination cursor.") from error
+
+
 def is_tag_valid(tag: str) -> bool:
     """Validate if tag consists of alphanumeric characters, underscores and hyphens only"""
     pattern = r"^[a-zA-Z0-9\-_:\/]+$"
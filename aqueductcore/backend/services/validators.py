@@ -7,6 +7,8 @@ from aqueductcore.backend.errors import AQDValidationError
 from aqueductcore.backend.services.utils import is_tag_valid
 
 MAX_EXPERIMENTS_PER_REQUEST = 500
+MAX_EXPERIMENTS_PER_CREATE_REQUEST = 1000
+MAX_EXPERIMENTS_PER_TAGS_UPDATE = 5000
 MAX_TAGS_PER_REQUEST = 500
 
 MAX_EXPERIMENT_TITLE_LENGTH = 256
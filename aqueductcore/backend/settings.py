@@ -23,6 +23,33 @@ class Settings(BaseSettings):
     """Upload max file size in KBs."""
     upload_RAM_buffer_size_KB: PositiveInt = 1024 * 1  # 1MB
     """Upload buffer size in RAM before saving to storage in KBs."""
+    upload_max_pending_buffers: PositiveInt = 4
+    """Maximum number of upload buffers waiting to be saved to storage. Receiving the upload
+    pauses until the buffers are saved."""
+    upload_max_workers: PositiveInt = 8
+    """Number of worker threads saving the uploads of each server process to storage. Each
+    upload is saved by one worker at a time."""
+    upload_resumable_expiry_h: PositiveInt = 24
+    """Time without receiving any data after which resumable uploads are removed in hours."""
+    upload_archive_max_size_KB: PositiveInt = 1024 * 1024 * 16  # 16GB
+    """Maximum size of an uploaded archive and of the files extracted from it in KBs.
+    Each file extracted is also limited to the upload max file size."""
+    upload_archive_max_files: PositiveInt = 10000
+    """Maximum number of files extracted from an uploaded archive."""
+    upload_archive_max_extractions: PositiveInt = 4
+    """Maximum number of archives extracted at once by each server process. Further archive
+    uploads are rejected until an extraction finishes."""
+    task_logs_tail_size_KB: NonNegativeInt = 64
+    """Size of the standard output and error tail kept in the task results in KBs.
+    Full logs of the tasks are stored in the experiment directory."""
+    task_logs_follow_interval_ms: PositiveInt = 500
+    """Interval between checks for new output when following the logs of a running task in ms."""
+    task_logs_follow_idle_timeout_s: PositiveInt = 60 * 60  # 1 hour
+    """Time without new output after which following the logs of a task stops in seconds.
+    Prevents following forever the logs of tasks whose results have expired."""
+    task_result_poll_interval_ms: PositiveInt = 1000
+    """Maximum interval between checks for the results of awaited tasks in ms. Checks start
+    at a short interval, which grows while the awaited tasks are running."""
 
     postgres_username: str
     """PostgreSQL username."""
@@ -44,6 +71,9 @@ class Settings(BaseSettings):
     files_route_prefix: str = "/files"
     """Route prefix for downloading files."""
 
+    tasks_route_prefix: str = "/tasks"
+    """Route prefix for downloading task logs."""
+
     default_username: str = "admin"
     """Default username for the User"""
 
@@ -56,6 +86,13 @@ class Settings(BaseSettings):
     extensions_dir_path: Optional[str] = None
     """Name of the directory where extensions are saved"""
 
+    extensions_shared_venvs_dir_path: Optional[str] = None
+    """Directory of virtual environments shared by the extensions with identical requirements.
+    If not set, or if an extension has a pyproject.toml, it gets its own environment."""
+
+    extensions_shared_venvs_ttl_hours: PositiveInt = 24 * 7
+    """Time after which shared virtual environments not used by any extension are removed."""
+
     @property
     def celery_backend(self) -> str:
         """Celery backend connection string."""
@@ -49,7 +49,10 @@ class Exporter:
                         description=experiment.description,
                         created_at=experiment.created_at,
                         updated_at=experiment.updated_at,
-                        tags=[Tag(key=item.key, name=item.name) for item in experiment.tags],
+                        tags=[
+                            Tag(key=item.key, name=item.name)
+                            for item in sorted(experiment.tags, key=lambda tag: tag.key)
+                        ],
                     )
                 )
             data.users.append(user_data)
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import re
 import tarfile
+from datetime import date, datetime
 from tarfile import TarFile
 from typing import Any, Callable, Dict, List, Optional, Sequence
 
@@ -11,6 +13,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from aqueductcore.backend.models import orm
+from aqueductcore.backend.services.constants import EXPERIMENT_EID_PATTERN
 from aqueductcore.cli.exporter import Exporter
 from aqueductcore.cli.models import AqueductData, Experiment, Tag
 
@@ -113,6 +116,32 @@ class Importer:
                 )
                 db_user.experiments.append(db_experiment)
 
+        cls.update_experiment_eid_counters(db_session, metadata_experiments)
+
+    @classmethod
+    def update_experiment_eid_counters(
+        cls, db_session: Session, experiments: Sequence[Experiment]
+    ) -> None:
+        """Keep the EID counters of the days ahead of the imported experiments, so new
+        experiments do not get the EIDs of the imported ones.
+
+        Args:
+            db_session: Database session to update the counters in.
+            experiments: Imported experiments.
+
+        """
+        last_indexes: Dict[date, int] = {}
+        for experiment in experiments:
+            match = re.match(EXPERIMENT_EID_PATTERN, experiment.eid)
+            if match:
+                day = datetime.strptime("".join(match.groups()[:3]), "%Y%m%d").date()
+                last_indexes[day] = max(last_indexes.get(day, 0), int(match.group(4)))
+
+        for day, last_index in last_indexes.items():
+            counter = db_session.get(orm.ExperimentEIDCounter, day)
+            if counter is not None and counter.last_index < last_index:
+                counter.last_index = last_index
+
     @classmethod
     def import_experiment_files(
         cls,
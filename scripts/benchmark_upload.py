@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+
+"""Microbenchmark of the upload path: buffering of the request body chunks and parsing of the
+multipart body in the upload writer. Reports the throughput in MB/s, and the buffers allocated
+for the parser and the bytes copied into them per GB uploaded."""
+
+import argparse
+import asyncio
+import os
+import time
+import tracemalloc
+from tempfile import TemporaryDirectory
+from typing import Dict, List
+
+from streaming_form_data import StreamingFormDataParser
+from streaming_form_data.targets import BaseTarget, FileTarget, NullTarget
+
+from aqueductcore.backend.services.upload import UploadWriter
+
+BOUNDARY = "benchmarkboundary"
+BYTES_IN_MB = 1024 * 1024
+BYTES_IN_GB = 1024 * BYTES_IN_MB
+
+
+def build_body_chunks(size: int, chunk_size: int) -> List[bytes]:
+    """Multipart body with a single file of the size, split in chunks like a request stream."""
+    header = (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="benchmark.bin"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode()
+    footer = f"\r\n--{BOUNDARY}--\r\n".encode()
+    body = header + os.urandom(size) + footer
+
+    return [body[start : start + chunk_size] for start in range(0, len(body), chunk_size)]
+
+
+async def upload(
+    chunks: List[bytes], target: BaseTarget, buffer_size: int, max_pending: int
+) -> Dict[str, int]:
+    """Passes the chunks through the upload writer to the parser, and counts the buffers given
+    to the parser which are not one of the received chunks."""
+    parser = StreamingFormDataParser(
+        headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"}
+    )
+    parser.register("file", target)
+    chunk_ids = {id(chunk) for chunk in chunks}
+    stats = {"buffers": 0, "copied_bytes": 0}
+
+    def data_received(data: bytes):
+        if id(data) not in chunk_ids:
+            stats["buffers"] += 1
+            stats["copied_bytes"] += len(data)
+        parser.data_received(data)
+
+    async with UploadWriter(data_received, max_pending, buffer_size) as writer:
+        for chunk in chunks:
+            await writer.write(chunk)
+
+    return stats
+
+
+def main():
+    """Runs the benchmark and prints the results."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--size-MB", type=int, default=256, help="Uploaded file size.")
+    arg_parser.add_argument("--chunk-KB", type=int, default=64, help="Request chunk size.")
+    arg_parser.add_argument("--buffer-KB", type=int, default=1024, help="Upload buffer size.")
+    arg_parser.add_argument("--max-pending", type=int, default=4, help="Queued buffers.")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Number of runs.")
+    arg_parser.add_argument(
+        "--to-disk", action="store_true", help="Write the file to disk instead of dropping it."
+    )
+    args = arg_parser.parse_args()
+
+    size = args.size_MB * BYTES_IN_MB
+    chunks = build_body_chunks(size, args.chunk_KB * 1024)
+
+    with TemporaryDirectory() as tmpdirname:
+
+        def run() -> Dict[str, int]:
+            target = (
+                FileTarget(os.path.join(tmpdirname, "benchmark.bin"))
+                if args.to_disk
+                else NullTarget()
+            )
+            return asyncio.run(upload(chunks, target, args.buffer_KB * 1024, args.max_pending))
+
+        durations = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            stats = run()
+            durations.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        run()
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    per_gb = BYTES_IN_GB / size
+    print(f"throughput: {size / BYTES_IN_MB / min(durations):.1f} MB/s (best of {args.repeat})")
+    print(f"buffers allocated per GB: {stats['buffers'] * per_gb:.0f}")
+    print(f"bytes copied per GB: {stats['copied_bytes'] * per_gb / BYTES_IN_MB:.0f} MB")
+    print(f"peak traced memory: {peak_memory / BYTES_IN_MB:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ from typing import List
 from uuid import UUID, uuid4
 
 import pytest
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from strawberry import Schema
 
@@ -161,6 +162,20 @@ create_experiment_mutation_invalid_tags = """
 """
 
 
+create_experiments_mutation = """
+    mutation CreateExperiments($inputs: [ExperimentCreateInput!]!) {
+        createExperiments(createExperimentsInput: $inputs) {
+            experiment {
+                uuid
+                title
+                tags
+                eid
+            }
+            error
+        }
+    }
+"""
+
 update_experiment_mutation = """
     mutation UpdateExperiment {
         updateExperiment(
@@ -616,3 +631,48 @@ async def test_remove_experiment(
         experiments_root_dir=str(settings.experiments_dir_path), experiment_uuid=experiment.uuid
     )
     assert exists(experiment_files_path) == False
+
+
+@pytest.mark.asyncio
+async def test_create_experiments(db_session: AsyncSession):
+    """Test create experiments in a batch graphql mutation"""
+
+    schema = Schema(query=Query, mutation=Mutation)
+    context = ServerContext(
+        db_session=db_session,
+        user_info=UserInfo(uuid=uuid4(), username=settings.default_username, scopes=set(UserScope)),
+    )
+    inputs = [
+        {"title": "First", "description": "", "tags": ["Fusion", "cold"]},
+        {"title": "x" * (MAX_EXPERIMENT_TITLE_LENGTH + 1), "description": "", "tags": []},
+        {"title": "Third", "description": "", "tags": ["fusion", "tag$1"]},
+        {"title": "Fourth", "description": "", "tags": ["cold"]},
+    ]
+    resp = await schema.execute(
+        create_experiments_mutation, context_value=context, variable_values={"inputs": inputs}
+    )
+
+    assert resp.errors is None
+    assert resp.data is not None
+    results = resp.data["createExperiments"]
+    assert len(results) == len(inputs)
+
+    assert results[0]["error"] is None
+    assert results[0]["experiment"]["title"] == "First"
+    assert sorted(results[0]["experiment"]["tags"]) == ["Fusion", "cold"]
+    assert results[1]["experiment"] is None
+    assert results[1]["error"] == (
+        f"Title should be maximum {MAX_EXPERIMENT_TITLE_LENGTH} characters long."
+    )
+    assert results[2]["experiment"] is None
+    assert results[2]["error"] is not None
+    assert results[3]["error"] is None
+    assert results[3]["experiment"]["tags"] == ["cold"]
+
+    first_index = int(results[0]["experiment"]["eid"].split("-")[-1])
+    assert results[3]["experiment"]["eid"].endswith(f"-{first_index + 1}")
+
+    db_experiments = (await db_session.execute(select(orm.Experiment))).scalars().all()
+    assert {item.uuid for item in db_experiments} == {
+        UUID(results[idx]["experiment"]["uuid"]) for idx in (0, 3)
+    }
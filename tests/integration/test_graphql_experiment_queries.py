@@ -7,10 +7,13 @@ from uuid import UUID, uuid4
 
 import pytest
 import pytz
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import AsyncSession
 from strawberry import Schema
 
 from aqueductcore.backend.context import ServerContext, UserInfo, UserScope
+from aqueductcore.backend.errors import AQDValidationError
 from aqueductcore.backend.models import orm
 from aqueductcore.backend.models.experiment import (
     ExperimentCreate,
@@ -18,6 +21,7 @@ from aqueductcore.backend.models.experiment import (
     TagCreate,
     TagRead,
 )
+from aqueductcore.backend.models.task import TaskCreate
 from aqueductcore.backend.routers.graphql.inputs import IDType
 from aqueductcore.backend.routers.graphql.query_schema import Query
 from aqueductcore.backend.services.experiment import get_all_tags
@@ -25,6 +29,7 @@ from aqueductcore.backend.services.utils import (
     experiment_model_to_orm,
     experiment_orm_to_model,
     tag_model_to_orm,
+    task_model_to_orm,
 )
 from aqueductcore.backend.services.validators import (
     MAX_EXPERIMENT_TAGS_ALLOWED_IN_FILTER,
@@ -80,6 +85,21 @@ all_experiments_query = """
 }
 """
 
+all_experiments_cursor_query = """
+query MyQuery($cursor: String) {
+    experiments (
+        limit: 4
+        cursor: $cursor
+    ) {
+        experimentsData {
+            uuid
+        }
+        totalExperimentsCount
+        nextCursor
+    }
+}
+"""
+
 all_experiments_query_filter_by_date = """
 query MyQuery($filters: ExperimentFiltersInput!) {
     experiments (
@@ -226,6 +246,22 @@ tags_pagination_query = """
     query TestQuery {
         tags (limit: 2, offset: 0) {
             tagsData
+            tagsStatistics {
+                name
+                experimentsCount
+            }
+            totalTagsCount
+        }
+    }
+    """
+
+tags_prefix_query = """
+    query TestQuery($prefix: String!) {
+        tags (limit: 2, filters: {prefix: $prefix}) {
+            tagsStatistics {
+                name
+                experimentsCount
+            }
             totalTagsCount
         }
     }
@@ -500,6 +536,65 @@ async def test_query_filter_by_date(db_session: AsyncSession, time_zone: str):
     assert len(resp.data["experiments"]["experimentsData"]) == 0
 
 
+@pytest.mark.asyncio
+async def test_query_all_experiments_cursor(
+    db_session: AsyncSession,
+    experiments_data: List[ExperimentCreate],
+):
+    db_user = orm.User(uuid=UUID(int=0), username=settings.default_username)
+    db_session.add(db_user)
+
+    created_at = datetime.now(timezone.utc)
+    for idx, experiment in enumerate(experiments_data):
+        db_experiment = experiment_model_to_orm(experiment)
+        db_experiment.created_by_user = db_user
+        db_experiment.created_at = created_at - timedelta(seconds=idx // 3)
+        db_session.add(db_experiment)
+    await db_session.commit()
+
+    schema = Schema(query=Query)
+
+    context = ServerContext(
+        db_session=db_session,
+        user_info=UserInfo(uuid=uuid4(), username=settings.default_username, scopes=set(UserScope)),
+    )
+
+    cursor = None
+    experiment_uuids = []
+    for _ in range(len(experiments_data)):
+        resp = await schema.execute(
+            all_experiments_cursor_query, variable_values={"cursor": cursor}, context_value=context
+        )
+        assert resp.errors is None
+        assert resp.data is not None
+        assert resp.data["experiments"]["totalExperimentsCount"] == len(experiments_data)
+        experiment_uuids.extend(
+            UUID(item["uuid"]) for item in resp.data["experiments"]["experimentsData"]
+        )
+        cursor = resp.data["experiments"]["nextCursor"]
+        if cursor is None:
+            break
+
+    assert len(experiment_uuids) == len(experiments_data)
+    assert set(experiment_uuids) == {item.uuid for item in experiments_data}
+
+
+@pytest.mark.asyncio
+async def test_query_all_experiments_invalid_cursor(db_session: AsyncSession):
+    schema = Schema(query=Query)
+
+    context = ServerContext(
+        db_session=db_session,
+        user_info=UserInfo(uuid=uuid4(), username=settings.default_username, scopes=set(UserScope)),
+    )
+    resp = await schema.execute(
+        all_experiments_cursor_query, variable_values={"cursor": "invalid"}, context_value=context
+    )
+
+    assert resp.errors is not None
+    assert resp.errors[0].message == "Invalid pagination cursor."
+
+
 @pytest.mark.asyncio
 async def test_query_all_experiments_invalid_limit(
     db_session: AsyncSession,
@@ -884,6 +979,15 @@ async def test_query_pagination_tags(
 
     assert len(resp.data["tags"]["tagsData"]) == 2
     assert resp.data["tags"]["totalTagsCount"] == 6
+    assert [item["name"] for item in resp.data["tags"]["tagsStatistics"]] == resp.data["tags"][
+        "tagsData"
+    ]
+    for item in resp.data["tags"]["tagsStatistics"]:
+        assert (
+            item["experimentsCount"]
+            == tags[[tag.name for tag in tags].index(item["name"])].experiments_count
+        )
+        assert item["experimentsCount"] > 0
 
     for idx, item in enumerate(resp.data["tags"]["tagsData"]):
         check_tag_values(
@@ -904,3 +1008,129 @@ async def test_extensions():
     echo = p_dummy["actions"][0]
     assert echo["experimentVariableName"] == "var4"
     assert echo["parameters"][1]["displayName"] == "some display name"
+
+
+experiments_with_fields_query = """
+{
+    experiments (
+        limit: 10
+        offset: 0
+    ) {
+        experimentsData {
+            uuid
+            files {
+                name
+            }
+            tasks {
+                uuid
+                experiment {
+                    uuid
+                }
+            }
+        }
+    }
+}
+"""
+
+
+@pytest.mark.asyncio
+async def test_query_all_experiments_batched_fields(
+    db_session: AsyncSession,
+    experiments_data: List[ExperimentCreate],
+    tasks_data: List[TaskCreate],
+    temp_experiment_files: Dict[UUID, List[Tuple[str, datetime]]],
+):
+    db_user = orm.User(uuid=UUID(int=0), username=settings.default_username)
+    db_session.add(db_user)
+    for experiment in experiments_data:
+        db_experiment = experiment_model_to_orm(experiment)
+        db_experiment.created_by_user = db_user
+        db_session.add(db_experiment)
+    for task in tasks_data:
+        db_task = task_model_to_orm(task)
+        db_task.created_by = db_user.uuid
+        # finished tasks are served without the result backend.
+        db_task.status = "SUCCESS"
+        db_session.add(db_task)
+    await db_session.commit()
+
+    schema = Schema(query=Query)
+    context = ServerContext(
+        db_session=db_session,
+        user_info=UserInfo(uuid=uuid4(), username=settings.default_username, scopes=set(UserScope)),
+    )
+
+    statements = []
+
+    def count_statements(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", count_statements)
+    try:
+        resp = await schema.execute(experiments_with_fields_query, context_value=context)
+    finally:
+        event.remove(Engine, "before_cursor_execute", count_statements)
+
+    assert resp.errors is None
+    experiments = resp.data["experiments"]["experimentsData"]
+    assert len(experiments) == 10
+
+    tasks_count = 0
+    for experiment in experiments:
+        experiment_uuid = UUID(experiment["uuid"])
+        assert sorted(item["name"] for item in experiment["files"]) == sorted(
+            name for name, _ in temp_experiment_files[experiment_uuid]
+        )
+        expected_tasks = [task for task in tasks_data if task.experiment_uuid == experiment_uuid]
+        assert len(experiment["tasks"]) == len(expected_tasks)
+        for task in experiment["tasks"]:
+            assert task["experiment"]["uuid"] == experiment["uuid"]
+        tasks_count += len(expected_tasks)
+
+    assert tasks_count > 10
+    # every field is resolved with a fixed number of queries, regardless of the page size.
+    assert len(statements) <= 10
+
+
+@pytest.mark.asyncio
+async def test_query_tags_prefix(
+    db_session: AsyncSession, experiments_data: List[ExperimentCreate]
+):
+    db_user = orm.User(uuid=UUID(int=0), username=settings.default_username)
+    db_session.add(db_user)
+
+    for experiment in experiments_data:
+        db_experiment = experiment_model_to_orm(experiment)
+        db_experiment.created_by_user = db_user
+        db_session.add(db_experiment)
+    await db_session.commit()
+
+    schema = Schema(query=Query)
+    context = ServerContext(
+        db_session=db_session,
+        user_info=UserInfo(uuid=uuid4(), username=settings.default_username, scopes=set(UserScope)),
+    )
+    tags = await get_all_tags(user_info=context.user_info, db_session=context.db_session)
+    prefix = tags[0].key[:2]
+    expected = sorted(
+        (tag for tag in tags if tag.key.startswith(prefix)),
+        key=lambda tag: (-tag.experiments_count, tag.key),
+    )
+
+    resp = await schema.execute(
+        tags_prefix_query, context_value=context, variable_values={"prefix": prefix.upper()}
+    )
+
+    assert resp.errors is None
+    assert resp.data is not None
+    assert resp.data["tags"]["totalTagsCount"] == len(expected)
+    assert resp.data["tags"]["tagsStatistics"] == [
+        {"name": tag.name, "experimentsCount": tag.experiments_count} for tag in expected[:2]
+    ]
+
+    resp = await schema.execute(
+        tags_prefix_query, context_value=context, variable_values={"prefix": "not a tag"}
+    )
+    assert resp.errors is not None
+    assert isinstance(resp.errors[0].original_error, AQDValidationError)
+    assert resp.errors[0].message.startswith("Tag can only contain")
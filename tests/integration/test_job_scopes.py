@@ -102,7 +102,7 @@ async def test_user_can_see_allowed_tasks(
     user_number: int,
     count: int,
 ):
-    tasks = await get_all_tasks(
+    tasks, _ = await get_all_tasks(
         user_info=UserInfo(
             uuid=users_data[user_number].uuid,
             username=users_data[user_number].username,
@@ -0,0 +1,136 @@
+# pylint: skip-file
+import re
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, insert, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from aqueductcore.backend.context import UserInfo, UserScope
+from aqueductcore.backend.models import orm
+from aqueductcore.backend.services.experiment import get_all_experiments
+from aqueductcore.backend.services.task_executor import get_all_tasks
+
+USERS_COUNT = 20
+TAGS_COUNT = 50
+EXPERIMENTS_COUNT = 5000
+TASKS_COUNT = 20000
+
+# a full scan of the large tables, which is not driven by an index.
+FULL_SCAN_PATTERN = re.compile(r"^SCAN (experiment|task|experiment_tag)$")
+
+
+async def fill_synthetic_data(db_session: AsyncSession) -> List[dict]:
+    now = datetime.now(timezone.utc)
+    users = [{"uuid": uuid4(), "username": f"user{idx}"} for idx in range(USERS_COUNT)]
+    experiments = [
+        {
+            "uuid": uuid4(),
+            "title": f"experiment {idx}",
+            "created_by": users[idx % USERS_COUNT]["uuid"],
+            "created_at": now - timedelta(minutes=idx),
+            "updated_at": now,
+            "eid": f"20240101-{idx}",
+        }
+        for idx in range(EXPERIMENTS_COUNT)
+    ]
+    await db_session.execute(insert(orm.User), users)
+    await db_session.execute(
+        insert(orm.Tag), [{"key": f"tag{idx}", "name": f"Tag{idx}"} for idx in range(TAGS_COUNT)]
+    )
+    await db_session.execute(insert(orm.Experiment), experiments)
+    await db_session.execute(
+        insert(orm.experiment_tag_association),
+        [
+            {"experiment_uuid": experiment["uuid"], "tag_key": f"tag{(idx + shift) % TAGS_COUNT}"}
+            for idx, experiment in enumerate(experiments)
+            for shift in range(3)
+        ],
+    )
+    await db_session.execute(
+        insert(orm.Task),
+        [
+            {
+                "uuid": str(uuid4()),
+                "extension_name": f"extension{idx % 10}",
+                "action_name": f"action{idx % 3}",
+                "created_by": users[idx % USERS_COUNT]["uuid"],
+                "experiment_id": experiments[idx % EXPERIMENTS_COUNT]["uuid"],
+                "created_at": now - timedelta(seconds=idx),
+                "status": "SUCCESS",
+            }
+            for idx in range(TASKS_COUNT)
+        ],
+    )
+    await db_session.execute(text("ANALYZE"))
+    await db_session.commit()
+
+    return users
+
+
+async def explain_statements(
+    db_session: AsyncSession, statements: List[Tuple[str, tuple]]
+) -> List[str]:
+    plans = []
+    connection = await db_session.connection()
+    for statement, parameters in statements:
+        result = await connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+        plans.extend(row[-1] for row in result.all())
+    return plans
+
+
+@pytest.mark.asyncio
+async def test_list_queries_use_indexes(db_session: AsyncSession):
+    users = await fill_synthetic_data(db_session)
+    admin = UserInfo(uuid=uuid4(), username="admin", scopes=set(UserScope))
+    owner = UserInfo(
+        uuid=users[3]["uuid"],
+        username=users[3]["username"],
+        scopes={UserScope.EXPERIMENT_VIEW_OWN, UserScope.JOB_VIEW_OWN},
+    )
+
+    statements: List[Tuple[str, tuple]] = []
+
+    def capture_statements(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(Engine, "before_cursor_execute", capture_statements)
+    try:
+        experiments, _ = await get_all_experiments(
+            user_info=admin, db_session=db_session, order_by_creation_date=True, limit=20
+        )
+        await get_all_experiments(
+            user_info=owner,
+            db_session=db_session,
+            tags=["tag3"],
+            order_by_creation_date=True,
+            limit=20,
+        )
+        await get_all_experiments(
+            user_info=admin,
+            db_session=db_session,
+            should_include_tags=["tag3", "tag7"],
+            order_by_creation_date=True,
+            limit=20,
+        )
+        await get_all_tasks(user_info=admin, db_session=db_session, limit=20)
+        await get_all_tasks(
+            user_info=owner,
+            db_session=db_session,
+            extension_name="extension3",
+            action_name="action1",
+            limit=20,
+        )
+        await get_all_tasks(
+            user_info=admin, db_session=db_session, experiment_uuid=experiments[0].uuid
+        )
+    finally:
+        event.remove(Engine, "before_cursor_execute", capture_statements)
+
+    plans = await explain_statements(db_session, statements)
+    assert plans
+    assert [line for line in plans if FULL_SCAN_PATTERN.match(line)] == []
@@ -7,6 +7,8 @@ from uuid import UUID
 
 import pytest
 import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from aqueductcore.backend.context import UserInfo, UserScope
@@ -14,7 +16,7 @@ from aqueductcore.backend.models import orm
 from aqueductcore.backend.models.experiment import ExperimentCreate
 from aqueductcore.backend.models.task import TaskCreate
 from aqueductcore.backend.services.extensions_executor import ExtensionsExecutor
-from aqueductcore.backend.services.task_executor import get_all_tasks
+from aqueductcore.backend.services.task_executor import get_all_tasks, get_experiments_tasks
 from aqueductcore.backend.services.utils import (
     experiment_model_to_orm,
     task_model_to_orm,
@@ -96,7 +98,7 @@ async def test_get_all_tasks_no_filters(
         scopes=scope,
     )
 
-    tasks = await get_all_tasks(user_info=user_info, db_session=my_db_session)
+    tasks, _ = await get_all_tasks(user_info=user_info, db_session=my_db_session)
 
     assert len(tasks) == 80
 
@@ -121,7 +123,7 @@ async def test_get_all_tasks_experiment_filter(
         scopes=scope,
     )
 
-    tasks = await get_all_tasks(
+    tasks, _ = await get_all_tasks(
         user_info=user_info,
         db_session=my_db_session,
         experiment_uuid=experiments_data[0].uuid,
@@ -130,6 +132,42 @@ async def test_get_all_tasks_experiment_filter(
     assert len(tasks) == 2
 
 
+@pytest.mark.asyncio
+async def test_get_experiments_tasks(
+    my_db_session,
+    experiments_data,
+    users_data: List[orm.User],
+):
+    user_info = UserInfo(
+        uuid=users_data[1].uuid,
+        username=users_data[1].username,
+        scopes=Scopes.manager_scope(),
+    )
+    experiment_uuids = [experiments_data[0].uuid, experiments_data[1].uuid]
+
+    statements: List[str] = []
+
+    def capture_statements(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", capture_statements)
+    try:
+        tasks = await get_experiments_tasks(
+            user_info=user_info,
+            db_session=my_db_session,
+            experiment_uuids=experiment_uuids,
+        )
+    finally:
+        event.remove(Engine, "before_cursor_execute", capture_statements)
+
+    expected_tasks, _ = await get_all_tasks(user_info=user_info, db_session=my_db_session)
+    assert [task.task_id for task in tasks] == [
+        task.task_id for task in expected_tasks if task.experiment_uuid in experiment_uuids
+    ]
+    # the tasks are not counted.
+    assert not any("count(" in statement.lower() for statement in statements)
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "scope,user_number",
@@ -150,7 +188,7 @@ async def test_get_all_tasks_extension_filter(
         scopes=scope,
     )
 
-    tasks = await get_all_tasks(
+    tasks, _ = await get_all_tasks(
         user_info=user_info, db_session=my_db_session, extension_name="dummy extension two"
     )
 
@@ -178,7 +216,7 @@ async def test_get_all_tasks_action_filter(
         scopes=scope,
     )
 
-    tasks = await get_all_tasks(
+    tasks, _ = await get_all_tasks(
         user_info=user_info, db_session=my_db_session, action_name="dummy action two"
     )
 
@@ -206,7 +244,7 @@ async def test_get_all_tasks_username_filter(
         scopes=scope,
     )
 
-    tasks = await get_all_tasks(user_info=user_info, db_session=my_db_session, username="admin")
+    tasks, _ = await get_all_tasks(user_info=user_info, db_session=my_db_session, username="admin")
 
     assert len(tasks) == 28
     assert all(task.created_by_username == "admin" for task in tasks)
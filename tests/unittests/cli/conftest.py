@@ -69,7 +69,10 @@ def temp_experiments(
                     description=experiment.description,
                     created_at=datetime.now().replace(microsecond=0),
                     updated_at=datetime.now().replace(microsecond=0),
-                    tags=[Tag(key=item.key, name=item.name) for item in experiment.tags],
+                    tags=[
+                        Tag(key=item.key, name=item.name)
+                        for item in sorted(experiment.tags, key=lambda tag: tag.key)
+                    ],
                 )
                 metauser.experiments.append(new_experiment)
                 db_experiment = orm.Experiment(
@@ -3,7 +3,7 @@
 import os
 import random
 import tarfile
-from datetime import datetime
+from datetime import date, datetime
 from io import BytesIO
 from tempfile import TemporaryDirectory
 from typing import List
@@ -97,6 +97,38 @@ def test_import_experiments_metadata(db_session: Session, experiments_data: List
             }  # this assertion should be ok for pre-existing tags with different case.
 
 
+def test_import_experiments_metadata_updates_eid_counters(db_session: Session):
+    db_session.add(orm.ExperimentEIDCounter(day=date(2024, 3, 5), last_index=2))
+    db_session.add(orm.ExperimentEIDCounter(day=date(2024, 3, 6), last_index=9))
+    db_session.commit()
+
+    metauser = User(uuid=uuid4(), username=settings.default_username, experiments=[])
+    for eid in ("20240305-7", "20240305-4", "20240306-3", "20240307-1", "imported"):
+        metauser.experiments.append(
+            Experiment(
+                uuid=uuid4(),
+                title="Title",
+                eid=eid,
+                description="",
+                created_at=datetime.now(),
+                updated_at=datetime.now(),
+                tags=[],
+            )
+        )
+    metadata = AqueductData(
+        version=aqueductcore.__version__, variant=AqueductVariant.CORE, users=[metauser]
+    )
+
+    Importer.import_experiments_metadata(db_session=db_session, metadata=metadata)
+    db_session.commit()
+
+    counters = db_session.execute(select(orm.ExperimentEIDCounter)).scalars().all()
+    assert {item.day: item.last_index for item in counters} == {
+        date(2024, 3, 5): 7,
+        date(2024, 3, 6): 9,
+    }
+
+
 def test_import_artifact():
 
     with TemporaryDirectory() as tmprootdir:
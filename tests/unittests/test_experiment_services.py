@@ -1,24 +1,33 @@
 # pylint: skip-file
 
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from os.path import exists
 from typing import Dict, List, Tuple
 from uuid import UUID, uuid4
 
 import pytest
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from aqueductcore.backend.context import UserInfo, UserScope
-from aqueductcore.backend.errors import AQDDBExperimentNonExisting, AQDValidationError
+from aqueductcore.backend.errors import (
+    AQDDBExperimentNonExisting,
+    AQDPermission,
+    AQDValidationError,
+)
 from aqueductcore.backend.models import orm
-from aqueductcore.backend.models.experiment import ExperimentCreate, TagCreate
+from aqueductcore.backend.models.constants import ARCHIVED
+from aqueductcore.backend.models.experiment import ExperimentCreate, NewExperiment, TagCreate
+from aqueductcore.backend.services import experiment as experiment_service
 from aqueductcore.backend.services.experiment import (
     add_tags_to_experiment,
     build_experiment_dir_absolute_path,
     create_experiment,
-    generate_experiment_uuid_and_eid,
     get_all_experiments,
     get_all_tags,
+    get_tags_page,
     get_experiment_by_eid,
     get_experiment_by_uuid,
     get_experiment_files,
@@ -26,8 +35,15 @@ from aqueductcore.backend.services.experiment import (
     remove_tag_from_experiment,
     update_experiment,
 )
+from aqueductcore.backend.services.experiment_batch import (
+    allocate_experiment_eids,
+    create_experiments,
+    update_experiments_tags,
+)
 from aqueductcore.backend.services.utils import (
+    encode_page_cursor,
     experiment_model_to_orm,
+    generate_experiment_uuid_and_eid,
     tag_model_to_orm,
 )
 from aqueductcore.backend.settings import settings
@@ -48,7 +64,7 @@ async def test_get_all_experiments(
 
     await db_session.commit()
 
-    experiments = await get_all_experiments(
+    experiments, _ = await get_all_experiments(
         user_info=UserInfo(uuid=uuid4(), username=settings.default_username, scopes=set(UserScope)),
         db_session=db_session,
     )
@@ -84,7 +100,7 @@ async def test_get_all_experiments_limit_exceeded(
         await db_session.commit()
         await db_session.refresh(db_experiment)
 
-    experiments = await get_all_experiments(
+    experiments, _ = await get_all_experiments(
         user_info=UserInfo(uuid=uuid4(), username=settings.default_username, scopes=set(UserScope)),
         db_session=db_session,
         order_by_creation_date=True,
@@ -107,7 +123,7 @@ async def test_get_all_experiments_ordered_by_creation_date(
         await db_session.commit()
         await db_session.refresh(db_experiment)
 
-    experiments = await get_all_experiments(
+    experiments, _ = await get_all_experiments(
         user_info=UserInfo(uuid=uuid4(), username=settings.default_username, scopes=set(UserScope)),
         db_session=db_session,
         order_by_creation_date=True,
@@ -128,6 +144,152 @@ async def test_get_all_experiments_ordered_by_creation_date(
         assert item.description == experiments_data[idx].description
 
 
+@pytest.mark.asyncio
+async def test_get_all_experiments_paginated(
+    db_session: AsyncSession, experiments_data: List[ExperimentCreate]
+):
+    """Test get_all_experiments returns a single page and the total count"""
+    db_user = orm.User(uuid=UUID(int=0), username=settings.default_username)
+    db_session.add(db_user)
+
+    for experiment in experiments_data:
+        db_experiment = experiment_model_to_orm(experiment)
+        db_experiment.created_by_user = db_user
+        db_session.add(db_experiment)
+
+        await db_session.commit()
+        await db_session.refresh(db_experiment)
+
+    user_info = UserInfo(uuid=uuid4(), username=settings.default_username, scopes=set(UserScope))
+    all_experiments, total = await get_all_experiments(
+        user_info=user_info,
+        db_session=db_session,
+        order_by_creation_date=True,
+    )
+    assert total == len(experiments_data)
+
+    page_size = 3
+    pages: List[UUID] = []
+    for offset in range(0, len(experiments_data), page_size):
+        experiments, total = await get_all_experiments(
+            user_info=user_info,
+            db_session=db_session,
+            order_by_creation_date=True,
+            offset=offset,
+            limit=page_size,
+        )
+        assert len(experiments) <= page_size
+        assert total == len(experiments_data)
+        pages.extend(item.uuid for item in experiments)
+
+    assert pages == [item.uuid for item in all_experiments]
+
+
+@pytest.mark.asyncio
+async def test_get_all_experiments_cursor_paginated(
+    db_session: AsyncSession, experiments_data: List[ExperimentCreate]
+):
+    """Test get_all_experiments pages through experiments with cursors"""
+    db_user = orm.User(uuid=UUID(int=0), username=settings.default_username)
+    db_session.add(db_user)
+
+    created_at = datetime.now(timezone.utc)
+    for idx, experiment in enumerate(experiments_data):
+        db_experiment = experiment_model_to_orm(experiment)
+        db_experiment.created_by_user = db_user
+        # some experiments share the creation date to check the tie breaking.
+        db_experiment.created_at = created_at - timedelta(seconds=idx // 2)
+        db_session.add(db_experiment)
+
+    await db_session.commit()
+
+    user_info = UserInfo(uuid=uuid4(), username=settings.default_username, scopes=set(UserScope))
+    all_experiments, _ = await get_all_experiments(
+        user_info=user_info,
+        db_session=db_session,
+        order_by_creation_date=True,
+    )
+
+    page_size = 3
+    cursor = None
+    pages: List[UUID] = []
+    while True:
+        experiments, total = await get_all_experiments(
+            user_info=user_info,
+            db_session=db_session,
+            order_by_creation_date=True,
+            limit=page_size,
+            cursor=cursor,
+        )
+        assert total == len(experiments_data)
+        pages.extend(item.uuid for item in experiments)
+        if len(experiments) < page_size:
+            break
+        cursor = encode_page_cursor(experiments[-1].created_at, experiments[-1].uuid)
+
+    assert pages == [item.uuid for item in all_experiments]
+
+
+@pytest.mark.asyncio
+async def test_get_all_experiments_search_ordered_by_relevance(
+    db_session: AsyncSession, experiments_data: List[ExperimentCreate]
+):
+    """Test get_all_experiments searches title, EID and description and ranks the results"""
+    db_user = orm.User(uuid=UUID(int=0), username=settings.default_username)
+    db_session.add(db_user)
+
+    for experiment in experiments_data:
+        db_experiment = experiment_model_to_orm(experiment)
+        db_experiment.created_by_user = db_user
+        db_session.add(db_experiment)
+
+    await db_session.commit()
+
+    user_info = UserInfo(uuid=uuid4(), username=settings.default_username, scopes=set(UserScope))
+    experiments, total = await get_all_experiments(
+        user_info=user_info,
+        db_session=db_session,
+        title_filter="quantum",
+        order_by_creation_date=True,
+        order_by_relevance=True,
+    )
+    assert total == len(experiments_data)
+    prefix_matches = [item.title.lower().startswith("quantum") for item in experiments]
+    assert any(prefix_matches)
+    assert prefix_matches == sorted(prefix_matches, reverse=True)
+
+    # description only matches are included after the title matches.
+    experiments, _ = await get_all_experiments(
+        user_info=user_info,
+        db_session=db_session,
+        title_filter="experiment",
+        order_by_relevance=True,
+    )
+    assert len(experiments) == len(experiments_data)
+    title_matches = ["experiment" in item.title.lower() for item in experiments]
+    assert any(title_matches)
+    assert title_matches == sorted(title_matches, reverse=True)
+
+    with pytest.raises(AQDValidationError):
+        await get_all_experiments(
+            user_info=user_info,
+            db_session=db_session,
+            title_filter="quantum",
+            order_by_relevance=True,
+            cursor=encode_page_cursor(datetime.now(timezone.utc), uuid4()),
+        )
+
+
+def test_title_search_matches_similar_words_for_relevance_only():
+    """Test similar titles are only matched in PostgreSQL when ordering by relevance"""
+    for fuzzy in (False, True):
+        title_clause, _ = experiment_service._title_search_clauses(
+            "postgresql", "quantum", fuzzy=fuzzy
+        )
+        compiled = str(title_clause.compile(dialect=postgresql.dialect()))
+        assert ("%>" in compiled) is fuzzy
+
+
 @pytest.mark.asyncio
 async def test_get_all_experiments_filtered_by_tag(
     db_session: AsyncSession, experiments_data: List[ExperimentCreate]
@@ -143,7 +305,7 @@ async def test_get_all_experiments_filtered_by_tag(
 
     await db_session.commit()
 
-    experiments = await get_all_experiments(
+    experiments, _ = await get_all_experiments(
         user_info=UserInfo(uuid=uuid4(), username=settings.default_username, scopes=set(UserScope)),
         db_session=db_session,
         tags=["tag1"],
@@ -157,6 +319,55 @@ async def test_get_all_experiments_filtered_by_tag(
         assert item.description == experiments_data[idx].description
 
 
+@pytest.mark.asyncio
+async def test_get_all_experiments_filtered_by_multiple_tags(
+    db_session: AsyncSession, experiments_data: List[ExperimentCreate]
+):
+    """Test get_all_experiments filters by any and by all of the tags without joining them"""
+    db_user = orm.User(uuid=UUID(int=0), username=settings.default_username)
+    db_session.add(db_user)
+
+    tags = {key: orm.Tag(key=key, name=key.capitalize()) for key in ("red", "blue", "green")}
+    tagged = {0: ["red"], 1: ["red", "blue"], 2: ["red", "blue", "green"], 3: ["green"]}
+    for idx, experiment in enumerate(experiments_data):
+        db_experiment = experiment_model_to_orm(experiment)
+        db_experiment.created_by_user = db_user
+        db_experiment.tags = [tags[key] for key in tagged.get(idx, [])]
+        db_session.add(db_experiment)
+
+    await db_session.commit()
+
+    statements = []
+
+    def capture_statements(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    user_info = UserInfo(uuid=uuid4(), username=settings.default_username, scopes=set(UserScope))
+    event.listen(Engine, "before_cursor_execute", capture_statements)
+    try:
+        any_tag_experiments, any_tag_total = await get_all_experiments(
+            user_info=user_info, db_session=db_session, tags=["blue", "GREEN"]
+        )
+        all_tags_experiments, all_tags_total = await get_all_experiments(
+            user_info=user_info, db_session=db_session, should_include_tags=["red", "Blue", "blue"]
+        )
+    finally:
+        event.remove(Engine, "before_cursor_execute", capture_statements)
+
+    expected_uuids = {experiments_data[idx].uuid for idx in (1, 2, 3)}
+    assert any_tag_total == len(expected_uuids)
+    assert {item.uuid for item in any_tag_experiments} == expected_uuids
+
+    expected_uuids = {experiments_data[idx].uuid for idx in (1, 2)}
+    assert all_tags_total == len(expected_uuids)
+    assert {item.uuid for item in all_tags_experiments} == expected_uuids
+    for item in all_tags_experiments:
+        assert {"red", "blue"} <= {tag.key for tag in item.tags}
+
+    assert all("GROUP BY" not in statement for statement in statements)
+    assert all("JOIN experiment_tag" not in statement for statement in statements)
+
+
 @pytest.mark.asyncio
 async def test_get_all_experiments_filtered_by_tag_ordered_by_creation_date(
     db_session: AsyncSession, experiments_data: List[ExperimentCreate]
@@ -173,7 +384,7 @@ async def test_get_all_experiments_filtered_by_tag_ordered_by_creation_date(
         await db_session.commit()
         await db_session.refresh(db_experiment)
 
-    experiments = await get_all_experiments(
+    experiments, _ = await get_all_experiments(
         user_info=UserInfo(uuid=uuid4(), username=settings.default_username, scopes=set(UserScope)),
         db_session=db_session,
         tags=["tag1"],
@@ -289,6 +500,109 @@ async def test_create_db_experiment_pre_existing_data(
     )  # Note: "laser" tag is created in fixture
 
 
+@pytest.mark.asyncio
+async def test_allocate_experiment_eids(
+    db_session: AsyncSession, experiments_data: List[ExperimentCreate]
+):
+    """Test EIDs are allocated in bulk after the existing experiments of the day"""
+
+    db_user = orm.User(uuid=UUID(int=0), username=settings.default_username)
+    db_session.add(db_user)
+
+    for experiment in experiments_data:
+        db_experiment = experiment_model_to_orm(experiment)
+        db_experiment.created_by_user = db_user
+        db_session.add(db_experiment)
+
+    await db_session.commit()
+
+    allocated = await allocate_experiment_eids(db_session=db_session, count=3)
+    assert [eid for _, eid in allocated] == [
+        generate_experiment_uuid_and_eid(index)[1] for index in (41, 42, 43)
+    ]
+    assert len({uuid for uuid, _ in allocated}) == 3
+
+    statements = []
+
+    def capture_statements(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    # later allocations only update the counter of the day.
+    event.listen(Engine, "before_cursor_execute", capture_statements)
+    try:
+        ((_, eid),) = await allocate_experiment_eids(db_session=db_session)
+    finally:
+        event.remove(Engine, "before_cursor_execute", capture_statements)
+
+    assert eid == generate_experiment_uuid_and_eid(44)[1]
+    assert len(statements) == 1
+    assert "FROM experiment " not in statements[0]
+
+    created = await create_experiment(
+        user_info=UserInfo(uuid=uuid4(), username=settings.default_username, scopes=set(UserScope)),
+        db_session=db_session,
+        title="Title",
+        description="",
+        tags=[],
+    )
+    assert created.eid == generate_experiment_uuid_and_eid(45)[1]
+
+
+@pytest.mark.asyncio
+async def test_create_experiments_batch(db_session: AsyncSession):
+    """Test create_experiments looks up tags, user and EIDs once for the whole batch"""
+
+    user_info = UserInfo(uuid=uuid4(), username=settings.default_username, scopes=set(UserScope))
+    experiments = [
+        NewExperiment(title=f"Experiment {idx}", description="", tags=["laser", f"tag{idx % 3}"])
+        for idx in range(50)
+    ]
+    experiments.insert(10, NewExperiment(title="Invalid", description="", tags=[""]))
+
+    statements = []
+
+    def capture_statements(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", capture_statements)
+    try:
+        results = await create_experiments(
+            user_info=user_info, db_session=db_session, experiments=experiments
+        )
+    finally:
+        event.remove(Engine, "before_cursor_execute", capture_statements)
+
+    assert len(results) == len(experiments)
+    assert results[10].experiment is None
+    assert results[10].error == "Tag cannot be empty"
+
+    created = [result.experiment for result in results if result.experiment is not None]
+    assert len(created) == 50
+    assert [item.eid for item in created] == [
+        generate_experiment_uuid_and_eid(idx)[1] for idx in range(1, 51)
+    ]
+    assert [item.title for item in created] == [f"Experiment {idx}" for idx in range(50)]
+    assert all(item.error is None for idx, item in enumerate(results) if idx != 10)
+
+    # the statements do not grow with the number of experiments.
+    assert len(statements) < 20
+
+    tags, _ = await get_tags_page(user_info=user_info, db_session=db_session)
+    assert {tag.key: tag.experiments_count for tag in tags} == {
+        "laser": 50,
+        "tag0": 17,
+        "tag1": 17,
+        "tag2": 16,
+    }
+
+    with pytest.raises(AQDPermission):
+        await create_experiments(
+            user_info=UserInfo(uuid=uuid4(), username="guest", scopes=set()),
+            db_session=db_session,
+            experiments=experiments,
+        )
+
+
 @pytest.mark.asyncio
 async def test_create_db_experiment_empty_db(
     db_session: AsyncSession,
@@ -492,6 +806,161 @@ async def test_remove_db_tag_from_experiment(
     assert "Tag1" not in in_db_experiment_tags
 
 
+@pytest.mark.asyncio
+async def test_archived_flag_follows_archived_tag(
+    db_session: AsyncSession, experiments_data: List[ExperimentCreate]
+):
+    """Test the archived flag is kept in sync with the archived tag"""
+
+    db_user = orm.User(uuid=UUID(int=0), username=settings.default_username)
+    db_session.add(db_user)
+
+    for experiment in experiments_data:
+        db_experiment = experiment_model_to_orm(experiment)
+        db_experiment.created_by_user = db_user
+        db_session.add(db_experiment)
+
+    await db_session.commit()
+
+    user_info = UserInfo(uuid=uuid4(), username=settings.default_username, scopes=set(UserScope))
+    experiment_uuid = experiments_data[0].uuid
+
+    async def is_archived() -> bool:
+        statement = select(orm.Experiment.archived).filter(orm.Experiment.uuid == experiment_uuid)
+        return (await db_session.execute(statement)).scalar_one()
+
+    async def listed_uuids(**kwargs) -> List[UUID]:
+        experiments, _ = await get_all_experiments(
+            user_info=user_info, db_session=db_session, **kwargs
+        )
+        return [item.uuid for item in experiments]
+
+    assert not await is_archived()
+
+    await add_tags_to_experiment(
+        user_info=user_info,
+        db_session=db_session,
+        experiment_uuid=experiment_uuid,
+        tags=[ARCHIVED],
+    )
+    assert await is_archived()
+    assert experiment_uuid not in await listed_uuids()
+    assert await listed_uuids(should_include_tags=[ARCHIVED]) == [experiment_uuid]
+
+    await remove_tag_from_experiment(
+        user_info=user_info,
+        db_session=db_session,
+        experiment_uuid=experiment_uuid,
+        tag=ARCHIVED,
+    )
+    assert not await is_archived()
+    assert experiment_uuid in await listed_uuids()
+
+    created = await create_experiment(
+        user_info=user_info,
+        db_session=db_session,
+        title="Archived on creation",
+        description="",
+        tags=[ARCHIVED],
+    )
+    assert created.uuid not in await listed_uuids()
+
+
+@pytest.mark.asyncio
+async def test_update_experiments_tags(db_session: AsyncSession):
+    """Test update_experiments_tags adds and removes tags of many experiments at once"""
+
+    user_info = UserInfo(uuid=uuid4(), username=settings.default_username, scopes=set(UserScope))
+    experiments = [
+        await create_experiment(
+            user_info=user_info, db_session=db_session, title="Title", description="", tags=tags
+        )
+        for tags in (["alpha"], ["alpha", "beta"], [])
+    ]
+    others_experiment = await create_experiment(
+        user_info=UserInfo(uuid=uuid4(), username="other", scopes=set(UserScope)),
+        db_session=db_session,
+        title="Title",
+        description="",
+        tags=[],
+    )
+    uuids = [experiment.uuid for experiment in experiments]
+
+    # the loaded experiment is refreshed after the update.
+    await get_experiment_by_uuid(
+        user_info=user_info, db_session=db_session, experiment_uuid=uuids[0]
+    )
+
+    updated = await update_experiments_tags(
+        user_info=user_info,
+        db_session=db_session,
+        experiment_uuids=uuids + [uuid4()],
+        add_tags=["Gamma", ARCHIVED],
+        remove_tags=["alpha"],
+    )
+    assert set(updated) == set(uuids)
+
+    for experiment_uuid in uuids:
+        experiment = await get_experiment_by_uuid(
+            user_info=user_info, db_session=db_session, experiment_uuid=experiment_uuid
+        )
+        tag_keys = {tag.key for tag in experiment.tags}
+        assert "alpha" not in tag_keys
+        assert {"gamma", ARCHIVED} <= tag_keys
+
+    archived = await db_session.execute(
+        select(orm.Experiment.archived).filter(orm.Experiment.uuid.in_(uuids))
+    )
+    assert all(archived.scalars().all())
+
+    tags, _ = await get_tags_page(user_info=user_info, db_session=db_session)
+    assert {tag.key: tag.experiments_count for tag in tags} == {
+        "beta": 1,
+        "gamma": 3,
+        ARCHIVED: 3,
+    }
+    assert next(tag.name for tag in tags if tag.key == "gamma") == "Gamma"
+
+    await update_experiments_tags(
+        user_info=user_info, db_session=db_session, experiment_uuids=uuids, remove_tags=[ARCHIVED]
+    )
+    archived = await db_session.execute(
+        select(orm.Experiment.archived).filter(orm.Experiment.uuid.in_(uuids))
+    )
+    assert not any(archived.scalars().all())
+
+    # users without permission to edit any experiment only update their own experiments.
+    restricted_user_info = UserInfo(
+        uuid=user_info.uuid,
+        username=settings.default_username,
+        scopes={UserScope.EXPERIMENT_EDIT_OWN},
+    )
+    updated = await update_experiments_tags(
+        user_info=restricted_user_info,
+        db_session=db_session,
+        experiment_uuids=[uuids[0], others_experiment.uuid],
+        add_tags=["delta"],
+    )
+    assert updated == [uuids[0]]
+
+    with pytest.raises(AQDPermission):
+        await update_experiments_tags(
+            user_info=UserInfo(uuid=user_info.uuid, username="viewer", scopes=set()),
+            db_session=db_session,
+            experiment_uuids=uuids,
+            add_tags=["delta"],
+        )
+
+    with pytest.raises(AQDValidationError):
+        await update_experiments_tags(
+            user_info=user_info,
+            db_session=db_session,
+            experiment_uuids=uuids,
+            add_tags=["beta"],
+            remove_tags=["Beta"],
+        )
+
+
 @pytest.mark.asyncio
 async def test_get_all_tags_dangling(
     db_session: AsyncSession, experiments_data: List[ExperimentCreate]
@@ -602,6 +1071,82 @@ async def test_get_all_tags_no_dangling(
     assert set([item.name for item in tags]) == set([item.name for item in tags_expected])
 
 
+@pytest.mark.asyncio
+async def test_get_tags_page_with_experiments_count(
+    db_session: AsyncSession, experiments_data: List[ExperimentCreate]
+):
+    """Test get_tags_page pages the tags and keeps the experiments count of each tag"""
+
+    user_info = UserInfo(uuid=uuid4(), username=settings.default_username, scopes=set(UserScope))
+    first = await create_experiment(
+        user_info=user_info,
+        db_session=db_session,
+        title="First",
+        description="",
+        tags=["alpha", "beta"],
+    )
+    second = await create_experiment(
+        user_info=user_info,
+        db_session=db_session,
+        title="Second",
+        description="",
+        tags=["beta"],
+    )
+    db_session.add(orm.Tag(key="dangling", name="Dangling"))
+    await db_session.commit()
+
+    async def counts(**kwargs):
+        tags, total = await get_tags_page(user_info=user_info, db_session=db_session, **kwargs)
+        return {tag.key: tag.experiments_count for tag in tags}, total
+
+    assert await counts() == ({"alpha": 1, "beta": 2}, 2)
+    assert await counts(include_dangling=True) == ({"alpha": 1, "beta": 2, "dangling": 0}, 3)
+    assert await counts(include_dangling=True, offset=1, limit=1) == ({"beta": 2}, 3)
+
+    await add_tags_to_experiment(
+        user_info=user_info, db_session=db_session, experiment_uuid=second.uuid, tags=["alpha"]
+    )
+    assert await counts() == ({"alpha": 2, "beta": 2}, 2)
+
+    await remove_tag_from_experiment(
+        user_info=user_info, db_session=db_session, experiment_uuid=first.uuid, tag="beta"
+    )
+    assert await counts() == ({"alpha": 2, "beta": 1}, 2)
+
+    await remove_experiment(user_info=user_info, db_session=db_session, experiment_uuid=second.uuid)
+    assert await counts() == ({"alpha": 1}, 1)
+
+    # experiments deleted through the session are removed from the counts of their tags,
+    # even if the tags were not loaded.
+    db_session.expunge_all()
+    experiment = await db_session.get(orm.Experiment, first.uuid)
+    await db_session.delete(experiment)
+    await db_session.commit()
+    assert await counts() == ({}, 0)
+
+
+@pytest.mark.asyncio
+async def test_get_tags_page_prefix_ordered_by_usage(db_session: AsyncSession):
+    """Test get_tags_page autocompletes tag keys by prefix, most used first"""
+
+    user_info = UserInfo(uuid=uuid4(), username=settings.default_username, scopes=set(UserScope))
+    for tags in (["lab_a", "lab-b"], ["lab-b", "labxa"], ["lab-b", "laser"], ["LabC"]):
+        await create_experiment(
+            user_info=user_info, db_session=db_session, title="Title", description="", tags=tags
+        )
+
+    tags, total = await get_tags_page(
+        user_info=user_info, db_session=db_session, prefix="Lab", order_by_usage=True, limit=3
+    )
+    assert total == 4
+    assert [tag.key for tag in tags] == ["lab-b", "lab_a", "labc"]
+
+    # underscores are matched literally.
+    tags, total = await get_tags_page(user_info=user_info, db_session=db_session, prefix="lab_")
+    assert total == 1
+    assert [tag.key for tag in tags] == ["lab_a"]
+
+
 @pytest.mark.asyncio
 async def test_add_and_get_tags_for_experiment(
     db_session: AsyncSession, experiments_data: List[ExperimentCreate]
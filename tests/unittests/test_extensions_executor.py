@@ -1,5 +1,15 @@
+import asyncio
+import os
+import shutil
+import threading
+from pathlib import Path
+from unittest import mock
+
 import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
 
+from aqueductcore.backend import main
 from aqueductcore.backend.errors import AQDValidationError
 from aqueductcore.backend.services.extensions import (
     Extension,
@@ -7,7 +17,15 @@ from aqueductcore.backend.services.extensions import (
     ExtensionParameter,
     SupportedTypes,
 )
-from aqueductcore.backend.services.extensions_executor import ExtensionsExecutor
+from aqueductcore.backend.services import extensions_executor
+from aqueductcore.backend.services.extensions_executor import (
+    SHARED_VENV_MARKER,
+    VENV_FOLDER,
+    VENV_READY_MARKER,
+    ExtensionsExecutor,
+    VenvStatus,
+)
+from aqueductcore.backend.settings import settings
 
 
 def test_list_extensions_ok():
@@ -173,3 +191,285 @@ def test_validate_values_raises(value):
 )
 def test_extension_validation_ok(extension):
     extension.validate_object()
+
+
+MANIFEST_TEMPLATE = """
+name: "{name}"
+description: "Extension for caching tests"
+authors: "aqueduct"
+aqueduct_url: "http://localhost"
+actions:
+  - name: "echo"
+    description: "Echo the experiment"
+    script: "echo $experiment"
+    parameters:
+      - name: "experiment"
+        description: "experiment"
+        data_type: "experiment"
+"""
+
+
+def test_list_extensions_cached(monkeypatch, tmp_path):
+    for name in ("first", "second"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "manifest.yml").write_text(MANIFEST_TEMPLATE.format(name=name))
+    monkeypatch.setattr(settings, "extensions_dir_path", str(tmp_path))
+
+    with mock.patch.object(
+        Extension, "from_folder", side_effect=Extension.from_folder
+    ) as from_folder:
+        assert [item.name for item in ExtensionsExecutor.list_extensions()] == [
+            "first",
+            "second",
+        ]
+        assert from_folder.call_count == 2
+
+        ExtensionsExecutor.list_extensions()
+        extension = ExtensionsExecutor.get_extension("first")
+        extension.aqueduct_api_token = "token"
+        assert from_folder.call_count == 2
+        assert extension.folder == (tmp_path / "first").resolve()
+        assert ExtensionsExecutor.get_extension("first").aqueduct_api_token is None
+
+        manifest = tmp_path / "first" / "manifest.yml"
+        manifest.write_text(MANIFEST_TEMPLATE.format(name="first renamed"))
+        with pytest.raises(AQDValidationError):
+            ExtensionsExecutor.get_extension("first")
+        assert ExtensionsExecutor.get_extension("first renamed").name == "first renamed"
+        assert from_folder.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_venv_provisioning_in_background(monkeypatch, tmp_path):
+    (tmp_path / "first").mkdir()
+    (tmp_path / "first" / "manifest.yml").write_text(MANIFEST_TEMPLATE.format(name="first"))
+    monkeypatch.setattr(settings, "extensions_dir_path", str(tmp_path))
+    monkeypatch.setattr(ExtensionsExecutor, "_venv_futures", {})
+
+    started, release = threading.Event(), threading.Event()
+    python = tmp_path / "first" / "python"
+
+    def create_venv(extension: str) -> Path:
+        started.set()
+        release.wait(timeout=5)
+        return python
+
+    monkeypatch.setattr(ExtensionsExecutor, "create_venv_python_if_not_present", create_venv)
+
+    assert ExtensionsExecutor.venv_status("first") == VenvStatus.MISSING
+    ExtensionsExecutor.start_venvs_provisioning()
+    try:
+        assert started.wait(timeout=5)
+        assert ExtensionsExecutor.venv_status("first") == VenvStatus.PROVISIONING
+
+        waiter = asyncio.ensure_future(ExtensionsExecutor.wait_for_venv("first"))
+        # the event loop is not blocked while the environment is provisioned.
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        release.set()
+        assert await asyncio.wait_for(waiter, timeout=5) == python
+        assert ExtensionsExecutor.venv_status("first") == VenvStatus.READY
+    finally:
+        release.set()
+        ExtensionsExecutor.stop_venvs_provisioning()
+
+
+@pytest.mark.asyncio
+async def test_venv_provisioning_failure(monkeypatch, tmp_path):
+    (tmp_path / "first").mkdir()
+    (tmp_path / "first" / "manifest.yml").write_text(MANIFEST_TEMPLATE.format(name="first"))
+    monkeypatch.setattr(settings, "extensions_dir_path", str(tmp_path))
+    monkeypatch.setattr(ExtensionsExecutor, "_venv_futures", {})
+
+    def create_venv(extension: str) -> Path:
+        raise OSError("no space left")
+
+    monkeypatch.setattr(ExtensionsExecutor, "create_venv_python_if_not_present", create_venv)
+
+    try:
+        with pytest.raises(AQDValidationError):
+            await ExtensionsExecutor.wait_for_venv("first")
+        assert ExtensionsExecutor.venv_status("first") == VenvStatus.FAILED
+
+        # failed provisioning is retried.
+        monkeypatch.setattr(
+            ExtensionsExecutor, "create_venv_python_if_not_present", lambda extension: Path()
+        )
+        assert await ExtensionsExecutor.wait_for_venv("first") == Path()
+    finally:
+        ExtensionsExecutor.stop_venvs_provisioning()
+
+
+def test_venv_provisioning_across_processes(monkeypatch, tmp_path):
+    (tmp_path / "first").mkdir()
+    (tmp_path / "first" / "manifest.yml").write_text(MANIFEST_TEMPLATE.format(name="first"))
+    (tmp_path / "first" / "requirements.txt").write_text("numpy")
+    monkeypatch.setattr(settings, "extensions_dir_path", str(tmp_path))
+    monkeypatch.setattr(settings, "extensions_shared_venvs_dir_path", None)
+
+    created, installing, release = [], threading.Event(), threading.Event()
+
+    def create_venv(env_dir, **kwargs):
+        created.append(Path(env_dir))
+        (Path(env_dir) / "bin").mkdir(parents=True)
+
+    def install_requirements(extension, python):
+        installing.set()
+        return release.wait(timeout=5)
+
+    monkeypatch.setattr(extensions_executor.venv, "create", create_venv)
+    monkeypatch.setattr(ExtensionsExecutor, "try_install_requirements_txt", install_requirements)
+
+    # the lock is taken through its own file, like by another server process.
+    first = threading.Thread(
+        target=ExtensionsExecutor.create_venv_python_if_not_present, args=("first",)
+    )
+    first.start()
+    try:
+        assert installing.wait(timeout=5)
+        assert not ExtensionsExecutor.is_venv_present("first")
+
+        second = threading.Thread(
+            target=ExtensionsExecutor.create_venv_python_if_not_present, args=("first",)
+        )
+        second.start()
+        second.join(timeout=0.1)
+        assert second.is_alive()
+    finally:
+        release.set()
+        first.join(timeout=5)
+    second.join(timeout=5)
+
+    assert len(created) == 1
+    assert ExtensionsExecutor.is_venv_present("first")
+
+    # a failed environment is removed, leaving no partial environment behind.
+    (tmp_path / "first" / "requirements.txt").write_text("scipy")
+    monkeypatch.setattr(
+        ExtensionsExecutor, "try_install_requirements_txt", lambda extension, python: False
+    )
+    (tmp_path / "first" / VENV_FOLDER / VENV_READY_MARKER).unlink()
+    with pytest.raises(AQDValidationError):
+        ExtensionsExecutor.create_venv_python_if_not_present("first")
+    assert not (tmp_path / "first" / VENV_FOLDER).exists()
+
+
+def test_shared_venvs(monkeypatch, tmp_path):
+    extensions_dir, shared_dir = tmp_path / "extensions", tmp_path / "venvs"
+    extensions_dir.mkdir()
+    for name, requirements in (("first", "numpy"), ("second", "numpy"), ("third", "scipy")):
+        (extensions_dir / name).mkdir()
+        (extensions_dir / name / "manifest.yml").write_text(MANIFEST_TEMPLATE.format(name=name))
+        (extensions_dir / name / "requirements.txt").write_text(requirements)
+    monkeypatch.setattr(settings, "extensions_dir_path", str(extensions_dir))
+    monkeypatch.setattr(settings, "extensions_shared_venvs_dir_path", str(shared_dir))
+
+    created = []
+
+    def create_venv(env_dir, **kwargs):
+        created.append(Path(env_dir))
+        (Path(env_dir) / "bin").mkdir(parents=True)
+
+    monkeypatch.setattr(extensions_executor.venv, "create", create_venv)
+    monkeypatch.setattr(
+        ExtensionsExecutor, "try_install_requirements_txt", lambda extension, python: True
+    )
+
+    pythons = {
+        name: ExtensionsExecutor.create_venv_python_if_not_present(name)
+        for name in ("first", "second", "third")
+    }
+    assert len(created) == 2
+    assert pythons["first"] == extensions_dir / "first" / VENV_FOLDER / "bin/python"
+    assert (extensions_dir / "first" / VENV_FOLDER).resolve() == (
+        extensions_dir / "second" / VENV_FOLDER
+    ).resolve()
+    assert (extensions_dir / "third" / VENV_FOLDER).resolve() != (
+        extensions_dir / "first" / VENV_FOLDER
+    ).resolve()
+
+    # changed requirements are provisioned in a new environment.
+    (extensions_dir / "third" / "requirements.txt").write_text("numpy")
+    ExtensionsExecutor.create_venv_python_if_not_present("third")
+    assert len(created) == 2
+    assert (extensions_dir / "third" / VENV_FOLDER).resolve() == (
+        extensions_dir / "first" / VENV_FOLDER
+    ).resolve()
+
+    # only unused environments are evicted, after they expire.
+    assert ExtensionsExecutor.evict_shared_venvs() == []
+    monkeypatch.setattr(settings, "extensions_shared_venvs_ttl_hours", 1)
+    for marker in shared_dir.glob(f"*/{SHARED_VENV_MARKER}"):
+        os.utime(marker, (0, 0))
+    assert ExtensionsExecutor.evict_shared_venvs() == [created[1].resolve()]
+    assert (extensions_dir / "first" / VENV_FOLDER).resolve().exists()
+    assert not created[1].with_suffix(".lock").exists()
+    assert created[0].with_suffix(".lock").exists()
+
+    # running an extension records the use of its environment.
+    marker = created[0] / SHARED_VENV_MARKER
+    os.utime(marker, (0, 0))
+    ExtensionsExecutor._touch_shared_venv("first")
+    assert marker.stat().st_mtime > 0
+
+
+def test_shared_venv_provisioned_again(monkeypatch, tmp_path):
+    extensions_dir, shared_dir = tmp_path / "extensions", tmp_path / "venvs"
+    (extensions_dir / "first").mkdir(parents=True)
+    (extensions_dir / "first" / "manifest.yml").write_text(MANIFEST_TEMPLATE.format(name="first"))
+    (extensions_dir / "first" / "requirements.txt").write_text("numpy")
+    monkeypatch.setattr(settings, "extensions_dir_path", str(extensions_dir))
+    monkeypatch.setattr(settings, "extensions_shared_venvs_dir_path", str(shared_dir))
+    monkeypatch.setattr(ExtensionsExecutor, "_venv_futures", {})
+
+    created = []
+
+    def create_venv(env_dir, **kwargs):
+        created.append(Path(env_dir))
+        (Path(env_dir) / "bin").mkdir(parents=True)
+
+    monkeypatch.setattr(extensions_executor.venv, "create", create_venv)
+    monkeypatch.setattr(
+        ExtensionsExecutor, "try_install_requirements_txt", lambda extension, python: True
+    )
+
+    try:
+        future = ExtensionsExecutor.provision_venv("first")
+        future.result(timeout=5)
+        assert ExtensionsExecutor.provision_venv("first") is future
+
+        # changed requirements are linked to another environment.
+        (extensions_dir / "first" / "requirements.txt").write_text("scipy")
+        future = ExtensionsExecutor.provision_venv("first")
+        future.result(timeout=5)
+        assert len(created) == 2
+        assert (extensions_dir / "first" / VENV_FOLDER).resolve() == created[1].resolve()
+
+        # an evicted environment is created again.
+        shutil.rmtree(created[1])
+        future = ExtensionsExecutor.provision_venv("first")
+        future.result(timeout=5)
+        assert len(created) == 3
+        assert ExtensionsExecutor.provision_venv("first") is future
+    finally:
+        ExtensionsExecutor.stop_venvs_provisioning()
+
+
+def test_app_startup_with_cold_extensions_cache(monkeypatch, tmp_path):
+    (tmp_path / "first").mkdir()
+    (tmp_path / "first" / "manifest.yml").write_text(MANIFEST_TEMPLATE.format(name="first"))
+    monkeypatch.setattr(settings, "extensions_dir_path", str(tmp_path))
+    monkeypatch.setattr(ExtensionsExecutor, "_manifests", {})
+    monkeypatch.setattr(ExtensionsExecutor, "_index", {})
+    monkeypatch.setattr(ExtensionsExecutor, "_venv_futures", {})
+    monkeypatch.setattr(main, "async_engine", create_async_engine("sqlite+aiosqlite:///:memory:"))
+
+    python = tmp_path / "first" / "python"
+    monkeypatch.setattr(
+        ExtensionsExecutor, "create_venv_python_if_not_present", lambda extension: python
+    )
+
+    with TestClient(main.app):
+        future = ExtensionsExecutor._venv_futures[(tmp_path / "first").resolve()]
+        assert future.result(timeout=5) == python
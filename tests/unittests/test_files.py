@@ -1,8 +1,14 @@
 # pylint: skip-file
+import asyncio
+import io
 import os
 import shutil
+import tarfile
+import threading
+import time
+import zipfile
 from tempfile import TemporaryDirectory
-from typing import AsyncGenerator, List, Tuple
+from typing import AsyncGenerator, Dict, List, Tuple
 from uuid import UUID, uuid4
 
 import pytest
@@ -17,10 +23,23 @@ from aqueductcore.backend.context import (
     UserScope,
     context_dependency,
 )
-from aqueductcore.backend.main import app
+from aqueductcore.backend.main import ExcludedPathsGZipMiddleware, app
 from aqueductcore.backend.models import orm
 from aqueductcore.backend.models.experiment import ExperimentCreate
 from aqueductcore.backend.services.experiment import build_experiment_dir_absolute_path
+from aqueductcore.backend.errors import AQDArchiveError
+from aqueductcore.backend.routers import files as files_router
+from aqueductcore.backend.models.upload import ArchiveFormat
+from aqueductcore.backend.services.upload import (
+    ArchiveExtractor,
+    UploadWriter,
+    build_upload_dir_absolute_path,
+    create_upload,
+    extract_archive,
+    get_upload,
+    record_upload_range,
+    remove_expired_uploads,
+)
 from aqueductcore.backend.services.utils import (
     experiment_model_to_orm,
     format_list_human_readable,
@@ -90,6 +109,111 @@ async def test_file_download(
     assert response.content == experiment_files[2]
 
 
+@pytest.mark.asyncio
+async def test_file_download_ranges_and_conditions(
+    client: TestClient,
+    db_session: AsyncSession,
+    experiment_files: Tuple[str, str, bytes],
+    experiments_data: List[ExperimentCreate],
+):
+    db_user = orm.User(uuid=UUID(int=0), username=settings.default_username)
+    db_session.add(db_user)
+
+    db_experiment = experiment_model_to_orm(experiments_data[0])
+    db_experiment.created_by_user = db_user
+    db_session.add(db_experiment)
+    await db_session.commit()
+
+    async def override_context_dependency() -> AsyncGenerator[ServerContext, None]:
+        yield ServerContext(
+            db_session=db_session,
+            user_info=UserInfo(
+                uuid=uuid4(), username=settings.default_username, scopes=set(UserScope)
+            ),
+        )
+
+    app.dependency_overrides[context_dependency] = override_context_dependency
+
+    file_url = (
+        f"{settings.api_prefix}{settings.files_route_prefix}/"
+        f"{str(experiment_files[0])}/{experiment_files[1]}"
+    )
+    test_data = experiment_files[2]
+    file_size = len(test_data)
+
+    response = client.get(file_url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["accept-ranges"] == "bytes"
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+
+    response = client.get(file_url, headers={"Range": "bytes=100-199"})
+    assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+    assert response.headers["content-range"] == f"bytes 100-199/{file_size}"
+    assert response.content == test_data[100:200]
+
+    response = client.get(file_url, headers={"Range": "bytes=-10"})
+    assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+    assert response.content == test_data[-10:]
+
+    response = client.get(file_url, headers={"Range": f"bytes={file_size - 5}-"})
+    assert response.content == test_data[-5:]
+
+    response = client.get(file_url, headers={"Range": "bytes=0-1, 10-12"})
+    assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+    content_type = response.headers["content-type"]
+    assert content_type.startswith("multipart/byteranges; boundary=")
+    boundary = content_type.split("boundary=")[1]
+    assert int(response.headers["content-length"]) == len(response.content)
+    parts = response.content.split(f"--{boundary}".encode())
+    assert parts[-1] == b"--\r\n"
+    assert parts[1].endswith(b"\r\n\r\n" + test_data[0:2] + b"\r\n")
+    assert f"Content-Range: bytes 10-12/{file_size}".encode() in parts[2]
+    assert parts[2].endswith(test_data[10:13] + b"\r\n")
+
+    response = client.get(file_url, headers={"Range": f"bytes={file_size}-"})
+    assert response.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+    assert response.headers["content-range"] == f"bytes */{file_size}"
+
+    # invalid ranges are ignored.
+    response = client.get(file_url, headers={"Range": "bytes=20-10"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == test_data
+
+    response = client.get(file_url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    response = client.get(file_url, headers={"If-Modified-Since": last_modified})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    response = client.get(file_url, headers={"If-None-Match": '"outdated"'})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == test_data
+
+    response = client.get(file_url, headers={"Range": "bytes=0-9", "If-Range": etag})
+    assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+    assert response.content == test_data[:10]
+
+    response = client.get(file_url, headers={"Range": "bytes=0-9", "If-Range": '"outdated"'})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.content == test_data
+
+    # files are not compressed, as the ranges and the ETag refer to the stored file.
+    gzip_client = TestClient(
+        ExcludedPathsGZipMiddleware(
+            app,
+            minimum_size=1,
+            excluded_path_prefixes=[f"{settings.api_prefix}{settings.files_route_prefix}/"],
+        )
+    )
+    for headers in ({}, {"Range": "bytes=0-9"}):
+        response = gzip_client.get(file_url, headers={"Accept-Encoding": "gzip", **headers})
+        assert "content-encoding" not in response.headers
+        assert response.headers["etag"] == etag
+
+
 @pytest.mark.asyncio
 async def test_nonexisting_file_download(
     client: TestClient,
@@ -409,7 +533,8 @@ async def test_file_upload_invalid_filename(
     app.dependency_overrides[context_dependency] = override_context_dependency
 
     experiment_file_name = "test_upload_file.zip"
-    invalid_filename = 'fi:l*e/p"a?t>h|.t<xt'
+    # paths, names made of dots and names reserved for the experiment directories.
+    invalid_filenames = ['fi:l*e/p"a?t>h|.t<xt', "..", ".tasks", ".uploads"]
 
     with TemporaryDirectory() as tmpdirname:
         test_data = bytes(bytearray(os.urandom(settings.upload_max_file_size_KB * BYTES_IN_KB)))
@@ -417,14 +542,22 @@ async def test_file_upload_invalid_filename(
         with open(upload_file_path, mode="wb") as file_writer:
             file_writer.write(test_data)
 
-        response = client.post(
-            f"{settings.api_prefix}{settings.files_route_prefix}/{str(db_experiment.uuid)}",
-            files={"file": open(upload_file_path, "rb")},
-            headers={"file_name": invalid_filename},
-        )
+        for invalid_filename in invalid_filenames:
+            response = client.post(
+                f"{settings.api_prefix}{settings.files_route_prefix}/{str(db_experiment.uuid)}",
+                files={"file": open(upload_file_path, "rb")},
+                headers={"file_name": invalid_filename},
+            )
 
-        assert response.status_code == status.HTTP_400_BAD_REQUEST
-        assert "Invalid file name." in response.json()["detail"]
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+            assert "Invalid file name." in response.json()["detail"]
+
+            response = client.post(
+                f"{settings.api_prefix}{settings.files_route_prefix}/{str(db_experiment.uuid)}"
+                "/uploads",
+                json={"file_name": invalid_filename, "size": 1},
+            )
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
 @pytest.mark.asyncio
@@ -686,3 +819,504 @@ async def test_file_delete_non_existing_file(
     )
     assert response.status_code == status.HTTP_409_CONFLICT
     assert response.json() == {"detail": f"File(s) not found - {non_existing_file}"}
+
+
+@pytest.mark.asyncio
+async def test_upload_writer_consumes_in_worker_thread():
+    consumed: List[bytes] = []
+    consumer_threads = set()
+    max_pending = 2
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def consumer(data: bytes):
+        nonlocal in_flight
+        consumer_threads.add(threading.get_ident())
+        time.sleep(0.01)
+        consumed.append(data)
+        with lock:
+            in_flight -= 1
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    ticker_task = asyncio.ensure_future(ticker())
+    try:
+        async with UploadWriter(consumer, max_pending=max_pending) as writer:
+            for index in range(10):
+                with lock:
+                    in_flight += 1
+                    max_in_flight = max(max_in_flight, in_flight)
+                await writer.write(bytes([index]))
+    finally:
+        ticker_task.cancel()
+
+    assert consumed == [bytes([index]) for index in range(10)]
+    assert threading.get_ident() not in consumer_threads
+    # writing waits for the worker when too much data is queued.
+    assert max_in_flight <= max_pending + 1
+    # the event loop keeps running while the data is consumed.
+    assert ticks > 10
+
+
+@pytest.mark.asyncio
+async def test_upload_writers_share_workers():
+    consumed: Dict[int, List[bytes]] = {0: [], 1: [], 2: []}
+    consuming = {index: threading.Lock() for index in consumed}
+    thread_names = set()
+
+    def build_consumer(index: int):
+        def consumer(data: bytes):
+            # the data of an upload is consumed by one worker at a time.
+            assert consuming[index].acquire(blocking=False)
+            thread_names.add(threading.current_thread().name)
+            time.sleep(0.001)
+            consumed[index].append(data)
+            consuming[index].release()
+
+        return consumer
+
+    async def upload(index: int):
+        async with UploadWriter(build_consumer(index), max_pending=4) as writer:
+            for value in range(50):
+                await writer.write(bytes([value]))
+
+    await asyncio.gather(*(upload(index) for index in consumed))
+
+    for index in consumed:
+        assert consumed[index] == [bytes([value]) for value in range(50)]
+    assert all(name.startswith("upload-writer") for name in thread_names)
+    assert len(thread_names) <= settings.upload_max_workers
+
+
+@pytest.mark.asyncio
+async def test_upload_writer_raises_consumer_errors():
+    consumed: List[bytes] = []
+
+    def consumer(data: bytes):
+        if data == b"invalid":
+            raise ValueError(data)
+        time.sleep(0.01)
+        consumed.append(data)
+
+    with pytest.raises(ValueError):
+        async with UploadWriter(consumer, max_pending=1) as writer:
+            for data in (b"valid", b"invalid", b"dropped", b"dropped"):
+                await writer.write(data)
+
+    assert consumed == [b"valid"]
+
+
+@pytest.mark.asyncio
+async def test_upload_writer_stops_after_consumer_error():
+    consumed: List[bytes] = []
+
+    def consumer(data: bytes):
+        if data == b"B":
+            raise OSError("disk full")
+        time.sleep(0.01)
+        consumed.append(data)
+
+    writer = UploadWriter(consumer, max_pending=4)
+    with pytest.raises(OSError):
+        for data in (b"A", b"B", b"C", b"D", b"E", b"F", b"G"):
+            await writer.write(data)
+        await writer.flush()
+
+    # nothing is consumed after the failed buffer, and writing more data fails right away.
+    with pytest.raises(OSError):
+        await writer.write(b"H")
+    await writer.close()
+    assert consumed == [b"A"]
+
+
+@pytest.mark.asyncio
+async def test_upload_writer_buffers_chunks():
+    consumed: List[bytes] = []
+    large_chunk = b"x" * 8
+
+    async with UploadWriter(consumed.append, max_pending=1, buffer_size=4) as writer:
+        for chunk in (b"a", b"bc", b"d", large_chunk, b"ef"):
+            await writer.write(chunk)
+
+    assert consumed == [b"abcd", large_chunk, b"ef"]
+    # chunks reaching the buffer size on their own are not copied.
+    assert consumed[1] is large_chunk
+
+
+@pytest.mark.asyncio
+async def test_resumable_file_upload(
+    client: TestClient,
+    db_session: AsyncSession,
+    experiments_data: List[ExperimentCreate],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    db_user = orm.User(uuid=UUID(int=0), username=settings.default_username)
+    db_session.add(db_user)
+
+    db_experiment = experiment_model_to_orm(experiments_data[0])
+    db_experiment.created_by_user = db_user
+    db_session.add(db_experiment)
+    await db_session.commit()
+
+    async def override_context_dependency() -> AsyncGenerator[ServerContext, None]:
+        yield ServerContext(
+            db_session=db_session,
+            user_info=UserInfo(
+                uuid=uuid4(), username=settings.default_username, scopes=set(UserScope)
+            ),
+        )
+
+    app.dependency_overrides[context_dependency] = override_context_dependency
+
+    experiment_file_name = "test_resumable_upload.bin"
+    test_data = os.urandom(10 * BYTES_IN_KB)
+    uploads_url = (
+        f"{settings.api_prefix}{settings.files_route_prefix}/{str(db_experiment.uuid)}/uploads"
+    )
+
+    response = client.post(
+        uploads_url, json={"file_name": experiment_file_name, "size": len(test_data)}
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    upload_id = response.json()["upload_id"]
+    upload_url = f"{uploads_url}/{upload_id}"
+
+    # chunks are sent out of order, and a chunk is sent partially.
+    response = client.put(upload_url, params={"offset": 6000}, content=test_data[6000:])
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"start": 6000, "end": len(test_data)}
+    response = client.put(upload_url, params={"offset": 0}, content=test_data[:2000])
+    assert response.status_code == status.HTTP_200_OK
+
+    response = client.get(upload_url)
+    assert response.json()["received_ranges"] == [[0, 2000], [6000, len(test_data)]]
+
+    response = client.post(f"{upload_url}/complete")
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    response = client.put(upload_url, params={"offset": 1000}, content=test_data[1000:6000])
+    assert response.status_code == status.HTTP_200_OK
+    response = client.get(upload_url)
+    assert response.json()["received_ranges"] == [[0, len(test_data)]]
+
+    response = client.put(upload_url, params={"offset": 9000}, content=test_data[:2000])
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    response = client.put(upload_url, params={"offset": len(test_data) + 1}, content=b"0")
+    assert response.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+
+    response = client.post(f"{upload_url}/complete")
+    assert response.status_code == status.HTTP_200_OK
+
+    experiment_dir = build_experiment_dir_absolute_path(
+        str(settings.experiments_dir_path), db_experiment.uuid
+    )
+    with open(os.path.join(experiment_dir, experiment_file_name), mode="rb") as file:
+        assert file.read() == test_data
+
+    response = client.get(upload_url)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = client.post(uploads_url, json={"file_name": experiment_file_name, "size": 1})
+    upload_url = f"{uploads_url}/{response.json()['upload_id']}"
+    response = client.delete(upload_url)
+    assert response.status_code == status.HTTP_200_OK
+    response = client.put(upload_url, params={"offset": 0}, content=b"0")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = client.post(
+        uploads_url,
+        json={"file_name": experiment_file_name, "size": settings.upload_max_file_size_KB * 1025},
+    )
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+    # the part of a chunk received before the client disconnects is kept.
+    response = client.post(uploads_url, json={"file_name": "interrupted", "size": 100})
+    upload_id = response.json()["upload_id"]
+    messages = [
+        {"type": "http.request", "body": b"0" * 40, "more_body": True},
+        {"type": "http.disconnect"},
+    ]
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        pass
+
+    upload_path = f"{uploads_url}/{upload_id}"
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "PUT",
+        "scheme": "http",
+        "path": upload_path,
+        "raw_path": upload_path.encode(),
+        "root_path": "",
+        "query_string": b"offset=10",
+        "headers": [],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    await app(scope, receive, send)
+    response = client.get(f"{uploads_url}/{upload_id}")
+    assert response.json()["received_ranges"] == [[10, 50]]
+
+    # only the data written before a write error is recorded.
+    response = client.post(uploads_url, json={"file_name": "failed", "size": 100})
+    failed_upload_url = f"{uploads_url}/{response.json()['upload_id']}"
+
+    class FailingFile:
+        def __init__(self, file):
+            self.file = file
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            self.file.close()
+
+        def seek(self, offset):
+            self.file.seek(offset)
+
+        def write(self, data):
+            if self.file.tell() >= 30:
+                raise OSError("No space left on device")
+            return self.file.write(data[:10])
+
+    open_upload_data = files_router.open_upload_data
+    monkeypatch.setattr(
+        files_router,
+        "open_upload_data",
+        lambda *args: FailingFile(open_upload_data(*args)),
+    )
+    with pytest.raises(OSError):
+        client.put(failed_upload_url, params={"offset": 0}, content=b"0" * 100)
+    monkeypatch.undo()
+    response = client.get(failed_upload_url)
+    assert response.json()["received_ranges"] == [[0, 30]]
+
+    # files which cannot be moved into the experiment directory are conflicts.
+    os.makedirs(os.path.join(experiment_dir, "interrupted"))
+    response = client.put(f"{uploads_url}/{upload_id}", params={"offset": 0}, content=b"0" * 100)
+    assert response.status_code == status.HTTP_200_OK
+    response = client.post(f"{uploads_url}/{upload_id}/complete")
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    shutil.rmtree(experiment_dir)
+
+
+def test_remove_expired_uploads(tmp_path):
+    experiment_uuid = uuid4()
+    experiment_dir = build_experiment_dir_absolute_path(str(tmp_path), experiment_uuid)
+    expired_upload = create_upload(experiment_dir, "expired", 10)
+    active_upload = create_upload(experiment_dir, "active", 10)
+    record_upload_range(experiment_dir, active_upload.upload_id, 0, 5)
+
+    expired_upload_dir = build_upload_dir_absolute_path(experiment_dir, expired_upload.upload_id)
+    expired_time = time.time() - 3600
+    for directory, _, file_names in os.walk(expired_upload_dir):
+        for path in [directory] + [os.path.join(directory, name) for name in file_names]:
+            os.utime(path, (expired_time, expired_time))
+
+    removed = remove_expired_uploads(str(tmp_path), max_age=60)
+
+    assert removed == [expired_upload_dir]
+    assert not os.path.exists(expired_upload_dir)
+    assert get_upload(experiment_dir, active_upload.upload_id).received_ranges == [(0, 5)]
+
+
+def build_tar_archive(files: Dict[str, bytes], compression: str = "") -> bytes:
+    archive_data = io.BytesIO()
+    with tarfile.open(fileobj=archive_data, mode=f"w:{compression}") as archive:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+    return archive_data.getvalue()
+
+
+def build_zip_archive(files: Dict[str, bytes]) -> bytes:
+    archive_data = io.BytesIO()
+    with zipfile.ZipFile(archive_data, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+
+    return archive_data.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_archive_upload(
+    client: TestClient,
+    db_session: AsyncSession,
+    experiments_data: List[ExperimentCreate],
+    monkeypatch,
+):
+    db_user = orm.User(uuid=UUID(int=0), username=settings.default_username)
+    db_session.add(db_user)
+
+    db_experiment = experiment_model_to_orm(experiments_data[0])
+    db_experiment.created_by_user = db_user
+    db_session.add(db_experiment)
+    await db_session.commit()
+
+    async def override_context_dependency() -> AsyncGenerator[ServerContext, None]:
+        yield ServerContext(
+            db_session=db_session,
+            user_info=UserInfo(
+                uuid=uuid4(), username=settings.default_username, scopes=set(UserScope)
+            ),
+        )
+
+    app.dependency_overrides[context_dependency] = override_context_dependency
+
+    archive_url = (
+        f"{settings.api_prefix}{settings.files_route_prefix}/{str(db_experiment.uuid)}/archive"
+    )
+    experiment_dir = build_experiment_dir_absolute_path(
+        str(settings.experiments_dir_path), db_experiment.uuid
+    )
+
+    def experiment_files() -> Dict[str, bytes]:
+        files = {}
+        for name in os.listdir(experiment_dir):
+            if os.path.isfile(os.path.join(experiment_dir, name)):
+                with open(os.path.join(experiment_dir, name), mode="rb") as file:
+                    files[name] = file.read()
+        return files
+
+    tar_files = {f"run_{index}.bin": os.urandom(BYTES_IN_KB * index) for index in range(20)}
+    response = client.post(archive_url, content=build_tar_archive(tar_files, compression="gz"))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["file_names"] == sorted(tar_files)
+    assert experiment_files() == tar_files
+
+    zip_files = {"run_0.bin": b"replaced", "notes.md": b"# Notes"}
+    response = client.post(
+        archive_url, params={"archive_format": "zip"}, content=build_zip_archive(zip_files)
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert experiment_files() == {**tar_files, **zip_files}
+
+    # invalid archives are rejected without adding any of their files.
+    invalid_archives = [
+        build_tar_archive({"new.bin": b"new", "nested/run.bin": b"nested"}),
+        build_tar_archive({"new.bin": b"new", "../run.bin": b"outside"}),
+        build_tar_archive({"new.bin": b"new", ".tasks": b"reserved"}),
+        build_tar_archive({"new.bin": b"new", ".": b"dot"}),
+        build_tar_archive(
+            {"new.bin": b"new", "large.bin": b"0" * (settings.upload_max_file_size_KB + 1) * 1024}
+        ),
+        b"not an archive" * 1000,
+    ]
+    for archive in invalid_archives:
+        response = client.post(archive_url, content=archive)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert experiment_files() == {**tar_files, **zip_files}
+
+    response = client.post(archive_url, params={"archive_format": "zip"}, content=b"not an archive")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    # archives are rejected while all of the extraction workers are reserved.
+    monkeypatch.setattr(files_router, "archive_extractor", ArchiveExtractor(max_extractions=1))
+    with files_router.archive_extractor.reserve():
+        response = client.post(archive_url, content=build_tar_archive(tar_files))
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert "Retry-After" in response.headers
+    response = client.post(archive_url, content=build_tar_archive(tar_files))
+    assert response.status_code == status.HTTP_200_OK
+
+    shutil.rmtree(experiment_dir)
+
+
+def test_extract_archive_limits():
+    files = {f"run_{index}.bin": b"0" * 100 for index in range(5)}
+
+    with TemporaryDirectory() as tmpdirname:
+        with pytest.raises(AQDArchiveError, match="limit of 4 files"):
+            extract_archive(
+                io.BytesIO(build_tar_archive(files)),
+                ArchiveFormat.TAR,
+                tmpdirname,
+                max_files=4,
+                max_file_size=100,
+                max_size=500,
+            )
+
+    with TemporaryDirectory() as tmpdirname:
+        with pytest.raises(AQDArchiveError, match="size limits"):
+            extract_archive(
+                io.BytesIO(build_zip_archive(files)),
+                ArchiveFormat.ZIP,
+                tmpdirname,
+                max_files=5,
+                max_file_size=100,
+                max_size=499,
+            )
+
+    # members which cannot be read are rejected.
+    stored_archive = io.BytesIO()
+    with zipfile.ZipFile(stored_archive, mode="w") as archive:
+        archive.writestr("run_0.bin", files["run_0.bin"])
+    central_header = stored_archive.getvalue().find(b"PK\x01\x02")
+    for offsets, value, match in (
+        # compression method of the local and of the central headers.
+        ((8, central_header + 10), 99, "unsupported compression"),
+        # general purpose flags of the local and of the central headers.
+        ((6, central_header + 8), 0x1, "encrypted"),
+    ):
+        patched_archive = bytearray(stored_archive.getvalue())
+        for offset in offsets:
+            patched_archive[offset : offset + 2] = value.to_bytes(2, "little")
+        with TemporaryDirectory() as tmpdirname:
+            with pytest.raises(AQDArchiveError, match=match):
+                extract_archive(
+                    io.BytesIO(bytes(patched_archive)),
+                    ArchiveFormat.ZIP,
+                    tmpdirname,
+                    max_files=5,
+                    max_file_size=100,
+                    max_size=500,
+                )
+
+    # the checksum at the end of the gzip stream is verified.
+    corrupted_archive = bytearray(build_tar_archive(files, compression="gz"))
+    corrupted_archive[-8] ^= 0xFF
+    with TemporaryDirectory() as tmpdirname:
+        with pytest.raises(AQDArchiveError, match="invalid"):
+            extract_archive(
+                io.BytesIO(bytes(corrupted_archive)),
+                ArchiveFormat.TAR,
+                tmpdirname,
+                max_files=5,
+                max_file_size=100,
+                max_size=500,
+            )
+
+    with TemporaryDirectory() as tmpdirname:
+        assert extract_archive(
+            io.BytesIO(build_tar_archive(files, compression="gz")),
+            ArchiveFormat.TAR,
+            tmpdirname,
+            max_files=5,
+            max_file_size=100,
+            max_size=500,
+        ) == list(files)
+
+    with TemporaryDirectory() as tmpdirname:
+        assert extract_archive(
+            io.BytesIO(build_zip_archive(files)),
+            ArchiveFormat.ZIP,
+            tmpdirname,
+            max_files=5,
+            max_file_size=100,
+            max_size=500,
+        ) == list(files)
@@ -0,0 +1,219 @@
+# pylint: skip-file
+import asyncio
+import os
+from tempfile import TemporaryDirectory
+from uuid import uuid4
+
+import pytest
+from celery import Celery, states
+from sqlalchemy import event, select
+from sqlalchemy.engine import Engine
+
+from aqueductcore.backend.models import orm
+from aqueductcore.backend.services import task_executor
+from aqueductcore.backend.services.utils import task_orm_to_model
+from aqueductcore.backend.settings import settings
+
+
+@pytest.fixture()
+def results_backend_app(monkeypatch):
+    with TemporaryDirectory() as tmpdirname:
+        app = Celery(
+            "tasks",
+            backend=f"db+sqlite:///{os.path.join(tmpdirname, 'results.db')}",
+            result_extended=True,
+        )
+        monkeypatch.setattr(task_executor, "celery_app", app)
+        yield app
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_info_single_lookup(results_backend_app):
+    backend = results_backend_app.backend
+    success_id, failure_id, started_id, unknown_id = [str(uuid4()) for _ in range(4)]
+
+    backend.store_result(success_id, (0, "out", ""), states.SUCCESS)
+    backend.store_result(failure_id, ChildProcessError((1, "", "err")), states.FAILURE)
+    backend.store_result(started_id, None, states.STARTED)
+
+    lookups = []
+
+    def count_lookups(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "celery_taskmeta" in statement:
+            lookups.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", count_lookups)
+    try:
+        tasks_info = await task_executor._get_tasks_info(
+            [success_id, failure_id, started_id, unknown_id]
+        )
+    finally:
+        event.remove(Engine, "before_cursor_execute", count_lookups)
+
+    assert len(lookups) == 1
+    assert set(tasks_info) == {success_id, failure_id, started_id, unknown_id}
+
+    assert tasks_info[success_id].status == states.SUCCESS
+    assert tasks_info[success_id].result_code == 0
+    assert tasks_info[success_id].std_out == "out"
+    assert tasks_info[success_id].ended_at is not None
+
+    assert tasks_info[failure_id].status == states.FAILURE
+    assert tasks_info[failure_id].result_code == 1
+    assert tasks_info[failure_id].std_err == "err"
+
+    assert tasks_info[started_id].status == states.STARTED
+    assert tasks_info[started_id].result_code is None
+
+    assert tasks_info[unknown_id].status == states.PENDING
+    assert tasks_info[unknown_id].ended_at is None
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_info_empty(results_backend_app):
+    assert await task_executor._get_tasks_info([]) == {}
+
+
+@pytest.mark.asyncio
+async def test_resolve_tasks_info_persists_terminal_state(results_backend_app, db_session):
+    backend = results_backend_app.backend
+    user = orm.User(uuid=uuid4(), username="tester")
+    finished_task = orm.Task(
+        uuid=str(uuid4()),
+        extension_name="ext",
+        action_name="act",
+        created_by=user.uuid,
+    )
+    running_task = orm.Task(
+        uuid=str(uuid4()),
+        extension_name="ext",
+        action_name="act",
+        created_by=user.uuid,
+    )
+    db_session.add_all([user, finished_task, running_task])
+    await db_session.commit()
+
+    backend.store_result(finished_task.uuid, (0, "out", "err"), states.SUCCESS)
+    backend.store_result(running_task.uuid, None, states.STARTED)
+
+    tasks_info = await task_executor._resolve_tasks_info(
+        db_session=db_session, db_tasks=[finished_task, running_task]
+    )
+    assert tasks_info[running_task.uuid].status == states.STARTED
+    assert tasks_info[finished_task.uuid].status == states.SUCCESS
+    # the session of the caller is left untouched.
+    assert finished_task.status is None
+    assert not db_session.dirty
+
+    result = await db_session.execute(
+        select(orm.Task)
+        .filter(orm.Task.uuid == finished_task.uuid)
+        .execution_options(populate_existing=True)
+    )
+    db_task = result.scalar_one()
+    assert db_task.status == states.SUCCESS
+    assert db_task.result_code == 0
+    assert db_task.std_out == "out"
+    assert db_task.std_err == "err"
+    assert db_task.ended_at is not None
+
+    lookups = []
+
+    def count_lookups(conn, cursor, statement, parameters, context, executemany):
+        if "celery_taskmeta" in statement:
+            lookups.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", count_lookups)
+    try:
+        tasks_info = await task_executor._resolve_tasks_info(
+            db_session=db_session, db_tasks=[db_task]
+        )
+    finally:
+        event.remove(Engine, "before_cursor_execute", count_lookups)
+
+    assert not lookups
+    assert tasks_info == {}
+
+    task = await task_orm_to_model(value=db_task, experiment_uuid=uuid4())
+    assert task.status == states.SUCCESS
+    assert task.std_out == "out"
+
+
+def test_run_executable_streams_logs_to_files(monkeypatch, tmp_path):
+    experiment_uuid = uuid4()
+    task_id = str(uuid4())
+    monkeypatch.setattr(settings, "task_logs_tail_size_KB", 1)
+    monkeypatch.setattr(settings, "experiments_dir_path", tmp_path / "experiments")
+
+    os.makedirs(tmp_path / "extensions" / "ext")
+    monkeypatch.setenv("EXTENSIONS_DIR_PATH", str(tmp_path / "extensions"))
+
+    task_executor.run_executable.push_request(id=task_id)
+    try:
+        code, out, err = task_executor.run_executable(
+            "ext", "printf %05000d 0; printf error >&2", str(experiment_uuid)
+        )
+    finally:
+        task_executor.run_executable.pop_request()
+
+    assert code == 0
+    assert out == "0" * 1024
+    assert err == "error"
+
+    logs_dir = task_executor.build_task_logs_dir_absolute_path(
+        str(settings.experiments_dir_path), experiment_uuid, task_id
+    )
+    with open(os.path.join(logs_dir, "stdout.log"), encoding="utf-8") as file:
+        assert file.read() == "0" * 5000
+    with open(os.path.join(logs_dir, "stderr.log"), encoding="utf-8") as file:
+        assert file.read() == "error"
+
+
+@pytest.mark.asyncio
+async def test_wait_for_tasks_shared_poller(results_backend_app):
+    backend = results_backend_app.backend
+    first_id, second_id = str(uuid4()), str(uuid4())
+    backend.store_result(first_id, None, states.STARTED)
+
+    lookups = []
+
+    def count_lookups(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "celery_taskmeta" in statement:
+            if " IN " in statement:
+                lookups.append(parameters)
+
+    event.listen(Engine, "before_cursor_execute", count_lookups)
+    try:
+        waiters = asyncio.gather(
+            task_executor._update_task_info(first_id, wait=True),
+            task_executor._update_task_info(first_id, wait=True),
+            task_executor._update_task_info(second_id, wait=True),
+        )
+        await asyncio.sleep(0.05)
+        backend.store_result(first_id, (0, "first", ""), states.SUCCESS)
+        backend.store_result(second_id, (0, "second", ""), states.SUCCESS)
+        first, first_again, second = await asyncio.wait_for(waiters, timeout=2)
+    finally:
+        event.remove(Engine, "before_cursor_execute", count_lookups)
+
+    assert first.std_out == "first"
+    assert first_again.std_out == "first"
+    assert second.std_out == "second"
+    # all of the waiters are served by the same lookups, each task is looked up once per round.
+    assert lookups
+    assert len(lookups[0]) == 2
+    assert all(len(parameters) <= 2 for parameters in lookups)
+
+
+@pytest.mark.asyncio
+async def test_wait_for_task_cancelled(results_backend_app):
+    task_id = str(uuid4())
+    waiter = asyncio.ensure_future(task_executor._update_task_info(task_id, wait=True))
+    await asyncio.sleep(0.02)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert task_id not in task_executor._task_result_poller._waiters
+    # the poller stops after its running lookup, before the results backend is removed.
+    await asyncio.wait_for(task_executor._task_result_poller._poller, timeout=2)
@@ -0,0 +1,200 @@
+# pylint: skip-file
+import os
+import shutil
+from typing import AsyncGenerator, List
+from tempfile import TemporaryDirectory
+from uuid import UUID, uuid4
+
+import pytest
+from celery import states
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from aqueductcore.backend.context import (
+    ServerContext,
+    UserInfo,
+    UserScope,
+    context_dependency,
+)
+from aqueductcore.backend.main import ExcludedPathsGZipMiddleware, app
+from aqueductcore.backend.models import orm
+from aqueductcore.backend.models.experiment import ExperimentCreate
+from aqueductcore.backend.routers import tasks as tasks_router
+from aqueductcore.backend.services.experiment import build_experiment_dir_absolute_path
+from aqueductcore.backend.services.task_executor import build_task_logs_dir_absolute_path
+from aqueductcore.backend.services.utils import experiment_model_to_orm
+from aqueductcore.backend.settings import settings
+
+
+@pytest.fixture()
+def client() -> TestClient:
+    return TestClient(app)
+
+
+@pytest.mark.asyncio
+async def test_task_log_download(
+    client: TestClient,
+    db_session: AsyncSession,
+    experiments_data: List[ExperimentCreate],
+):
+    db_user = orm.User(uuid=UUID(int=0), username=settings.default_username)
+    db_experiment = experiment_model_to_orm(experiments_data[0])
+    db_experiment.created_by_user = db_user
+    db_task = orm.Task(
+        uuid=str(uuid4()),
+        extension_name="ext",
+        action_name="act",
+        created_by=db_user.uuid,
+        status=states.SUCCESS,
+    )
+    db_experiment.tasks.append(db_task)
+    db_session.add_all([db_user, db_experiment])
+    await db_session.commit()
+
+    logs_dir = build_task_logs_dir_absolute_path(
+        str(settings.experiments_dir_path), db_experiment.uuid, db_task.uuid
+    )
+    os.makedirs(logs_dir)
+    log_data = "line\n" * 10000
+    with open(os.path.join(logs_dir, "stdout.log"), mode="w", encoding="utf-8") as file:
+        file.write(log_data)
+
+    async def override_context_dependency() -> AsyncGenerator[ServerContext, None]:
+        yield ServerContext(
+            db_session=db_session,
+            user_info=UserInfo(
+                uuid=uuid4(), username=settings.default_username, scopes=set(UserScope)
+            ),
+        )
+
+    app.dependency_overrides[context_dependency] = override_context_dependency
+
+    try:
+        route = f"{settings.api_prefix}{settings.tasks_route_prefix}/{db_task.uuid}/logs"
+        response = client.get(f"{route}/stdout")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.text == log_data
+
+        response = client.get(f"{route}/stderr")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        response = client.get(f"{route}/stdout/follow")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text == (
+            f"id: {len(log_data)}\n" + "data: line\n" * 10000 + "\n"
+            f"id: {len(log_data)}\nevent: end\ndata: \n\n"
+        )
+
+        response = client.get(
+            f"{route}/stdout/follow", headers={"Last-Event-ID": str(len(log_data) - 5)}
+        )
+        end_event = f"id: {len(log_data)}\nevent: end\ndata: \n\n"
+        assert response.text == f"id: {len(log_data)}\ndata: line\n\n{end_event}"
+
+        # events are sent uncompressed, as the compression holds them back.
+        gzip_client = TestClient(
+            ExcludedPathsGZipMiddleware(app, minimum_size=1, excluded_path_prefixes=[])
+        )
+        response = gzip_client.get(f"{route}/stdout", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.text == log_data
+        response = gzip_client.get(f"{route}/stdout/follow", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.text.endswith(f"id: {len(log_data)}\nevent: end\ndata: \n\n")
+
+        response = client.get(f"{route}/other")
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+        response = client.get(
+            f"{settings.api_prefix}{settings.tasks_route_prefix}/{uuid4()}/logs/stdout"
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+    finally:
+        app.dependency_overrides.clear()
+        shutil.rmtree(
+            build_experiment_dir_absolute_path(
+                str(settings.experiments_dir_path), db_experiment.uuid
+            )
+        )
+
+
+@pytest.mark.asyncio
+async def test_follow_running_task_log(monkeypatch):
+    monkeypatch.setattr(settings, "task_logs_follow_interval_ms", 1)
+    finished = []
+
+    async def is_task_finished(task_id: str) -> bool:
+        return bool(finished)
+
+    monkeypatch.setattr(tasks_router, "is_task_finished", is_task_finished)
+
+    with TemporaryDirectory() as logs_dir:
+        file_path = os.path.join(logs_dir, "stdout.log")
+        events = tasks_router._follow_log_file(
+            file_path=file_path, task_id=str(uuid4()), position=0, finished=False
+        )
+
+        with open(file_path, mode="w", encoding="utf-8") as file:
+            file.write("first\r\nsec")
+        assert await events.__anext__() == "id: 7\ndata: first\n\n"
+
+        with open(file_path, mode="a", encoding="utf-8") as file:
+            file.write("ond\nlast")
+        assert await events.__anext__() == "id: 14\ndata: second\n\n"
+
+        finished.append(True)
+        assert await events.__anext__() == "id: 18\ndata: last\n\n"
+        assert await events.__anext__() == "id: 18\nevent: end\ndata: \n\n"
+        with pytest.raises(StopAsyncIteration):
+            await events.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_follow_task_log_long_line(monkeypatch):
+    monkeypatch.setattr(settings, "task_logs_follow_interval_ms", 1)
+    monkeypatch.setattr(settings, "download_chunk_size_KB", 1)
+
+    async def is_task_finished(task_id: str) -> bool:
+        return False
+
+    monkeypatch.setattr(tasks_router, "is_task_finished", is_task_finished)
+
+    with TemporaryDirectory() as logs_dir:
+        file_path = os.path.join(logs_dir, "stdout.log")
+        with open(file_path, mode="w", encoding="utf-8") as file:
+            file.write("a" * 2500)
+
+        events = tasks_router._follow_log_file(
+            file_path=file_path, task_id=str(uuid4()), position=0, finished=False
+        )
+        # an incomplete line is sent once it fills a whole chunk.
+        assert await events.__anext__() == f"id: 1024\ndata: {'a' * 1024}\n\n"
+        assert await events.__anext__() == f"id: 2048\ndata: {'a' * 1024}\n\n"
+        await events.aclose()
+
+
+@pytest.mark.asyncio
+async def test_follow_task_log_idle_timeout(monkeypatch):
+    monkeypatch.setattr(settings, "task_logs_follow_interval_ms", 1)
+    monkeypatch.setattr(settings, "task_logs_follow_idle_timeout_s", 0.05)
+
+    async def is_task_finished(task_id: str) -> bool:
+        # the result of the task has expired in the result backend.
+        return False
+
+    monkeypatch.setattr(tasks_router, "is_task_finished", is_task_finished)
+
+    with TemporaryDirectory() as logs_dir:
+        file_path = os.path.join(logs_dir, "stdout.log")
+        with open(file_path, mode="w", encoding="utf-8") as file:
+            file.write("line\n")
+
+        events = tasks_router._follow_log_file(
+            file_path=file_path, task_id=str(uuid4()), position=0, finished=False
+        )
+        assert await events.__anext__() == "id: 5\ndata: line\n\n"
+        assert await events.__anext__() == "id: 5\nevent: timeout\ndata: \n\n"
+        with pytest.raises(StopAsyncIteration):
+            await events.__anext__()
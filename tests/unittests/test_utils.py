@@ -1,4 +1,15 @@
-from aqueductcore.backend.services.utils import format_list_human_readable, is_tag_valid
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from aqueductcore.backend.errors import AQDValidationError
+from aqueductcore.backend.services.utils import (
+    decode_page_cursor,
+    encode_page_cursor,
+    format_list_human_readable,
+    is_tag_valid,
+)
 
 
 def test_single_element():
@@ -47,3 +58,23 @@ def test_invalid_tag_spaces():
 
 def test_empty_string():
     assert is_tag_valid("") == False
+
+
+def test_page_cursor_roundtrip():
+    created_at = datetime(2024, 5, 17, 10, 30, 15, 123456, tzinfo=timezone.utc)
+    uuid = uuid4()
+    assert decode_page_cursor(encode_page_cursor(created_at, uuid)) == (created_at, uuid)
+
+
+def test_page_cursor_normalises_timezone():
+    created_at = datetime(2024, 5, 17, 12, 30, tzinfo=timezone(timedelta(hours=2)))
+    uuid = uuid4()
+    decoded_created_at, _ = decode_page_cursor(encode_page_cursor(created_at, str(uuid)))
+    assert decoded_created_at == created_at
+    assert decoded_created_at.tzinfo == timezone.utc
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "bm90IGEgY3Vyc29y"])
+def test_invalid_page_cursor(cursor):
+    with pytest.raises(AQDValidationError):
+        decode_page_cursor(cursor)